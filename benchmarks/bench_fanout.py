@@ -0,0 +1,74 @@
+"""
+Per-segment latency of translating into several target languages.
+
+Each segment is translated into --languages targets through the same
+cache and batcher the transcription tab uses, in front of the stub
+translator with --latency seconds per call. The targets are translated
+one after another, then side by side with TranslationFanout.
+
+Usage: python benchmarks/bench_fanout.py [--segments 20] [--languages 8]
+       [--latency 0.1] [--window 0.05]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.translation_batcher import TranslationBatcher
+from src.utils.translation_cache import CachedTranslator, TranslationCache
+from src.utils.translation_fanout import TranslationFanout
+from src.utils.translators import create_translator
+
+LANGUAGES = ['de', 'fr', 'it', 'ja', 'pt', 'ko', 'nl', 'pl', 'sv', 'zh-cn']
+
+
+def make_translator(args):
+    backend = create_translator('stub', latency=args.latency)
+    batcher = TranslationBatcher(backend, window=args.window, senders=len(LANGUAGES))
+    return CachedTranslator(batcher, TranslationCache()), batcher
+
+
+def sequential(translator, text, targets):
+    return {language: translator.translate(text, src='en', dest=language).text
+            for language in targets}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=20)
+    parser.add_argument("--languages", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.1,
+                        help="simulated service latency per call in seconds")
+    parser.add_argument("--window", type=float, default=0.05, help="batching window")
+    args = parser.parse_args(argv)
+
+    targets = LANGUAGES[:max(1, min(args.languages, len(LANGUAGES)))]
+    print(f"{args.segments} segments into {len(targets)} languages, "
+          f"{args.latency * 1000:.0f} ms per call, {args.window * 1000:.0f} ms window\n")
+    print(f"{'mode':>10} {'ms/segment':>11} {'max ms':>8}")
+
+    translator, batcher = make_translator(args)
+    fanout = TranslationFanout(translator, max_workers=len(targets))
+    modes = [('sequential', lambda text: sequential(translator, text, targets)),
+             ('fan-out', lambda text: fanout.translate(text, 'en', targets))]
+
+    for name, translate in modes:
+        times = []
+        for i in range(args.segments):
+            # A new phrase every segment, so nothing comes from the cache
+            start = time.perf_counter()
+            results = translate(f"{name} phrase {i}")
+            times.append(time.perf_counter() - start)
+            assert len(results) == len(targets)
+        print(f"{name:>10} {statistics.mean(times) * 1000:11.1f} {max(times) * 1000:8.1f}")
+
+    fanout.close()
+    batcher.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Micro-benchmark for filler-word removal.
+
+Compares the previous implementation (one re.sub per filler word) against
+the single-pass compiled matcher in TextFormatter, over a large generated
+corpus and filler lists of 15 to 500 entries.
+
+Usage: python benchmarks/bench_filler_words.py [--sentences N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.formatting import TextFormatter
+
+VOCABULARY = [
+    "the", "meeting", "budget", "quarter", "we", "should", "review", "report",
+    "team", "client", "project", "deadline", "next", "week", "agreed", "plan",
+    "numbers", "looks", "good", "think", "need", "more", "time", "for", "this",
+]
+
+
+def legacy_remove_filler_words(text, words_to_remove):
+    """The previous implementation: a separate re.sub for each filler word"""
+    for word in words_to_remove:
+        pattern = r'\b' + re.escape(word) + r'\b'
+        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def build_filler_list(size, defaults):
+    """Pad the default filler words with generated ones up to the given size"""
+    fillers = list(defaults)
+    i = 0
+    while len(fillers) < size:
+        fillers.append(f"fill{i:03d}er")
+        i += 1
+    return fillers[:size]
+
+
+def build_corpus(sentences, fillers, seed=1234):
+    """Generate sentences with filler words sprinkled in"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(sentences):
+        words = []
+        for _ in range(rng.randint(8, 20)):
+            if rng.random() < 0.2:
+                words.append(rng.choice(fillers))
+            else:
+                words.append(rng.choice(VOCABULARY))
+        corpus.append(" ".join(words) + ".")
+    return corpus
+
+
+def time_run(function, corpus, fillers, repeat):
+    """Return the best wall-clock time over several runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sentence in corpus:
+            function(sentence, fillers)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    formatter = TextFormatter()
+
+    print(f"{'fillers':>8} {'legacy s/s':>14} {'compiled s/s':>14} {'speedup':>8}")
+    for size in (15, 50, 100, 250, 500):
+        fillers = build_filler_list(size, formatter.default_filler_words)
+        corpus = build_corpus(args.sentences, fillers)
+
+        # The new matcher must produce the same output as the old loop
+        for sentence in corpus[:200]:
+            assert formatter.remove_filler_words(sentence, fillers) == \
+                legacy_remove_filler_words(sentence, fillers)
+
+        legacy = time_run(legacy_remove_filler_words, corpus, fillers, args.repeat)
+        compiled = time_run(formatter.remove_filler_words, corpus, fillers, args.repeat)
+
+        print(f"{size:>8} {len(corpus) / legacy:>14.0f} {len(corpus) / compiled:>14.0f} "
+              f"{legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Caption latency with and without interim results.
+
+Synthetic speech (tones of --speech seconds between pauses) is fed in
+realtime through a ChannelSource to recognizer.listen, as from a
+microphone. The stub recognizer takes --realtime-factor of the audio's
+length per call, like a cloud engine. Reports the engine's latency
+histograms: speech end to the first text of each phrase, and to its
+final segment.
+
+Usage: python benchmarks/bench_interim.py [--phrases 4] [--speech 2.5]
+       [--realtime-factor 0.2] [--interval 0.5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+import numpy as np
+import speech_recognition as sr
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.engine import ListenInterrupted, TranscriptionEngine
+from src.utils.interim import PhraseTap
+from src.utils.recognizers import create_recognizer
+from src.utils.channels import ChannelSource
+
+RATE = 16000
+CHUNK = 1600
+
+
+def speech(phrases, seconds):
+    """16-bit PCM of tones (phrases) separated by a second of silence"""
+    t = np.arange(int(seconds * RATE)) / RATE
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    silence = np.zeros(RATE)
+    signal = np.concatenate([silence] + [np.concatenate([tone, silence]) for _ in range(phrases)])
+    return (signal * 32767).astype('<i2').tobytes()
+
+
+def run(args, interim):
+    source = ChannelSource(None, RATE, 2, chunk_size=1024)
+    recognizer = sr.Recognizer()
+    recognizer.dynamic_energy_threshold = False
+    tap = PhraseTap.attach(source, recognizer)
+    backend = create_recognizer('stub', realtime_factor=args.realtime_factor)
+
+    def listen():
+        audio = recognizer.listen(source, phrase_time_limit=10)
+        if not audio.frame_data:
+            raise ListenInterrupted()
+        return audio
+
+    def recognize(audio):
+        text, confidence = backend.recognize(audio, language='en')
+        return text, 'en', confidence
+
+    engine = TranscriptionEngine(recognize, interim_interval=args.interval if interim else None)
+    engine.add_stream(None, listen, tap)
+
+    def feed(data):
+        # Realtime, like a microphone
+        start = time.perf_counter()
+        for i, offset in enumerate(range(0, len(data), CHUNK * 2)):
+            source.stream.feed(data[offset:offset + CHUNK * 2])
+            delay = start + (i + 1) * CHUNK / RATE - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        source.stream.close()
+
+    async def consume():
+        async for segment in engine.segments():
+            pass
+
+    feeder = threading.Thread(target=feed, args=(speech(args.phrases, args.speech),))
+    feeder.start()
+    asyncio.run(consume())
+    feeder.join()
+    return engine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--phrases", type=int, default=4)
+    parser.add_argument("--speech", type=float, default=2.5, help="seconds of speech per phrase")
+    parser.add_argument("--realtime-factor", type=float, default=0.2,
+                        help="recognition time as a fraction of the audio's length")
+    parser.add_argument("--interval", type=float, default=0.5,
+                        help="seconds between interim recognitions")
+    args = parser.parse_args(argv)
+
+    print(f"{args.phrases} phrases of {args.speech:g}s, recognition at "
+          f"{args.realtime_factor:g}x realtime, interim every {args.interval:g}s\n")
+    print(f"{'mode':>8} {'first p50':>10} {'first p95':>10} {'final p50':>10} {'final p95':>10}")
+    for name, interim in (('final', False), ('interim', True)):
+        engine = run(args, interim)
+        first = engine.latency['first_text'].snapshot()
+        final = engine.latency['final_text'].snapshot()
+        print(f"{name:>8} {first['p50'] * 1000:8.0f}ms {first['p95'] * 1000:8.0f}ms "
+              f"{final['p50'] * 1000:8.0f}ms {final['p95'] * 1000:8.0f}ms")
+    print("\n(percentiles are bucket upper bounds, see LatencyHistogram)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
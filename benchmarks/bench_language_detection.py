@@ -0,0 +1,114 @@
+"""
+detect() calls with and without the sticky language detector.
+
+Simulates sessions of --phrases recognized phrases: single-language
+sessions in English, Spanish, French and German, and one where the
+speaker switches from English to Spanish halfway through. The recognizer
+confidence of each phrase is random, with a --dip-rate share of low ones.
+The translator's detect() takes --latency seconds, like a network call.
+Reports the detect() calls made, the time spent in them and how many
+phrases got the wrong language.
+
+Usage: python benchmarks/bench_language_detection.py [--phrases 200]
+       [--latency 0.002] [--recheck-every 25] [--dip-rate 0.03]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.language_detection import LanguageDetector
+from src.utils.translators import Detection
+
+PHRASES = {
+    'en': ["can everyone hear me okay", "let's look at the numbers from last quarter",
+           "I'll send the slides after the call", "does anybody have questions so far",
+           "we should finish the review by friday", "sorry, could you repeat that",
+           "the new build is running on the test servers", "yes", "that sounds right to me",
+           "moving on to the next item on the agenda"],
+    'es': ["¿me oyen todos bien?", "veamos los números del último trimestre",
+           "enviaré las diapositivas después de la llamada", "¿alguien tiene preguntas?",
+           "deberíamos terminar la revisión el viernes", "perdón, ¿puedes repetirlo?",
+           "la nueva versión está en los servidores de prueba", "sí",
+           "me parece bien", "pasemos al siguiente punto del orden del día"],
+    'fr': ["est-ce que tout le monde m'entend", "regardons les chiffres du dernier trimestre",
+           "j'enverrai les diapositives après l'appel", "est-ce que quelqu'un a des questions",
+           "nous devrions finir la relecture vendredi", "pardon, tu peux répéter",
+           "la nouvelle version tourne sur les serveurs de test", "oui",
+           "ça me semble correct", "passons au point suivant de l'ordre du jour"],
+    'de': ["könnt ihr mich alle gut hören", "schauen wir uns die zahlen vom letzten quartal an",
+           "ich schicke die folien nach dem anruf", "hat jemand bis jetzt fragen",
+           "wir sollten die prüfung bis freitag abschließen", "entschuldigung, kannst du das wiederholen",
+           "die neue version läuft auf den testservern", "ja",
+           "das klingt für mich richtig", "weiter zum nächsten punkt der tagesordnung"],
+}
+
+
+class RemoteDetector:
+    """detect() that knows the true language and takes latency seconds"""
+    def __init__(self, latency):
+        self.latency = latency
+        self.lang = None
+        self.calls = 0
+        self.time = 0.0
+
+    def detect(self, text):
+        start = time.perf_counter()
+        self.calls += 1
+        time.sleep(self.latency)
+        self.time += time.perf_counter() - start
+        return Detection(self.lang, 0.95)
+
+
+def session(languages, phrases, dip_rate, rng):
+    """(language, text, recognizer confidence) for each phrase"""
+    for i in range(phrases):
+        lang = languages[i * len(languages) // phrases]
+        confidence = rng.uniform(0.3, 0.5) if rng.random() < dip_rate else rng.uniform(0.75, 0.98)
+        yield lang, rng.choice(PHRASES[lang]), confidence
+
+
+def run(args, languages, sticky):
+    rng = random.Random(1)
+    remote = RemoteDetector(args.latency)
+    detector = LanguageDetector(remote, recheck_every=args.recheck_every) if sticky else None
+    wrong = 0
+    for lang, text, confidence in session(languages, args.phrases, args.dip_rate, rng):
+        remote.lang = lang
+        if sticky:
+            detected = detector.detect(text, confidence=confidence).lang
+        else:
+            detected = remote.detect(text).lang
+        wrong += detected != lang
+    return remote, wrong
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--phrases", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.002,
+                        help="seconds per detect() call")
+    parser.add_argument("--recheck-every", type=int, default=25)
+    parser.add_argument("--dip-rate", type=float, default=0.03,
+                        help="share of phrases with a low recognizer confidence")
+    args = parser.parse_args(argv)
+
+    print(f"{args.phrases} phrases per session, detect() takes {args.latency * 1000:g} ms\n")
+    print(f"{'session':>8} {'mode':>7} {'calls':>6} {'saved':>6} {'time':>9} {'wrong':>6}")
+    sessions = [[lang] for lang in PHRASES] + [['en', 'es']]
+    for languages in sessions:
+        name = '>'.join(languages)
+        baseline = None
+        for mode, sticky in (('every', False), ('sticky', True)):
+            remote, wrong = run(args, languages, sticky)
+            baseline = baseline or remote.calls
+            print(f"{name:>8} {mode:>7} {remote.calls:6d} {1 - remote.calls / baseline:6.0%} "
+                  f"{remote.time * 1000:7.1f}ms {wrong:6d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
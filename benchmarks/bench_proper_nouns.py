@@ -0,0 +1,97 @@
+"""
+Micro-benchmark for proper-noun capitalization.
+
+Compares the previous implementation (one re.sub per glossary entry)
+against the token trie in TextFormatter for glossaries of 40 to 10,000
+entries. The trie's throughput should stay flat as the glossary grows.
+
+Usage: python benchmarks/bench_proper_nouns.py [--sentences N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.formatting import TextFormatter, ProperNounMatcher
+
+VOCABULARY = [
+    "the", "meeting", "with", "on", "we", "should", "call", "report",
+    "team", "about", "project", "deadline", "next", "week", "agreed", "in",
+]
+
+
+def legacy_capitalize(text, entries):
+    """The previous implementation: a separate re.sub for each entry"""
+    for word in entries:
+        pattern = r'\b' + re.escape(word) + r'\b'
+        text = re.sub(pattern, word, text, flags=re.IGNORECASE)
+    return text
+
+
+def build_glossary(size, defaults):
+    """Pad the default proper nouns with generated client names"""
+    entries = list(defaults)
+    i = 0
+    while len(entries) < size:
+        entries.append(f"Client{i} Holdings")
+        i += 1
+    return entries[:size]
+
+
+def build_corpus(sentences, entries, seed=1234):
+    """Generate lowercase sentences that mention glossary entries"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(sentences):
+        words = []
+        for _ in range(rng.randint(8, 20)):
+            if rng.random() < 0.15:
+                words.append(rng.choice(entries).lower())
+            else:
+                words.append(rng.choice(VOCABULARY))
+        corpus.append(" ".join(words) + ".")
+    return corpus
+
+
+def time_run(function, corpus, repeat):
+    """Return the best wall-clock time over several runs"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sentence in corpus:
+            function(sentence)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    defaults = TextFormatter().common_proper_nouns
+
+    print(f"{'entries':>8} {'legacy s/s':>14} {'trie s/s':>14} {'speedup':>8}")
+    for size in (40, 500, 2000, 10000):
+        entries = build_glossary(size, defaults)
+        corpus = build_corpus(args.sentences, entries)
+        matcher = ProperNounMatcher(entries)
+
+        # Only time the legacy loop on a slice for large glossaries
+        legacy_corpus = corpus if size <= 500 else corpus[:20]
+        legacy = time_run(lambda text: legacy_capitalize(text, entries), legacy_corpus, 1)
+        trie = time_run(matcher.apply, corpus, args.repeat)
+
+        legacy_rate = len(legacy_corpus) / legacy
+        trie_rate = len(corpus) / trie
+        print(f"{size:>8} {legacy_rate:>14.0f} {trie_rate:>14.0f} {trie_rate / legacy_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Real-time factor of the speech recognizer backends.
+
+Runs every selected backend over the same audio fixtures and reports the
+real-time factor (processing time / audio length; below 1.0 is faster
+than real time) and the share of fixtures that produced text. Fixtures
+are the WAV/FLAC/AIFF files of --fixtures, or generated test signals
+when no directory is given (engines will mostly return no text for
+those, but their speed is still measured).
+
+Online backends (google) are only run when named with --backends.
+
+Usage: python benchmarks/bench_recognizers.py [--fixtures DIR]
+       [--backends stub,vosk,sphinx] [--repeat N] [--language en-US]
+"""
+import argparse
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import speech_recognition as sr
+from src.utils.batch import find_audio_files
+from src.utils.recognizers import (RECOGNIZER_BACKENDS, audio_seconds, available_backends,
+                                   create_recognizer)
+
+SAMPLE_RATE = 16000
+
+
+def write_signal(path, seconds, seed):
+    """Write a 16 kHz mono WAV of syllable-like tone bursts"""
+    frames = bytearray()
+    for i in range(int(seconds * SAMPLE_RATE)):
+        t = i / SAMPLE_RATE
+        # 4 bursts per second with a slowly moving pitch
+        envelope = max(0.0, math.sin(math.pi * 4 * t)) ** 2
+        pitch = 140 + 60 * math.sin(2 * math.pi * (0.3 + seed * 0.1) * t)
+        sample = envelope * (math.sin(2 * math.pi * pitch * t) +
+                             0.4 * math.sin(2 * math.pi * 3 * pitch * t))
+        frames += struct.pack('<h', int(sample * 8000))
+    with wave.open(path, 'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(SAMPLE_RATE)
+        file.writeframes(bytes(frames))
+
+
+def load_fixtures(directory):
+    """Read every fixture into AudioData"""
+    recognizer = sr.Recognizer()
+    fixtures = []
+    for path in find_audio_files(directory):
+        with sr.AudioFile(path) as source:
+            fixtures.append((os.path.basename(path), recognizer.record(source)))
+    return fixtures
+
+
+def benchmark(backend, fixtures, language, repeat):
+    """Return (real-time factor, recognized share, errors) for one backend"""
+    audio_total = 0.0
+    elapsed = 0.0
+    recognized = 0
+    errors = []
+    for _ in range(repeat):
+        for name, audio in fixtures:
+            audio_total += audio_seconds(audio)
+            start = time.perf_counter()
+            try:
+                text, _ = backend.recognize(audio, language)
+                recognized += bool(text)
+            except sr.UnknownValueError:
+                pass
+            except Exception as e:
+                errors.append(f"{name}: {e}")
+            elapsed += time.perf_counter() - start
+    return elapsed / audio_total, recognized / (len(fixtures) * repeat), errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fixtures", help="directory of audio files (default: generated)")
+    parser.add_argument("--backends", help="comma-separated backends (default: installed "
+                                           "offline backends)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--language", default="en-US")
+    args = parser.parse_args(argv)
+
+    if args.backends:
+        names = [name.strip() for name in args.backends.split(',') if name.strip()]
+    else:
+        names = [name for name in available_backends() if RECOGNIZER_BACKENDS[name].offline]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        directory = args.fixtures
+        if not directory:
+            directory = tmpdir
+            for seed, seconds in enumerate((2, 5, 10)):
+                write_signal(os.path.join(tmpdir, f"signal_{seconds}s.wav"), seconds, seed)
+        fixtures = load_fixtures(directory)
+
+    if not fixtures:
+        print("No audio fixtures found", file=sys.stderr)
+        return 1
+
+    total = sum(audio_seconds(audio) for _, audio in fixtures)
+    print(f"{len(fixtures)} fixtures, {total:.1f}s of audio, {args.repeat} repeats\n")
+    print(f"{'backend':>10} {'RTF':>8} {'x realtime':>11} {'recognized':>11}")
+
+    for name in names:
+        try:
+            backend = create_recognizer(name)
+        except (ImportError, ValueError) as e:
+            print(f"{name:>10}  skipped: {e}")
+            continue
+        try:
+            rtf, recognized, errors = benchmark(backend, fixtures, args.language, args.repeat)
+        finally:
+            backend.close()
+
+        speed = f"{1 / rtf:.0f}x" if rtf else "-"
+        print(f"{name:>10} {rtf:8.4f} {speed:>11} {recognized:11.0%}")
+        for error in errors[:3]:
+            print(f"{'':>10}  error: {error}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""
+Captions from a flaky, rate-limited translation service.
+
+Starts the stub translation server with --failure-rate of requests
+failing, a --rate-limit in requests per second, and an outage of
+--outage seconds a third of the way in. Segments arrive every
+--interval seconds and are translated one after another, as by one
+translation worker, either the old way (on an error, log it, sleep a
+second and show the original) or through a RetryPolicy. Reports how
+many segments came out translated and how far behind the captions fell.
+
+Usage: python benchmarks/bench_resilience.py [--segments 150] [--interval 0.2]
+       [--failure-rate 0.1] [--rate-limit 8] [--outage 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.resilience import ResilientTranslator, RetryPolicy
+from src.utils.translation_stub_server import StubTranslationServer
+from src.utils.translators import HttpTranslator
+
+
+def run(args, resilient):
+    server = StubTranslationServer(failure_rate=args.failure_rate, rate_limit=args.rate_limit,
+                                   retry_after=0.2, seed=1).start()
+    translator = HttpTranslator(server.url)
+    policy = None
+    if resilient:
+        policy = RetryPolicy(rate=args.rate_limit * 0.9, burst=2, base_delay=0.05,
+                             max_delay=1.0, max_retries=3, reset_timeout=0.5)
+        translator = ResilientTranslator(translator, policy)
+
+    # The service goes down a third of the way in
+    outage_start = args.segments * args.interval / 3
+    timer = threading.Timer(outage_start, setattr, (server, 'down', True))
+    recovery = threading.Timer(outage_start + args.outage, setattr, (server, 'down', False))
+    timer.start()
+    recovery.start()
+
+    translated = 0
+    lags = []
+    start = time.perf_counter()
+    for i in range(args.segments):
+        due = start + i * args.interval
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            translator.translate(f"segment {i}", dest='es')
+            translated += 1
+        except Exception:
+            if not resilient:
+                # What the listening loop used to do
+                time.sleep(1)
+        lags.append(time.perf_counter() - due)
+
+    elapsed = time.perf_counter() - start
+    timer.cancel()
+    recovery.cancel()
+    translator.close()
+    server.stop()
+    return translated, lags, elapsed, server.counts, policy
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=150)
+    parser.add_argument("--interval", type=float, default=0.2, help="seconds between segments")
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--rate-limit", type=float, default=8.0,
+                        help="requests per second the service allows")
+    parser.add_argument("--outage", type=float, default=3.0, help="seconds the service is down")
+    args = parser.parse_args(argv)
+
+    print(f"{args.segments} segments every {args.interval * 1000:g} ms, {args.failure_rate:.0%} "
+          f"failures, {args.rate_limit:g} requests/s allowed, {args.outage:g}s outage\n")
+    print(f"{'mode':>9} {'translated':>11} {'lag p50':>9} {'lag p95':>9} {'lag max':>9} "
+          f"{'requests':>9} {'429s':>5} {'time':>7}")
+    for name, resilient in (('sleep 1s', False), ('policy', True)):
+        translated, lags, elapsed, counts, policy = run(args, resilient)
+        lags.sort()
+        p95 = lags[int(0.95 * (len(lags) - 1))]
+        print(f"{name:>9} {translated:6d}/{args.segments:<4d} {statistics.median(lags):8.2f}s "
+              f"{p95:8.2f}s {lags[-1]:8.2f}s {counts['requests']:9d} {counts['throttled']:5d} "
+              f"{elapsed:6.1f}s")
+        if policy is not None:
+            print(f"\n{policy.stats.summary('policy')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
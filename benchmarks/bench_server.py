@@ -0,0 +1,128 @@
+"""
+Load test for the caption server on localhost.
+
+Starts a CaptionServer with the stub recognizer and translator (or uses
+--url to load an already running one), connects --subscribers clients to
+one session and streams synthetic speech into it --speed times faster
+than realtime. Reports how long the connections took, how late each
+segment reached the subscribers (from when the server sent it) and how
+many subscribers got every segment (the rest fell behind and were dropped).
+
+Usage: python benchmarks/bench_server.py [--subscribers 200] [--phrases 20]
+       [--speed 10] [--targets es,fr,de] [--url ws://127.0.0.1:8765]
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.server import CaptionServer
+from src.utils.websocket import WebSocketClosed, connect
+
+RATE = 16000
+CHUNK = 3200
+
+
+def speech(phrases):
+    """16-bit PCM of tones (phrases) separated by silence"""
+    t = np.arange(int(1.5 * RATE)) / RATE
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    silence = np.zeros(int(1.2 * RATE))
+    signal = np.concatenate([silence] + [np.concatenate([tone, silence]) for _ in range(phrases)])
+    return (signal * 32767).astype('<i2').tobytes()
+
+
+async def receive(websocket, latencies):
+    """Collect one subscriber's delivery latencies until the session ends"""
+    received = 0
+    try:
+        while True:
+            message = json.loads(await websocket.recv())
+            if message['type'] == 'end':
+                break
+            latencies.append(time.time() - message['sent_at'])
+            received += 1
+    except WebSocketClosed:
+        pass
+    await websocket.close()
+    return received
+
+
+async def publish(url, data, speed):
+    publisher = await connect(url)
+    interval = CHUNK / 2 / RATE / speed
+    start = time.perf_counter()
+    for i, offset in enumerate(range(0, len(data), CHUNK)):
+        await publisher.send(data[offset:offset + CHUNK])
+        # Keep to the requested pace
+        delay = start + (i + 1) * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+    await publisher.send(json.dumps({'type': 'end'}))
+    try:
+        while json.loads(await publisher.recv())['type'] != 'end':
+            pass
+    except WebSocketClosed:
+        pass
+    await publisher.close()
+
+
+async def load(args, ws_url):
+    latencies = []
+    start = time.perf_counter()
+    subscribers = await asyncio.gather(*(
+        connect(f"{ws_url}/sessions/load/subscribe") for _ in range(args.subscribers)))
+    connect_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    query = f"?targets={args.targets}" if args.targets else ""
+    results = await asyncio.gather(
+        publish(f"{ws_url}/sessions/load/publish{query}", speech(args.phrases), args.speed),
+        *(receive(websocket, latencies) for websocket in subscribers))
+    return connect_time, time.perf_counter() - start, results[1:], latencies
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=200)
+    parser.add_argument("--phrases", type=int, default=20, help="phrases of speech to stream")
+    parser.add_argument("--speed", type=float, default=10.0,
+                        help="how many times faster than realtime to stream the audio")
+    parser.add_argument("--targets", default="es,fr,de", help="target languages for the session")
+    parser.add_argument("--url", help="load this server instead of starting one")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        ws_url = args.url.rstrip("/")
+    else:
+        server = CaptionServer(port=0, recognizer='stub', translator='stub').start()
+        ws_url = server.ws_url
+
+    connect_time, elapsed, received, latencies = asyncio.run(load(args, ws_url))
+    if server is not None:
+        server.stop()
+
+    complete = sum(1 for count in received if count == args.phrases)
+    print(f"{args.subscribers} subscribers, {args.phrases} phrases at {args.speed:g}x realtime\n")
+    print(f"connect all     {connect_time * 1000:8.1f} ms")
+    print(f"session         {elapsed * 1000:8.1f} ms")
+    print(f"messages        {len(latencies):8d} ({len(latencies) / elapsed:.0f}/s)")
+    print(f"complete        {complete:8d} of {args.subscribers} subscribers")
+    if latencies:
+        latencies.sort()
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        print(f"delivery p50    {statistics.median(latencies) * 1000:8.2f} ms")
+        print(f"delivery p95    {p95 * 1000:8.2f} ms")
+        print(f"delivery max    {latencies[-1] * 1000:8.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
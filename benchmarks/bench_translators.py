@@ -0,0 +1,120 @@
+"""
+Latency and throughput of the translator backends.
+
+The same harness runs every selected backend over the same phrases:
+
+- latency: sequential single-phrase calls (p50 / p95 in ms)
+- throughput: single-phrase calls from --threads threads, and batched
+  calls of --batch phrases (phrases per second)
+
+By default it compares the in-process stub with the HTTP backend against
+a local stub server (with and without keep-alive), all with the same
+simulated service latency. Other backends (argos, googletrans, http with
+--url) are run when named with --backends.
+
+Usage: python benchmarks/bench_translators.py [--backends stub,http,http-close,argos]
+       [--phrases 200] [--threads 8] [--batch 8] [--latency 0.005] [--url URL]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.translation_stub_server import StubTranslationServer
+from src.utils.translators import create_translator
+
+PHRASES = [
+    "good morning everyone", "let's review the quarterly numbers",
+    "the shipment arrives on tuesday", "can you hear me", "we agreed on the budget",
+    "please send the report by friday", "thank you for joining", "next slide please",
+]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def measure(backend, phrases, threads, batch, dest='es'):
+    """Return latency and throughput figures for one backend"""
+    latencies = []
+    for phrase in phrases:
+        start = time.perf_counter()
+        backend.translate(phrase, dest=dest, src='en')
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(lambda phrase: backend.translate(phrase, dest=dest, src='en'), phrases))
+    concurrent = len(phrases) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for offset in range(0, len(phrases), batch):
+        backend.translate(phrases[offset:offset + batch], dest=dest, src='en')
+    batched = len(phrases) / (time.perf_counter() - start)
+
+    return {
+        'p50': statistics.median(latencies) * 1000,
+        'p95': percentile(latencies, 0.95) * 1000,
+        'concurrent': concurrent,
+        'batched': batched,
+    }
+
+
+def make_backend(name, args, server):
+    """Create a backend for the harness; http variants use the stub server"""
+    if name == 'stub':
+        return create_translator('stub', latency=args.latency)
+    if name in ('http', 'http-close'):
+        return create_translator('http', url=args.url or server.url, pool_size=args.threads,
+                                 keep_alive=name == 'http')
+    return create_translator(name)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backends", default="stub,http,http-close")
+    parser.add_argument("--phrases", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="simulated service time per request in seconds")
+    parser.add_argument("--url", help="real LibreTranslate-compatible server for http")
+    args = parser.parse_args(argv)
+
+    phrases = [f"{PHRASES[i % len(PHRASES)]} {i}" for i in range(args.phrases)]
+
+    print(f"{args.phrases} phrases, {args.threads} threads, batches of {args.batch}, "
+          f"{args.latency * 1000:.0f} ms simulated latency\n")
+    print(f"{'backend':>11} {'p50 ms':>8} {'p95 ms':>8} {'threads/s':>10} {'batched/s':>10}"
+          f" {'connections':>12}")
+
+    with StubTranslationServer(latency=args.latency) as server:
+        for name in [name.strip() for name in args.backends.split(',') if name.strip()]:
+            try:
+                backend = make_backend(name, args, server)
+            except (ImportError, ValueError) as e:
+                print(f"{name:>11}  skipped: {e}")
+                continue
+
+            try:
+                result = measure(backend, phrases, args.threads, args.batch)
+            except Exception as e:
+                print(f"{name:>11}  failed: {e}")
+                continue
+            finally:
+                backend.close()
+
+            connections = getattr(backend, 'connections_opened', None)
+            print(f"{name:>11} {result['p50']:8.2f} {result['p95']:8.2f} "
+                  f"{result['concurrent']:10.0f} {result['batched']:10.0f} "
+                  f"{connections if connections is not None else '-':>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
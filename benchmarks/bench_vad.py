@@ -0,0 +1,112 @@
+"""
+Recognition calls and audio saved by voice activity detection.
+
+Generates a stream of phrases like the ones ``recognizer.listen`` hands
+over: speech with silent lead-ins and tails, background noise that
+crossed the energy threshold (hiss, hum, clicks) and plain silence. Each
+phrase goes through the VAD and, if it survives, a stub recognizer that
+takes --rtf of the audio's length, and the same phrases are recognized
+without the VAD for comparison.
+
+Usage: python benchmarks/bench_vad.py [--phrases 200] [--rtf 0.02] [--seed 1]
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import speech_recognition as sr
+from src.utils.recognizers import StubRecognizer, audio_seconds
+from src.utils.vad import VoiceActivityDetector
+
+SAMPLE_RATE = 16000
+
+
+def make_phrase(kind, rng):
+    """One captured phrase of the given kind as 16-bit AudioData"""
+    def silence(low, high):
+        return np.zeros(int(rng.uniform(low, high) * SAMPLE_RATE))
+
+    if kind == 'speech':
+        seconds = rng.uniform(1.0, 6.0)
+        t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+        pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * 0.7 * t))
+        phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+        envelope = np.maximum(0.0, np.sin(np.pi * rng.uniform(3, 5) * t)) ** 0.5
+        voiced = envelope * rng.uniform(0.05, 0.3) * (np.sin(phase) + 0.5 * np.sin(3 * phase))
+        signal = np.concatenate([silence(0.3, 1.5), voiced, silence(0.8, 2.0)])
+    elif kind == 'hiss':
+        signal = np.concatenate([silence(0.2, 1.0),
+                                 rng.normal(0.0, 0.05, int(rng.uniform(0.5, 2.0) * SAMPLE_RATE)),
+                                 silence(0.8, 1.5)])
+    elif kind == 'click':
+        signal = silence(0.5, 1.5)
+        start = len(signal) // 3
+        signal[start:start + 400] = rng.uniform(-0.5, 0.5, 400)
+    else:
+        signal = silence(1.0, 3.0)
+
+    signal = signal + rng.normal(0.0, 0.001, len(signal))
+    data = (np.clip(signal, -1, 1) * 32767).astype('<i2').tobytes()
+    return sr.AudioData(data, SAMPLE_RATE, 2)
+
+
+def recognize_all(recognizer, phrases):
+    """Return (calls, seconds spent) recognizing phrases, skipping None"""
+    calls = 0
+    start = time.perf_counter()
+    for audio in phrases:
+        if audio is None:
+            continue
+        calls += 1
+        try:
+            recognizer.recognize(audio)
+        except sr.UnknownValueError:
+            pass
+    return calls, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--phrases", type=int, default=200)
+    parser.add_argument("--rtf", type=float, default=0.02,
+                        help="stub recognizer real-time factor")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    kinds = rng.choice(['speech', 'hiss', 'click', 'silence'], size=args.phrases,
+                       p=[0.6, 0.15, 0.1, 0.15])
+    phrases = [make_phrase(kind, rng) for kind in kinds]
+    total = sum(audio_seconds(audio) for audio in phrases)
+
+    vad = VoiceActivityDetector()
+    start = time.perf_counter()
+    kept = [vad.process(audio) for audio in phrases]
+    vad_time = time.perf_counter() - start
+
+    speech_kept = sum(1 for kind, audio in zip(kinds, kept) if kind == 'speech' and audio)
+    noise_kept = sum(1 for kind, audio in zip(kinds, kept) if kind != 'speech' and audio)
+    speech_total = int(np.sum(kinds == 'speech'))
+
+    calls_without, time_without = recognize_all(StubRecognizer(realtime_factor=args.rtf), phrases)
+    calls_with, time_with = recognize_all(StubRecognizer(realtime_factor=args.rtf), kept)
+
+    stats = vad.stats.snapshot()
+    print(f"{args.phrases} phrases ({speech_total} speech), {total:.1f}s of audio\n")
+    print(f"VAD: {vad_time * 1000:.1f} ms total, {total / vad_time:.0f}x realtime")
+    print(f"Speech phrases kept: {speech_kept}/{speech_total}, "
+          f"noise/silence phrases kept: {noise_kept}/{args.phrases - speech_total}")
+    print(f"Recognition calls: {calls_without} -> {calls_with} "
+          f"({calls_without - calls_with} saved)")
+    print(f"Audio sent to the recognizer: {stats['seconds_in']:.1f}s -> "
+          f"{stats['seconds_out']:.1f}s ({stats['seconds_saved']:.1f}s saved)")
+    print(f"Recognition time at RTF {args.rtf}: {time_without:.2f}s -> {time_with:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
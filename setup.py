@@ -13,13 +13,20 @@ setup(
     install_requires=[
         "speechrecognition",
         "googletrans==4.0.0rc1",
-        "pycountry"
+        "pycountry",
+        "numpy"
     ],
+    extras_require={
+        "offline": ["vosk", "pocketsphinx", "argostranslate"],
+    },
     python_requires=">=3.7",
     include_package_data=True,
     entry_points={
         "console_scripts": [
             "translate-scribe=translate_scribe.main:run",  # if you want a CLI
+            "transcribe-batch=src.utils.batch:main",
+            "transcript-export=src.utils.exporters:main",
+            "caption-server=src.utils.server:main",
         ],
     },
     classifiers=[
@@ -10,6 +10,7 @@ import os
 from src.components.transcription import TranscriptionTab
 from src.components.history import HistoryTab
 from src.utils.settings import SettingsManager
+from src.utils.history_index import HistoryIndex
 
 class GlobalTranscriptionSuite:
     def __init__(self, root):
@@ -23,12 +24,18 @@ class GlobalTranscriptionSuite:
         # Initialize settings manager
         self.settings_manager = SettingsManager()
         
+        # Index of saved transcripts, shared by the transcription and history tabs
+        self.history_index = HistoryIndex()
+        
         # Set up the UI
         self.setup_ui()
         
         # Load user settings
         self.settings_manager.load_settings()
         
+        # Closing the window goes through on_close
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
     def setup_theme(self):
         """Configure the application theme and styles"""
         # Set app theme
@@ -107,6 +114,11 @@ class GlobalTranscriptionSuite:
     def open_settings(self):
         """Open settings dialog"""
         self.settings_manager.open_settings_dialog(self.root, self)
+    
+    def on_close(self):
+        """Let the tabs release their resources, then quit"""
+        self.transcription_component.close()
+        self.root.destroy()
 
 def main():
     """Main application entry point"""
@@ -1,14 +1,31 @@
 import tkinter as tk
-from tkinter import ttk, scrolledtext, filedialog, messagebox
+from tkinter import ttk, filedialog, messagebox
 import os
+import shutil
+import threading
 from datetime import datetime
+from src.utils.transcript_model import segment_path
+from src.utils.exporters import export_transcript
+from src.components.transcript_pager import TranscriptPager
 
 class HistoryTab:
+    # Number of transcripts shown per page
+    PAGE_SIZE = 100
+    
     def __init__(self, parent, app_instance):
         """Initialize the History tab UI"""
         self.parent = parent
         self.app = app_instance
         self.history_files = {}  # Dictionary to map listbox indices to filenames
+        self.history_index = app_instance.history_index
+        self.page_offset = 0
+        self.search_results = None  # Search hits while a search is shown
+        
+        # Pick up transcripts written before the index existed
+        try:
+            self.history_index.import_directory(".")
+        except OSError:
+            pass
         
         self.setup_ui()
         self.load_history()
@@ -26,6 +43,29 @@ class HistoryTab:
         ttk.Label(list_frame, text="Transcription History:", 
                 font=('Helvetica', 11, 'bold')).pack(anchor=tk.W)
         
+        # Full-text search with language and date filters
+        search_frame = ttk.Frame(list_frame)
+        search_frame.pack(fill=tk.X, pady=(5, 5))
+        
+        self.search_var = tk.StringVar()
+        search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=20)
+        search_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        search_entry.bind("<Return>", lambda event: self.search_history())
+        
+        ttk.Label(search_frame, text="Lang:").pack(side=tk.LEFT, padx=(5, 0))
+        self.search_lang_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_lang_var, width=5).pack(side=tk.LEFT)
+        
+        ttk.Label(search_frame, text="Since:").pack(side=tk.LEFT, padx=(5, 0))
+        self.search_since_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_since_var, width=10).pack(side=tk.LEFT)
+        
+        search_btn = ttk.Button(search_frame, text="Search", command=self.search_history)
+        search_btn.pack(side=tk.LEFT, padx=(5, 0))
+        
+        clear_search_btn = ttk.Button(search_frame, text="Clear", command=self.clear_search)
+        clear_search_btn.pack(side=tk.LEFT, padx=(5, 0))
+        
         self.history_listbox = tk.Listbox(list_frame, width=40, height=25, 
                                         font=('Helvetica', 10))
         self.history_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -48,14 +88,23 @@ class HistoryTab:
         delete_btn = ttk.Button(list_controls, text="Delete", command=self.delete_history_item)
         delete_btn.pack(side=tk.LEFT)
         
+        # Paging controls
+        next_btn = ttk.Button(list_controls, text="Next ▶", command=self.next_page)
+        next_btn.pack(side=tk.RIGHT)
+        
+        self.page_label = ttk.Label(list_controls, text="")
+        self.page_label.pack(side=tk.RIGHT, padx=5)
+        
+        prev_btn = ttk.Button(list_controls, text="◀ Prev", command=self.previous_page)
+        prev_btn.pack(side=tk.RIGHT)
+        
         # Preview area
         ttk.Label(preview_frame, text="Preview:", 
                 font=('Helvetica', 11, 'bold')).pack(anchor=tk.W)
         
-        self.preview_area = scrolledtext.ScrolledText(preview_frame, wrap=tk.WORD, 
-                                                    width=50, height=25, font=('Helvetica', 10))
-        self.preview_area.pack(fill=tk.BOTH, expand=True)
-        self.preview_area.config(state=tk.DISABLED)
+        # Pages through the whole file instead of a truncated preview
+        self.preview = TranscriptPager(preview_frame, wrap=tk.WORD, 
+                                       width=50, height=25, font=('Helvetica', 10))
         
         # Preview controls
         preview_controls = ttk.Frame(preview_frame)
@@ -69,37 +118,83 @@ class HistoryTab:
                               command=self.export_history_item)
         export_btn.pack(side=tk.RIGHT)
     
+    def search_history(self):
+        """Show segments matching the search box instead of the history pages"""
+        query = self.search_var.get().strip()
+        if not query:
+            self.clear_search()
+            return
+        
+        since = None
+        since_text = self.search_since_var.get().strip()
+        if since_text:
+            try:
+                since = datetime.strptime(since_text, "%Y-%m-%d").timestamp()
+            except ValueError:
+                messagebox.showerror("Error", "Use YYYY-MM-DD for the date filter.")
+                return
+        
+        self.search_results = self.history_index.search(
+            query, since=since, language=self.search_lang_var.get().strip() or None)
+        
+        self.history_listbox.delete(0, tk.END)
+        self.history_files.clear()
+        if not self.search_results:
+            self.history_listbox.insert(tk.END, "No matches found")
+        for hit in self.search_results:
+            self.history_listbox.insert(tk.END, hit.display_name)
+            self.history_files[self.history_listbox.size() - 1] = hit.path
+        
+        self.page_label.config(text=f"{len(self.search_results)} matches")
+    
+    def clear_search(self):
+        """Leave search results and go back to the history pages"""
+        self.search_var.set("")
+        self.search_results = None
+        self.load_history()
+    
     def load_history(self):
-        """Load transcription history"""
+        """Load the current page of transcription history from the index"""
+        if self.search_results is not None:
+            # Keep showing search results; Clear goes back to the pages
+            self.search_history()
+            return
+        
         # Clear current list
         self.history_listbox.delete(0, tk.END)
         self.history_files.clear()  # Clear the mapping dictionary
-    
-        # Get transcript files from current directory
-        transcript_files = [f for f in os.listdir(".") if f.startswith("professional_transcript_") and f.endswith(".txt")]
-    
-        if not transcript_files:
+        
+        total = self.history_index.count()
+        if self.page_offset >= total:
+            self.page_offset = max(0, (total - 1) // self.PAGE_SIZE * self.PAGE_SIZE)
+        
+        records = self.history_index.page(self.page_offset, self.PAGE_SIZE)
+        if not records:
             self.history_listbox.insert(tk.END, "No transcripts found")
+            self.page_label.config(text="")
             return
         
-        # Sort by date (newest first)
-        transcript_files.sort(reverse=True)
-    
-        # Add to listbox
-        for file in transcript_files:
-            # Format display name: remove prefix and extension, convert timestamp to readable format
-            display_name = file.replace("professional_transcript_", "").replace(".txt", "")
-            try:
-                # Try to parse timestamp from filename
-                date_obj = datetime.strptime(display_name, "%Y%m%d_%H%M%S")
-                display_name = date_obj.strftime("%Y-%m-%d %H:%M:%S")
-            except ValueError:
-                pass  # Use original name if parsing fails
-            
-            self.history_listbox.insert(tk.END, display_name)
+        # Add to listbox (newest first)
+        for record in records:
+            self.history_listbox.insert(tk.END, record.display_name)
             # Store filename in our dictionary
             index = self.history_listbox.size() - 1
-            self.history_files[index] = file
+            self.history_files[index] = record.path
+        
+        self.page_label.config(
+            text=f"{self.page_offset + 1}-{self.page_offset + len(records)} of {total}")
+    
+    def next_page(self):
+        """Show the next page of older transcripts"""
+        if self.search_results is None and self.page_offset + self.PAGE_SIZE < self.history_index.count():
+            self.page_offset += self.PAGE_SIZE
+            self.load_history()
+    
+    def previous_page(self):
+        """Show the previous page of newer transcripts"""
+        if self.search_results is None and self.page_offset > 0:
+            self.page_offset = max(0, self.page_offset - self.PAGE_SIZE)
+            self.load_history()
     
     def on_history_select(self, event):
         """Handle selection in history list"""
@@ -116,27 +211,13 @@ class HistoryTab:
         except (IndexError, tk.TclError):
             return
 
-        # Load preview of the file
-        try:
-            with open(filename, 'r', encoding='utf-8') as file:
-                # Read first 2000 characters for preview
-                content = file.read(2000)
-                
-                # Show in preview area
-                self.preview_area.config(state=tk.NORMAL)
-                self.preview_area.delete("1.0", tk.END)
-                self.preview_area.insert(tk.END, content)
-                
-                # Add ellipsis if truncated
-                if len(content) == 2000:
-                    self.preview_area.insert(tk.END, "\n\n[...] (Preview truncated)")
-                    
-                self.preview_area.config(state=tk.DISABLED)
-        except Exception as e:
-            self.preview_area.config(state=tk.NORMAL)
-            self.preview_area.delete("1.0", tk.END)
-            self.preview_area.insert(tk.END, f"Error loading file: {e}")
-            self.preview_area.config(state=tk.DISABLED)
+        # Jump to the matching segment when a search hit is selected
+        on_ready = None
+        if self.search_results and index < len(self.search_results):
+            jump_to = f"[{self.search_results[index].timestamp}]"
+            on_ready = lambda transcript: self.preview.find(jump_to)
+        
+        self.preview.open(filename, on_ready=on_ready)
     
     def delete_history_item(self):
         """Delete selected history item"""
@@ -154,6 +235,9 @@ class HistoryTab:
             return
         
         if not os.path.exists(filename):
+            # Drop stale index entries for files removed outside the app
+            self.history_index.remove(filename)
+            self.load_history()
             messagebox.showerror("Error", "File not found.")
             return
             
@@ -163,15 +247,15 @@ class HistoryTab:
         if not confirm:
             return
             
-        # Delete file
+        # Delete file (release the preview's mapping of it first)
         try:
+            self.preview.clear()
             os.remove(filename)
+            for sidecar in (filename + ".idx", segment_path(filename)):
+                if os.path.exists(sidecar):
+                    os.remove(sidecar)
+            self.history_index.remove(filename)
             self.load_history()  # Refresh list
-            
-            # Clear preview
-            self.preview_area.config(state=tk.NORMAL)
-            self.preview_area.delete("1.0", tk.END)
-            self.preview_area.config(state=tk.DISABLED)
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete file: {e}")
     
@@ -229,24 +313,53 @@ class HistoryTab:
             messagebox.showerror("Error", "File not found.")
             return
             
+        # Structured formats need the segment file saved beside the transcript
+        filetypes = [("Text files", "*.txt"), ("All files", "*.*")]
+        if os.path.exists(segment_path(filename)):
+            filetypes[1:1] = [("Word document", "*.docx"), ("SubRip subtitles", "*.srt"),
+                              ("WebVTT subtitles", "*.vtt"), ("JSON Lines", "*.jsonl")]
+        
         # Open save dialog
         export_filename = filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            filetypes=filetypes,
             initialfile=os.path.basename(filename)
         )
         
         if not export_filename:
             return
+        
+        if os.path.splitext(export_filename)[1].lower() in ('.docx', '.srt', '.vtt', '.jsonl'):
+            self.export_structured(filename, export_filename)
+            return
             
         # Copy file to new location
         try:
-            with open(filename, 'r', encoding='utf-8') as src:
-                content = src.read()
-                
-            with open(export_filename, 'w', encoding='utf-8') as dst:
-                dst.write(content)
-                
+            shutil.copyfile(filename, export_filename)
             messagebox.showinfo("Success", f"Transcript exported to {export_filename}")
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to export file: {e}")
\ No newline at end of file
+            messagebox.showerror("Error", f"Failed to export file: {e}")
+    
+    def export_structured(self, filename, export_filename):
+        """Stream a transcript's segments to a subtitle or document file in the background"""
+        result = {}
+        
+        def export():
+            try:
+                result['count'] = export_transcript(filename, export_filename)
+            except Exception as e:
+                result['error'] = e
+        
+        thread = threading.Thread(target=export, daemon=True)
+        thread.start()
+        
+        def check_done():
+            if thread.is_alive():
+                self.parent.after(100, check_done)
+            elif 'error' in result:
+                messagebox.showerror("Error", f"Failed to export file: {result['error']}")
+            else:
+                messagebox.showinfo("Success", f"Exported {result['count']} segments "
+                                    f"to {export_filename}")
+        
+        self.parent.after(100, check_done)
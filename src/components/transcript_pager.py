@@ -0,0 +1,151 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+from src.utils.mapped_transcript import MappedTranscript
+
+
+class TranscriptPager:
+    """In-app viewer that shows one page of a memory-mapped transcript.
+
+    The Text widget only ever holds ``page_lines`` lines; the scrollbar
+    stands for the whole file and moving it just renders a different
+    page, so scrolling costs the same on any file size. Files are opened
+    (and their line index built, if it is not cached yet) on a worker
+    thread so the UI stays responsive.
+    """
+
+    def __init__(self, parent, page_lines=200, **text_options):
+        self.page_lines = page_lines
+        self.transcript = None
+        self.top = 0
+        self._pending = None
+        self._generation = 0
+
+        frame = ttk.Frame(parent)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        self.scrollbar = ttk.Scrollbar(frame, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.text = tk.Text(frame, **text_options)
+        self.text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.text.config(state=tk.DISABLED)
+
+        # Wheel and keys move through the file, not just the rendered page
+        self.text.bind("<MouseWheel>", self._on_wheel)
+        self.text.bind("<Button-4>", lambda event: self._scroll_lines(-3))
+        self.text.bind("<Button-5>", lambda event: self._scroll_lines(3))
+        self.text.bind("<Prior>", lambda event: self._scroll_lines(-self.visible_lines()))
+        self.text.bind("<Next>", lambda event: self._scroll_lines(self.visible_lines()))
+
+    def visible_lines(self):
+        """Approximate number of lines that fit in the widget"""
+        try:
+            return max(1, int(self.text.cget('height')))
+        except (tk.TclError, ValueError):
+            return 25
+
+    def open(self, path, line=0, on_ready=None):
+        """Open a transcript in the background and show it starting at line"""
+        self.close()
+        self.show_message("Loading...")
+        self._generation += 1
+        generation = self._generation
+        result = {}
+
+        def load():
+            try:
+                result['transcript'] = MappedTranscript(path)
+            except Exception as e:
+                result['error'] = e
+
+        thread = threading.Thread(target=load, daemon=True)
+        thread.start()
+        self._pending = (thread, result, generation, line, on_ready)
+        self.text.after(20, self._check_loaded)
+
+    def _check_loaded(self):
+        if self._pending is None:
+            return
+        thread, result, generation, line, on_ready = self._pending
+        if thread.is_alive():
+            self.text.after(20, self._check_loaded)
+            return
+
+        self._pending = None
+        if generation != self._generation:
+            # Another file was selected meanwhile
+            if 'transcript' in result:
+                result['transcript'].close()
+            return
+        if 'error' in result:
+            self.show_message(f"Error loading file: {result['error']}")
+            return
+
+        self.transcript = result['transcript']
+        if not len(self.transcript):
+            self.show_message("(Empty transcript)")
+            return
+        self.scroll_to(line)
+        if on_ready:
+            on_ready(self.transcript)
+
+    def show_message(self, message):
+        """Replace the contents with a message"""
+        self._render(message)
+        self.scrollbar.set(0.0, 1.0)
+
+    def clear(self):
+        """Close the transcript and empty the widget"""
+        self.close()
+        self.show_message("")
+
+    def close(self):
+        """Release the current transcript"""
+        self._generation += 1
+        if self.transcript is not None:
+            self.transcript.close()
+            self.transcript = None
+        self.top = 0
+
+    def scroll_to(self, line):
+        """Render the page starting at line"""
+        if self.transcript is None:
+            return
+        total = len(self.transcript)
+        self.top = max(0, min(line, total - self.visible_lines()))
+        stop = min(total, self.top + self.page_lines)
+        self._render(self.transcript.text(self.top, stop))
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_lines()) / total))
+
+    def find(self, term, start=0):
+        """Scroll to the first line at or after start containing term"""
+        if self.transcript is None:
+            return None
+        line = self.transcript.find(term, start)
+        if line is not None:
+            self.scroll_to(line)
+        return line
+
+    def _render(self, content):
+        self.text.config(state=tk.NORMAL)
+        self.text.delete("1.0", tk.END)
+        self.text.insert(tk.END, content)
+        self.text.config(state=tk.DISABLED)
+
+    def _scroll_lines(self, count):
+        self.scroll_to(self.top + count)
+        return "break"
+
+    def _on_wheel(self, event):
+        return self._scroll_lines(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if self.transcript is None:
+            return
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(amount) * len(self.transcript)))
+        elif unit == tk.PAGES:
+            self.scroll_to(self.top + int(amount) * self.visible_lines())
+        else:
+            self.scroll_to(self.top + int(amount))
@@ -0,0 +1,247 @@
+import tkinter as tk
+from collections import OrderedDict, deque
+from src.utils.segment_store import SegmentStore
+
+
+class TranscriptView:
+    """Bounded, virtualized display on top of a Text widget.
+
+    Every entry goes to a SegmentStore; the widget only holds a window of
+    at most ``max_entries`` entries (and roughly ``max_chars`` characters).
+    Scrolling to the top or bottom of the widget pages older or newer
+    entries back in from the store, and search runs against the store.
+    While the window ends at the newest entry the view follows new text.
+
+    Interim results are shown below the newest entry (tag 'interim') and
+    are never stored; ``set_interim``/``clear_interim`` replace them in
+    place, keyed by phrase.
+    """
+
+    def __init__(self, widget, max_entries=500, max_chars=200 * 1024, page_size=100):
+        self.widget = widget
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.page_size = page_size
+        self.store = SegmentStore()
+
+        # Store indexes [first, last) currently shown, with the number of
+        # lines and characters each shown entry takes up
+        self.first = 0
+        self.last = 0
+        self._lines = deque()
+        self._chars = deque()
+        self._total_chars = 0
+        self._paging = False
+
+        # {key: (timestamp, text)}; drawn from the 'interim' mark to the end
+        self.interim = OrderedDict()
+        # Right gravity: text inserted at the mark goes in front of it
+        widget.mark_set('interim', 'end-1c')
+        widget.mark_gravity('interim', tk.RIGHT)
+
+        # Watch scrolling to page entries in and out
+        self._scroll_set = widget.vbar.set if hasattr(widget, 'vbar') else None
+        widget.config(yscrollcommand=self._on_scroll)
+
+    @property
+    def is_live(self):
+        """True when the window ends at the newest entry"""
+        return self.last == len(self.store)
+
+    def render(self, entry):
+        """Return the display text for an entry"""
+        timestamp, message, tag = entry
+        if tag == 'translated':
+            return f"[{timestamp}] {message}\n\n"
+        return f"[{timestamp}] {message}\n"
+
+    def append(self, entries):
+        """Store new entries and show them if the view is following the end"""
+        live = self.is_live
+        self.store.extend(entries)
+        if not live:
+            return
+
+        self._insert_end(entries)
+        self.last = len(self.store)
+        self._trim_top()
+        self.widget.see(tk.END)
+
+    def set_interim(self, key, timestamp, text):
+        """Show or update the interim result for a phrase"""
+        self.interim[key] = (timestamp, text)
+        self._draw_interim()
+
+    def clear_interim(self, key=None):
+        """Take down a phrase's interim result (all of them if key is None)"""
+        if key is None:
+            self.interim.clear()
+        elif self.interim.pop(key, None) is None:
+            return
+        self._draw_interim()
+
+    def clear(self):
+        """Remove everything from the widget and the store"""
+        self.interim.clear()
+        self.store.clear()
+        self.first = self.last = 0
+        self._lines.clear()
+        self._chars.clear()
+        self._total_chars = 0
+        self._edit(lambda: self.widget.delete("1.0", tk.END))
+
+    def text(self):
+        """Return the full transcript text, including entries not shown"""
+        return ''.join(self.render(entry) for entry in self.iter_entries())
+
+    def iter_entries(self, page_size=1000):
+        """Yield every stored entry in order"""
+        for start in range(0, len(self.store), page_size):
+            for entry in self.store.range(start, start + page_size):
+                yield entry
+
+    def find(self, term, start=0):
+        """Show and highlight the first entry at or after start containing term"""
+        for index in self.store.search(term, start):
+            self.show(index)
+            self._highlight(index, term)
+            return index
+        return None
+
+    def show(self, index):
+        """Load a window around a stored entry"""
+        half = self.max_entries // 2
+        first = max(0, min(index - half, len(self.store) - self.max_entries))
+        self._load_window(first, min(len(self.store), first + self.max_entries))
+
+    def follow(self):
+        """Jump back to the newest entries"""
+        self._load_window(max(0, len(self.store) - self.max_entries), len(self.store))
+        self.widget.see(tk.END)
+
+    def _edit(self, change):
+        self.widget.config(state=tk.NORMAL)
+        change()
+        self.widget.config(state=tk.DISABLED)
+
+    def _draw_interim(self):
+        """Redraw the interim results after the newest entry, if it is shown"""
+        chunks = []
+        if self.is_live:
+            for timestamp, text in self.interim.values():
+                chunks.extend((self.render((timestamp, text, 'interim')), 'interim'))
+
+        def draw():
+            self.widget.delete('interim', tk.END)
+            if chunks:
+                # Left gravity just for this insert keeps the results after the mark
+                self.widget.mark_gravity('interim', tk.LEFT)
+                self.widget.insert('interim', *chunks)
+                self.widget.mark_gravity('interim', tk.RIGHT)
+        self._edit(draw)
+        if self.is_live:
+            self.widget.see(tk.END)
+
+    def _insert_end(self, entries):
+        chunks = []
+        for entry in entries:
+            text = self.render(entry)
+            chunks.extend((text, entry[2]))
+            self._lines.append(text.count('\n'))
+            self._chars.append(len(text))
+            self._total_chars += len(text)
+        if chunks:
+            # In front of the interim results
+            self._edit(lambda: self.widget.insert('interim', *chunks))
+
+    def _insert_start(self, entries):
+        chunks = []
+        for entry in reversed(entries):
+            text = self.render(entry)
+            self._lines.appendleft(text.count('\n'))
+            self._chars.appendleft(len(text))
+            self._total_chars += len(text)
+        for entry in entries:
+            chunks.extend((self.render(entry), entry[2]))
+        if chunks:
+            self._edit(lambda: self.widget.insert("1.0", *chunks))
+
+    def _over_limit(self):
+        return (len(self._lines) > self.max_entries or
+                (self._total_chars > self.max_chars and len(self._lines) > 1))
+
+    def _trim_top(self):
+        lines = 0
+        while self._over_limit():
+            lines += self._lines.popleft()
+            self._total_chars -= self._chars.popleft()
+            self.first += 1
+        if lines:
+            self._edit(lambda: self.widget.delete("1.0", f"{lines + 1}.0"))
+
+    def _trim_bottom(self):
+        lines = 0
+        while self._over_limit():
+            lines += self._lines.pop()
+            self._total_chars -= self._chars.pop()
+            self.last -= 1
+        if lines:
+            total = sum(self._lines)
+            self._edit(lambda: self.widget.delete(f"{total + 1}.0", tk.END))
+
+    def _load_window(self, first, last):
+        self._lines.clear()
+        self._chars.clear()
+        self._total_chars = 0
+        self._edit(lambda: self.widget.delete("1.0", tk.END))
+        self.first = first
+        self.last = first
+        self._insert_end(self.store.range(first, last))
+        self.last = last
+        self._draw_interim()
+
+    def _highlight(self, index, term):
+        self.widget.tag_remove('search', "1.0", tk.END)
+        line = sum(list(self._lines)[:index - self.first]) + 1
+        start = self.widget.search(term, f"{line}.0", stopindex=tk.END, nocase=True)
+        if start:
+            self.widget.tag_add('search', start, f"{start}+{len(term)}c")
+            self.widget.tag_configure('search', background='yellow')
+            self.widget.see(start)
+
+    def _on_scroll(self, top, bottom):
+        if self._scroll_set:
+            self._scroll_set(top, bottom)
+        if self._paging:
+            return
+        if float(top) <= 0.0 and self.first > 0:
+            self.widget.after_idle(self._page_older)
+            self._paging = True
+        elif float(bottom) >= 1.0 and not self.is_live:
+            self.widget.after_idle(self._page_newer)
+            self._paging = True
+
+    def _page_older(self):
+        """Bring the previous page back from the store above the window"""
+        try:
+            start = max(0, self.first - self.page_size)
+            entries = self.store.range(start, self.first)
+            self._insert_start(entries)
+            self.first = start
+            self._trim_bottom()
+            # Keep the entry the user was looking at in view
+            self.widget.see(f"{sum(list(self._lines)[:len(entries)]) + 1}.0")
+        finally:
+            self._paging = False
+
+    def _page_newer(self):
+        """Bring the next page back from the store below the window"""
+        try:
+            stop = min(len(self.store), self.last + self.page_size)
+            self._insert_end(self.store.range(self.last, stop))
+            self.last = stop
+            self._trim_top()
+            if self.is_live:
+                self._draw_interim()
+        finally:
+            self._paging = False
@@ -1,13 +1,35 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog
 import threading
+import asyncio
+import itertools
+import contextlib
+import copy
 import time
 import os
 from datetime import datetime
+from functools import partial
 import speech_recognition as sr
-from googletrans import Translator
 from src.utils.audio import AudioProcessor
 from src.utils.formatting import TextFormatter
+from src.utils.engine import TranscriptionEngine
+from src.utils.interim import PhraseTap
+from src.utils.language_detection import LanguageDetector
+from src.utils.resilience import (CircuitOpenError, OPEN, ResilientRecognizer,
+                                  ResilientTranslator, RetryPolicy, recognizer_policy)
+from src.utils.channels import MultiChannelMicrophone
+from src.utils.recognizers import available_backends, create_recognizer
+from src.utils.transcript_writer import TranscriptWriter
+from src.utils.transcript_model import (Segment, SegmentWriter, language_path, read_segments,
+                                         segment_path)
+from src.utils.exporters import export_segments, guess_format
+from src.utils.translation_cache import TranslationCache, CachedTranslator
+from src.utils.translation_batcher import TranslationBatcher
+from src.utils.translation_fanout import TranslationFanout
+from src.utils.translators import available_backends as available_translators, create_translator
+from src.utils.ui_events import UIEventBus
+from src.utils.vad import VoiceActivityDetector
+from src.components.transcript_view import TranscriptView
 
 class TranscriptionTab:
     def __init__(self, parent, app):
@@ -18,19 +40,72 @@ class TranscriptionTab:
         self.is_listening = False
         self.current_thread = None
         self.transcript_file = None
+        self.engine = None
+        self.session_options = {}
         
-        # Initialize recognizer and translator
+        # Transcript file sinks; the log area is only used for display.
+        # Segments are also written as structured data to a binary .seg
+        # file beside the text transcript, which is what exports read.
+        # Until a file is open they wait in unsaved_segments
+        self.transcript_writer = None
+        self.segment_writer = None
+        self.unsaved_segments = []
+        # Records in the .seg file, and the first one exports start from
+        # (the transcript may have been cleared since the file was opened)
+        self.segments_written = 0
+        self.export_from = 0
+        # The engine thread writes segments while the Tk thread may swap the
+        # writers (Save As) or clear the unsaved lists; this guards both
+        self.transcript_lock = threading.RLock()
+        # Every additional target language gets a transcript of its own:
+        # {language: (filename, TranscriptWriter, SegmentWriter)}
+        self.language_writers = {}
+        self.unsaved_translations = []
+        self.loaded_glossary = None
+        
+        # Initialize recognizer and translator; the recognizer captures audio
+        # and the backend (picked per session) turns it into text
         self.recognizer = sr.Recognizer()
-        self.translator = Translator()
-        self.audio_processor = AudioProcessor(self.recognizer)
+        self.recognizer_backend = None
+        # Rate limit, retries and circuit breaker of the online recognizer
+        # and translator (None for offline backends)
+        self.recognition_policy = None
+        self.translation_policy = None
+        # (speaker, audio processor, voice activity detector) for each
+        # capture source of the current session
+        self.capture_tracks = []
+        # Repeated phrases are served from the cache without a network call;
+        # misses from phrases arriving close together share one request.
+        # The translator backend behind them is picked per session
+        self.translation_cache = TranslationCache(path="translation_cache.db")
+        self.translator_backend = None
+        # (name, options, resilience settings) the backend was created with
+        self.translator_config = None
+        # Resized per session to one sender per target language of a batch
+        self.translation_batcher = TranslationBatcher(None, window=0.3, max_batch=8)
+        self.translator = CachedTranslator(self.translation_batcher, self.translation_cache)
+        # Captions in several languages: each segment is translated into
+        # all of them at once
+        self.translation_fanout = None
+        # Each speaker stays on the language first detected for them, so
+        # detect() is only called now and then; replaced every session
+        self.language_detector = LanguageDetector(self.translator)
+        self.audio_processor = AudioProcessor(self, recognizer=self.recognizer)
         self.text_formatter = TextFormatter()
         
         # Initialize language support
         self.supported_languages = self.get_supported_languages()
         self.target_language = "en"  # Default target language is English
+        self.target_languages = ["en"]  # Primary target first, then the additional ones
+        
+        # Worker threads never touch Tk directly; they post events that the
+        # main loop drains on a fixed tick
+        self.ui_events = UIEventBus(on_log=self.write_log_entries,
+                                    on_status=lambda text: self.app.status_var.set(text))
         
         # Setup UI
         self.setup_ui()
+        self.ui_events.start(self.parent)
     
     def get_supported_languages(self):
         """Get list of supported languages with their codes"""
@@ -89,11 +164,25 @@ class TranscriptionTab:
         self.mic_var = tk.StringVar()
         self.mic_dropdown = ttk.Combobox(device_frame, textvariable=self.mic_var, width=25)
         self.mic_dropdown.pack(fill=tk.X, pady=(5, 0))
+        
+        # Panel sessions: every extra microphone is its own speaker track
+        ttk.Label(device_frame, text="Additional Speakers:").pack(anchor=tk.W)
+        self.extra_mics_list = tk.Listbox(device_frame, selectmode=tk.MULTIPLE, height=4,
+                                          exportselection=False)
+        self.extra_mics_list.pack(fill=tk.X, pady=(5, 0))
         self.populate_mic_list()
         
         refresh_mic_btn = ttk.Button(device_frame, text="Refresh List", command=self.populate_mic_list)
         refresh_mic_btn.pack(anchor=tk.E, pady=(5, 0))
         
+        # Speech recognition engine; offline engines show up once installed
+        ttk.Label(device_frame, text="Recognition Engine:").pack(anchor=tk.W)
+        self.engine_var = tk.StringVar(value='google')
+        engine_dropdown = ttk.Combobox(device_frame, textvariable=self.engine_var, width=25,
+                                       state='readonly')
+        engine_dropdown['values'] = [name for name in available_backends() if name != 'stub']
+        engine_dropdown.pack(fill=tk.X, pady=(5, 0))
+        
         # Section: Language Settings
         lang_frame = ttk.LabelFrame(control_panel, text="Language Settings", padding="10")
         lang_frame.pack(fill=tk.X, pady=pad_y)
@@ -108,12 +197,32 @@ class TranscriptionTab:
         self.target_lang_dropdown.pack(fill=tk.X, pady=(5, 0))
         self.target_lang_dropdown.bind("<<ComboboxSelected>>", self.on_language_change)
         
+        # Live captions in more languages, each saved to its own transcript
+        ttk.Label(lang_frame, text="Additional Target Languages:").pack(anchor=tk.W, pady=(5, 0))
+        self.extra_langs_list = tk.Listbox(lang_frame, selectmode=tk.MULTIPLE, height=4,
+                                           exportselection=False)
+        for name in sorted(language_names):
+            self.extra_langs_list.insert(tk.END, name)
+        self.extra_langs_list.pack(fill=tk.X, pady=(5, 0))
+        self.extra_langs_list.bind("<<ListboxSelect>>", self.on_language_change)
+        
         # Automatic language detection option
         self.auto_detect_var = tk.BooleanVar(value=True)
         auto_detect_cb = ttk.Checkbutton(lang_frame, text="Auto-detect source language", 
                                        variable=self.auto_detect_var)
         auto_detect_cb.pack(anchor=tk.W, pady=(5, 0))
         
+        # Translation engine; offline and self-hosted engines are alternatives
+        # to googletrans
+        ttk.Label(lang_frame, text="Translation Engine:").pack(anchor=tk.W, pady=(5, 0))
+        translators = [name for name in available_translators() if name != 'stub']
+        self.translation_engine_var = tk.StringVar(
+            value='googletrans' if 'googletrans' in translators else translators[0])
+        translation_engine_dropdown = ttk.Combobox(
+            lang_frame, textvariable=self.translation_engine_var, width=25, state='readonly')
+        translation_engine_dropdown['values'] = translators
+        translation_engine_dropdown.pack(fill=tk.X, pady=(5, 0))
+        
         # Section: Transcription Controls
         control_frame = ttk.LabelFrame(control_panel, text="Controls", padding="10")
         control_frame.pack(fill=tk.X, pady=pad_y)
@@ -162,6 +271,13 @@ class TranscriptionTab:
                                 variable=self.format_caps_var)
         caps_cb.pack(anchor=tk.W)
         
+        # Partial captions while a phrase is still being spoken; each one
+        # costs a recognition call
+        self.interim_var = tk.BooleanVar(value=False)
+        interim_cb = ttk.Checkbutton(formatting_frame, text="Show interim results", 
+                                   variable=self.interim_var)
+        interim_cb.pack(anchor=tk.W)
+        
         # Output panel elements
         ttk.Label(output_panel, text="Professional Transcription:", 
                 font=('Helvetica', 11, 'bold')).pack(anchor=tk.W)
@@ -173,8 +289,13 @@ class TranscriptionTab:
         self.log_area.tag_configure('source', foreground='gray')
         self.log_area.tag_configure('translated', foreground='black', font=('Helvetica', 10, 'bold'))
         self.log_area.tag_configure('info', foreground=self.app.primary_color)
+        self.log_area.tag_configure('interim', foreground='gray', font=('Helvetica', 10, 'italic'))
         self.log_area.config(state=tk.DISABLED)
         
+        # Only a window of recent entries lives in the widget; older ones are
+        # paged back in from a segment store when scrolling up or searching
+        self.transcript_view = TranscriptView(self.log_area, max_entries=500)
+        
         # Add right-click menu for copy/clear
         self.create_context_menu(self.log_area)
         
@@ -190,6 +311,18 @@ class TranscriptionTab:
         
         export_button = ttk.Button(button_frame, text="Export as Document", command=self.export_as_doc)
         export_button.pack(side=tk.RIGHT)
+        
+        # Search across the whole session, not just the visible window
+        self.search_var = tk.StringVar()
+        self.last_found = None
+        find_button = ttk.Button(button_frame, text="Find", command=self.find_in_transcript)
+        find_button.pack(side=tk.RIGHT, padx=(0, 5))
+        search_entry = ttk.Entry(button_frame, textvariable=self.search_var, width=20)
+        search_entry.pack(side=tk.RIGHT, padx=(0, 5))
+        search_entry.bind("<Return>", lambda event: self.find_in_transcript())
+        
+        latest_button = ttk.Button(button_frame, text="Latest", command=self.transcript_view.follow)
+        latest_button.pack(side=tk.RIGHT, padx=(0, 5))
     
     def create_context_menu(self, widget):
         """Create right-click context menu for text widgets"""
@@ -233,9 +366,27 @@ class TranscriptionTab:
     
     def clear_transcript(self):
         """Clear the transcript area"""
-        self.log_area.config(state=tk.NORMAL)
-        self.log_area.delete("1.0", tk.END)
-        self.log_area.config(state=tk.DISABLED)
+        # Segments already written to the transcript file are kept
+        with self.transcript_lock:
+            self.unsaved_segments = []
+            self.unsaved_translations = []
+            self.export_from = self.segments_written
+        self.last_found = None
+        self.transcript_view.clear()
+    
+    def find_in_transcript(self):
+        """Find the next entry containing the search text"""
+        term = self.search_var.get().strip()
+        if not term:
+            return
+        
+        start = self.last_found + 1 if self.last_found is not None else 0
+        self.last_found = self.transcript_view.find(term, start)
+        if self.last_found is None and start > 0:
+            # Wrap around to the beginning
+            self.last_found = self.transcript_view.find(term, 0)
+        if self.last_found is None:
+            self.app.status_var.set(f"'{term}' not found")
     
     def populate_mic_list(self):
         """Populate the microphone dropdown with available devices"""
@@ -244,21 +395,19 @@ class TranscriptionTab:
             self.mic_dropdown['values'] = mic_list
             if mic_list:
                 self.mic_dropdown.current(0)
+            self.extra_mics_list.delete(0, tk.END)
+            for name in mic_list:
+                self.extra_mics_list.insert(tk.END, name)
         except Exception as e:
             self.log(f"Error retrieving microphone list: {e}", tag='info')
     
     def log(self, message, tag='info'):
-        """Add message to log area with formatting"""
-        self.log_area.config(state=tk.NORMAL)
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        
-        if tag == 'translated':
-            self.log_area.insert(tk.END, f"[{timestamp}] {message}\n\n", tag)
-        else:
-            self.log_area.insert(tk.END, f"[{timestamp}] {message}\n", tag)
-            
-        self.log_area.see(tk.END)
-        self.log_area.config(state=tk.DISABLED)
+        """Add message to log area with formatting (safe from any thread)"""
+        self.ui_events.post_log(message, tag)
+    
+    def write_log_entries(self, entries):
+        """Write a batch of (timestamp, message, tag) entries in one insert"""
+        self.transcript_view.append(entries)
     
     def on_language_change(self, event=None):
         """Handle target language change"""
@@ -268,19 +417,158 @@ class TranscriptionTab:
             if name == selected_lang_name:
                 self.target_language = code
                 break
+        
+        codes = {name: code for code, name in self.supported_languages.items()}
+        extra = [codes[self.extra_langs_list.get(index)]
+                 for index in self.extra_langs_list.curselection()]
+        self.target_languages = [self.target_language] + [
+            code for code in extra if code != self.target_language]
+    
+    def open_transcript_writer(self, filename, truncate=False):
+        """Send future segments to an append-only writer for the given file"""
+        settings = self.app.settings_manager.get_settings()
+        # Segments may be committed from the session thread meanwhile
+        with self.transcript_lock:
+            self.close_transcript_writer()
+            
+            self.transcript_writer = TranscriptWriter(
+                filename,
+                sync_interval=settings.get('sync_interval', 5.0),
+                sync_bytes=settings.get('sync_bytes', 64 * 1024),
+                terminator='\n\n',
+                truncate=truncate
+            ).open()
+            self.segment_writer = SegmentWriter(segment_path(filename), truncate=truncate).open()
+            # Segments already in a reopened file belong to an earlier session
+            self.segments_written = self.segment_writer.records
+            self.export_from = self.segments_written
+            self.transcript_file = filename
+        
+        if self.transcript_writer.recovered_bytes:
+            self.log(f"Recovered transcript: dropped {self.transcript_writer.recovered_bytes} "
+                     f"bytes of an incomplete segment", tag='info')
+        
+        # Keep the history index in step with the file
+        history_index = self.app.history_index
+        if truncate or history_index.get(filename) is None:
+            history_index.register(filename, time.time(), self.target_language,
+                                   size=os.path.getsize(filename))
+            if hasattr(self.app, 'history_component'):
+                self.app.history_component.load_history()
+    
+    def open_language_writer(self, language):
+        """Writers for the transcript of an additional target language, opened on first use"""
+        if language not in self.language_writers:
+            settings = self.app.settings_manager.get_settings()
+            filename = language_path(self.transcript_file, language)
+            writer = TranscriptWriter(
+                filename,
+                sync_interval=settings.get('sync_interval', 5.0),
+                sync_bytes=settings.get('sync_bytes', 64 * 1024),
+                terminator='\n\n'
+            ).open()
+            self.language_writers[language] = (
+                filename, writer, SegmentWriter(segment_path(filename)).open())
+            
+            history_index = self.app.history_index
+            if history_index.get(filename) is None:
+                history_index.register(filename, time.time(), language,
+                                       size=os.path.getsize(filename))
+                if hasattr(self.app, 'history_component'):
+                    self.ui_events.post_call(self.app.history_component.load_history)
+        return self.language_writers[language]
+    
+    def close_transcript_writer(self):
+        """Flush and close the current transcript writers, if any"""
+        with self.transcript_lock:
+            if self.transcript_writer:
+                self.transcript_writer.close()
+                self.transcript_writer = None
+            if self.segment_writer:
+                self.segment_writer.close()
+                self.segment_writer = None
+            for filename, writer, segment_writer in self.language_writers.values():
+                writer.close()
+                segment_writer.close()
+            self.language_writers = {}
+    
+    def sync_transcript(self):
+        """Make everything appended so far durable"""
+        with self.transcript_lock:
+            if self.transcript_writer:
+                self.transcript_writer.sync()
+            if self.segment_writer:
+                self.segment_writer.flush()
+            for filename, writer, segment_writer in self.language_writers.values():
+                writer.sync()
+                segment_writer.flush()
+    
+    def format_segment_record(self, segment):
+        """Build the transcript file record for a segment"""
+        # Records are stamped with the time the phrase was captured
+        timestamp = datetime.fromtimestamp(segment.end).strftime("%H:%M:%S")
+        speaker = f"{segment.speaker}: " if segment.speaker else ""
+        return (f"[{timestamp}] Recognized: {segment.original}\n"
+                f"[{timestamp}] {speaker}{segment.text}\n\n")
+    
+    def write_segment(self, segment):
+        """Record a committed segment, writing it out if a transcript file is open"""
+        translated = segment.translated is not None
+        structured = Segment(
+            segment.started_at, segment.captured_at,
+            segment.text, segment.formatted, segment.source_lang,
+            self.session_options['target_language'] if translated else segment.source_lang,
+            segment.confidence, segment.stream)
+        with self.transcript_lock:
+            if self.transcript_writer:
+                self.append_segment(structured)
+            else:
+                self.unsaved_segments.append(structured)
+            
+            # The additional target languages go to transcripts of their own
+            for language in self.session_options['target_languages'][1:]:
+                if not segment.translations or language not in segment.translations:
+                    continue
+                translated = segment.translations[language] is not None
+                structured = Segment(
+                    segment.started_at, segment.captured_at,
+                    segment.text, segment.formatted_translations[language], segment.source_lang,
+                    language if translated else segment.source_lang,
+                    segment.confidence, segment.stream)
+                if self.transcript_writer:
+                    self.append_segment(structured, language)
+                else:
+                    self.unsaved_translations.append((language, structured))
+    
+    def append_segment(self, segment, language=None):
+        """Append a segment to the transcript files and update the history index.
+        
+        ``language`` picks the transcript of an additional target language.
+        """
+        if language is None:
+            filename, writer, segment_writer = (
+                self.transcript_file, self.transcript_writer, self.segment_writer)
+        else:
+            filename, writer, segment_writer = self.open_language_writer(language)
+        
+        record = self.format_segment_record(segment)
+        writer.append(record)
+        segment_writer.append(segment)
+        if language is None:
+            self.segments_written += 1
+        self.app.history_index.record_segment(
+            filename, len(record.encode('utf-8')), segment.source_language,
+            text=f"{segment.original}\n{segment.text}",
+            timestamp=datetime.fromtimestamp(segment.end).strftime("%H:%M:%S"))
     
     def save_transcript(self):
         """Save current transcript to a file"""
-        if not self.transcript_file or not os.path.exists(self.transcript_file):
+        if not self.transcript_writer or not os.path.exists(self.transcript_file):
             self.save_transcript_as()
             return
             
-        # Get current text
-        text = self.log_area.get("1.0", tk.END)
-        
-        # Save to file
-        with open(self.transcript_file, 'w', encoding='utf-8') as file:
-            file.write(text)
+        # Segments are appended as they arrive, so saving only needs a sync
+        self.sync_transcript()
             
         self.log(f"Transcript saved to {self.transcript_file}", tag='info')
     
@@ -300,14 +588,17 @@ class TranscriptionTab:
         if not filename:
             return  # User cancelled
             
-        # Get current text
-        text = self.log_area.get("1.0", tk.END)
-        
-        # Save to file
-        with open(filename, 'w', encoding='utf-8') as file:
-            file.write(text)
+        # Write what has been transcribed so far, then keep appending
+        with self.transcript_lock:
+            self.open_transcript_writer(filename, truncate=True)
+            for segment in self.unsaved_segments:
+                self.append_segment(segment)
+            self.unsaved_segments = []
+            for language, segment in self.unsaved_translations:
+                self.append_segment(segment, language)
+            self.unsaved_translations = []
+            self.sync_transcript()
             
-        self.transcript_file = filename
         self.log(f"Transcript saved to {filename}", tag='info')
         
         # Refresh history in history tab
@@ -315,171 +606,520 @@ class TranscriptionTab:
             self.app.history_component.load_history()
     
     def export_as_doc(self):
-        """Export transcript to a document format"""
+        """Export the session as a document or subtitles"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        default_filename = f"professional_transcript_{timestamp}.txt"
+        default_filename = f"professional_transcript_{timestamp}.docx"
         
         filename = filedialog.asksaveasfilename(
-            defaultextension=".txt",
-            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+            defaultextension=".docx",
+            filetypes=[("Word document", "*.docx"), ("SubRip subtitles", "*.srt"),
+                       ("WebVTT subtitles", "*.vtt"), ("JSON Lines", "*.jsonl"),
+                       ("Text files", "*.txt")],
             initialfile=default_filename
         )
         
         if not filename:
             return
-            
-        # Get current text
-        text = self.log_area.get("1.0", tk.END)
-        
-        # Add header
-        header = f"PROFESSIONAL TRANSCRIPTION\n"
-        header += f"Date: {datetime.now().strftime('%Y-%m-%d')}\n"
-        header += f"Time: {datetime.now().strftime('%H:%M:%S')}\n"
-        header += f"Target Language: {self.target_lang_var.get()}\n"
-        header += "=" * 50 + "\n\n"
-        
-        # Save to file
-        with open(filename, 'w', encoding='utf-8') as file:
-            file.write(header + text)
-            
-        self.log(f"Transcript exported to {filename}", tag='info')
+        
+        try:
+            fmt = guess_format(filename)
+        except ValueError as e:
+            self.log(f"Export failed: {e}", tag='info')
+            return
+        
+        metadata = {
+            'Date': datetime.now().strftime('%Y-%m-%d'),
+            'Time': datetime.now().strftime('%H:%M:%S'),
+            'Target Language': self.target_lang_var.get(),
+        }
+        # Only the segments recorded so far; appends during the export are
+        # not picked up. Saved segments are streamed back from the .seg file
+        with self.transcript_lock:
+            if self.segment_writer:
+                self.segment_writer.flush()
+                segments = itertools.islice(read_segments(self.segment_writer.path),
+                                            self.export_from, self.segments_written)
+            else:
+                segments = list(self.unsaved_segments)
+        
+        def export():
+            try:
+                count = export_segments(segments, filename, fmt, metadata=metadata)
+                self.log(f"Exported {count} segments to {filename}", tag='info')
+                self.ui_events.post_status("Export finished")
+            except Exception as e:
+                self.log(f"Export failed: {e}", tag='info')
+                self.ui_events.post_status("Export failed")
+        
+        # Exports stream segment by segment off the UI thread
+        threading.Thread(target=export, daemon=True).start()
+        self.app.status_var.set(f"Exporting to {os.path.basename(filename)}...")
     
     def start_translation(self):
         """Start the translation/transcription process"""
         if self.is_listening:
             return
+        
+        # Get the selected microphone
+        mic_index = self.mic_dropdown.current()
+        if mic_index < 0:
+            self.log("No microphone selected", tag='info')
+            return
             
         # Update button states
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         
-        # Create new transcript file if auto-save is on
+        # Snapshot widgets and Tk variables here: the session runs on a
+        # worker thread, which must never touch Tk
         settings = self.app.settings_manager.get_settings()
+        self.session_options = {
+            'mic_index': mic_index,
+            'device_names': list(self.mic_dropdown['values']),
+            'extra_mics': list(self.extra_mics_list.curselection()),
+            'noise_reduction': self.noise_reduction_var.get(),
+            'translation_engine': self.translation_engine_var.get(),
+            'recognition_engine': self.engine_var.get(),
+            'auto_detect': self.auto_detect_var.get(),
+            'target_language': self.target_language,
+            'target_languages': list(self.target_languages),
+            'remove_fillers': self.format_filler_var.get(),
+            'fix_punctuation': self.format_punctuation_var.get(),
+            'fix_capitalization': self.format_caps_var.get(),
+            'interim': self.interim_var.get(),
+            'filler_words': self.parse_filler_words(
+                settings.get('filler_words', "um, uh, like, you know")),
+        }
+        
+        # Create new transcript file if auto-save is on
         if settings.get('auto_save', True):
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.transcript_file = f"professional_transcript_{timestamp}.txt"
+            self.open_transcript_writer(f"professional_transcript_{timestamp}.txt")
         
         # Update status
         self.app.status_var.set("Listening...")
         self.is_listening = True
         
         # Start listening in a separate thread
-        self.current_thread = threading.Thread(target=self.listen_and_translate)
+        self.current_thread = threading.Thread(target=self.listen_and_translate,
+                                               args=(settings, self.session_options))
         self.current_thread.daemon = True
         self.current_thread.start()
         
     def stop_translation(self):
         """Stop the translation/transcription process"""
         self.is_listening = False
-        self.app.status_var.set("Stopped")
+        if self.engine:
+            self.engine.stop()
         
-        # Update button states
+        # Start stays disabled until the engine thread has drained the
+        # phrases already captured and reset_buttons re-enables it
         self.stop_button.config(state=tk.DISABLED)
-        self.start_button.config(state=tk.NORMAL)
+        self.app.status_var.set("Stopping...")
         
         # Log stop event
         self.log("Transcription stopped", tag='info')
         
-    def listen_and_translate(self):
-        """Main function to listen to audio and translate in real-time"""
-        # Get the selected microphone
-        mic_index = self.mic_dropdown.current()
+    def close(self):
+        """Release what the tab keeps across sessions; called when the app closes"""
+        if self.engine is not None and self.is_listening:
+            self.engine.cancel()
+        # Trims the cache to its size cap and commits pending translations
+        self.translation_cache.close()
         
-        # Handle no microphones case
-        if mic_index < 0:
-            self.log("No microphone selected", tag='info')
-            self.stop_translation()
-            return
+    def listen_and_translate(self, settings, options):
+        """Main function to listen to audio and translate in real-time.
         
+        Runs on a worker thread; ``options`` holds everything read from
+        the widgets when the session was started.
+        """
         try:
-            with sr.Microphone(device_index=mic_index) as source:
-                # Configure audio processor
-                settings = self.app.settings_manager.get_settings()
+            with contextlib.ExitStack() as stack:
+                sources = self.open_sources(stack, options, settings)
                 
-                # Adjust for ambient noise
+                # Every source gets its own recognizer (energy threshold),
+                # noise profile and voice activity detector
                 self.log("Adjusting for ambient noise...", tag='info')
-                self.audio_processor.adjust_for_ambient_noise(source)
+                self.capture_tracks = []
+                listeners = []
+                taps = []
+                for speaker, source in sources:
+                    if len(sources) == 1:
+                        processor = self.audio_processor
+                    else:
+                        processor = AudioProcessor(self, recognizer=sr.Recognizer())
+                    
+                    processor.adjust_for_ambient_noise(source)
+                    
+                    # Set noise reduction based on slider
+                    processor.set_noise_reduction(options['noise_reduction'])
+                    processor.noise_reducer.cpu_budget = settings.get(
+                        'noise_reduction_cpu_budget', 0.25)
+                    
+                    # Configure energy threshold from settings
+                    if 'energy_threshold' in settings:
+                        processor.recognizer.energy_threshold = settings['energy_threshold']
+                    
+                    # Voice activity detection; phrases without speech never
+                    # reach the recognizer
+                    vad = None
+                    if settings.get('voice_activity_detection', True):
+                        vad = VoiceActivityDetector(**settings.get('vad_options', {}))
+                    
+                    self.capture_tracks.append((speaker, processor, vad))
+                    listeners.append((speaker, self.make_listener(source, processor, vad)))
+                    # Keeps the phrase being spoken for interim results and
+                    # notes when its speech ended, for the latency figures
+                    taps.append(PhraseTap.attach(source, processor.recognizer,
+                                                 window=settings.get('interim_window', 6.0)))
+                
+                # Load a custom proper noun glossary once
+                glossary_file = settings.get('glossary_file')
+                if glossary_file and glossary_file != self.loaded_glossary:
+                    try:
+                        count = self.text_formatter.load_glossary(glossary_file)
+                        self.loaded_glossary = glossary_file
+                        self.log(f"Loaded {count} glossary terms", tag='info')
+                    except Exception as e:
+                        self.log(f"Error loading glossary: {e}", tag='info')
+                
+                # Translation engine for this session
+                if not self.use_translator(options['translation_engine'], settings):
+                    return
+                
+                # Translation batching window
+                self.translation_batcher.window = settings.get('translation_batch_window', 0.3)
+                self.translation_batcher.max_batch = settings.get('translation_batch_size', 8)
+                
+                # Several target languages are translated side by side: the
+                # batcher sends one call per language of a batch at once and
+                # each translation worker can have all of its segment's
+                # languages in flight
+                target_languages = options['target_languages']
+                senders = max(2, len(target_languages))
+                if self.translation_batcher.senders != senders:
+                    batcher = self.translation_batcher
+                    self.translation_batcher = TranslationBatcher(
+                        batcher.translator, batcher.window, batcher.max_batch, senders)
+                    self.translator.translator = self.translation_batcher
+                    batcher.close()
+                translation_workers = settings.get('translation_workers',
+                                                   self.translation_batcher.max_batch)
+                if self.translation_fanout is not None:
+                    self.translation_fanout.close()
+                    self.translation_fanout = None
+                if len(target_languages) > 1:
+                    self.translation_fanout = TranslationFanout(
+                        self.translator,
+                        max_workers=translation_workers * (len(target_languages) - 1),
+                        on_error=self.on_fanout_error)
+                
+                # Language detection starts afresh every session
+                self.language_detector = LanguageDetector(
+                    self.translator, **settings.get('language_detection_options', {}))
                 
-                # Set noise reduction based on slider
-                self.audio_processor.set_noise_reduction(self.noise_reduction_var.get())
+                # Recognition engine for this session
+                engine = options['recognition_engine']
+                try:
+                    self.recognizer_backend = create_recognizer(
+                        engine, **settings.get('recognizer_options', {}).get(engine, {}))
+                except Exception as e:
+                    self.log(f"Could not start the {engine} recognizer: {e}", tag='info')
+                    return
+                self.recognition_policy = None
+                if not self.recognizer_backend.offline:
+                    self.recognition_policy = recognizer_policy(
+                        on_change=partial(self.on_service_state, "Speech recognition"),
+                        **settings.get('recognizer_resilience', {}))
+                    self.recognizer_backend = ResilientRecognizer(
+                        self.recognizer_backend, self.recognition_policy)
                 
-                # Configure energy threshold from settings
-                if 'energy_threshold' in settings:
-                    self.recognizer.energy_threshold = settings['energy_threshold']
+                # The engine runs capture, recognition and translation as
+                # separate stages so the microphone keeps listening while
+                # earlier phrases are still being processed. Several speakers
+                # share the worker pools and are merged into one timeline,
+                # held back at most speaker_merge_delay
+                self.engine = TranscriptionEngine(
+                    recognize=self.recognize_segment,
+                    translate=self.translate_segment,
+                    format_text=self.format_segment,
+                    on_error=self.on_pipeline_error,
+                    queue_size=settings.get('pipeline_queue_size', 32),
+                    recognition_workers=settings.get('recognition_workers', 2),
+                    # Enough translation workers to fill a batch
+                    translation_workers=translation_workers,
+                    max_delay=settings.get('speaker_merge_delay', 3.0) if len(listeners) > 1
+                    else None,
+                    on_interim=self.show_interim,
+                    interim_recognize=self.recognize_interim,
+                    interim_interval=settings.get('interim_interval', 0.5)
+                    if options['interim'] else None
+                )
+                for (speaker, source), (_, listen), tap in zip(sources, listeners, taps):
+                    # Stopping interrupts a phrase that is still being recorded
+                    self.engine.wrap_source(source)
+                    self.engine.add_stream(speaker, listen, tap,
+                                           partial(self.recognize_segment, stream=speaker))
+                if len(listeners) > 1:
+                    self.log(f"Listening to {len(listeners)} speakers: "
+                             f"{', '.join(speaker for speaker, _ in listeners)}", tag='info')
                 
-                # Configure phrase timeout
-                phrase_timeout = settings.get('phrase_timeout', 1.0)
+                # Stop may have been pressed before this engine existed
+                if not self.is_listening:
+                    self.engine.stop()
                 
                 self.log("Ready for speech", tag='info')
                 
-                # Main listening loop
-                while self.is_listening:
-                    try:
-                        # Listen for audio
-                        audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=10)
-                        
-                        # Update status
-                        self.app.status_var.set("Processing speech...")
-                        
-                        # Process the audio
-                        result = self.audio_processor.process_audio(
-                            audio, 
-                            auto_detect=self.auto_detect_var.get(),
-                            target_language=self.target_language
-                        )
-                        
-                        if result:
-                            original_text, translated_text, detected_lang = result
-                            
-                            # Log the recognized text
-                            self.log(f"Recognized: {original_text}", tag='source')
-                            
-                            # Format the text based on user settings
-                            formatting_options = {
-                                'remove_fillers': self.format_filler_var.get(),
-                                'fix_punctuation': self.format_punctuation_var.get(),
-                                'fix_caps': self.format_caps_var.get(),
-                                'filler_words': settings.get('filler_words', "um, uh, like, you know").split(',')
-                            }
-                            
-                            formatted_text = self.text_formatter.format_text(
-                                translated_text if translated_text else original_text,
-                                **formatting_options
-                            )
-                            
-                            # Log the formatted/translated text
-                            self.log(formatted_text, tag='translated')
-                            
-                            # Auto-save if enabled
-                            if self.transcript_file and settings.get('auto_save', True):
-                                self.save_transcript()
-                        
-                        # Update status
-                        self.app.status_var.set("Listening...")
-                            
-                    except sr.WaitTimeoutError:
-                        # No speech detected, continue listening
-                        continue
-                    except sr.UnknownValueError:
-                        # Speech was unintelligible
-                        self.app.status_var.set("Could not understand audio")
-                        time.sleep(1)
-                        self.app.status_var.set("Listening...")
-                    except Exception as e:
-                        # Log other errors
-                        self.log(f"Error: {e}", tag='info')
-                        time.sleep(1)
+                # Keep the microphones open until the engine has drained
+                asyncio.run(self.consume_segments(self.engine))
         
         except Exception as e:
             self.log(f"Microphone error: {e}", tag='info')
             
         finally:
             # Ensure buttons are reset
-            self.parent.after(0, self.reset_buttons)
+            self.ui_events.post_call(self.reset_buttons)
+    
+    async def consume_segments(self, engine):
+        """Commit the engine's segments as they come out"""
+        async for segment in engine.segments():
+            # A segment that can't be shown or saved must not end the session
+            try:
+                self.commit_segment(segment)
+            except Exception as e:
+                self.on_pipeline_error(segment, e)
+    
+    def use_translator(self, name, settings):
+        """Put the named translator backend (behind a RetryPolicy if online) behind the batcher and cache"""
+        # The backend (and its connections) is kept across sessions until
+        # the engine or any of its settings change
+        backend_options = settings.get('translator_options', {}).get(name, {})
+        resilience = settings.get('translator_resilience', {})
+        config = (name, backend_options, resilience)
+        if self.translator_backend is not None and self.translator_config == config:
+            return True
+        try:
+            backend = create_translator(name, **backend_options)
+        except Exception as e:
+            self.log(f"Could not start the {name} translator: {e}", tag='info')
+            return False
+        
+        if self.translator_backend is not None:
+            self.translator_backend.close()
+        self.translator_backend = backend
+        self.translator_config = copy.deepcopy(config)
+        self.translation_policy = None
+        if backend.offline:
+            self.translation_batcher.translator = backend
+            return True
+        
+        # Online services are paced to stay under their rate limits and
+        # retried with backoff; while one is down, captions come out
+        # untranslated instead of waiting on it
+        options = {'rate': 5.0, 'burst': 10}
+        options.update(resilience)
+        self.translation_policy = RetryPolicy(
+            on_change=partial(self.on_service_state, "Translation"), **options)
+        self.translation_batcher.translator = ResilientTranslator(backend, self.translation_policy)
+        return True
+    
+    def open_sources(self, stack, options, settings):
+        """Open the selected microphones (or channels) as (speaker, source) pairs.
+        
+        A single microphone has no speaker name. With input_channels above
+        1 and no additional speakers, each channel of the microphone is a
+        speaker. Names come from the speaker_names setting, in order, or
+        the device names.
+        """
+        mic_index = options['mic_index']
+        device_names = options['device_names']
+        speaker_names = settings.get('speaker_names', [])
+        indexes = [mic_index] + [index for index in options['extra_mics'] if index != mic_index]
+        
+        channels = settings.get('input_channels', 1)
+        if len(indexes) == 1 and channels > 1:
+            microphone = stack.enter_context(MultiChannelMicrophone(
+                device_index=mic_index, channels=channels, names=speaker_names))
+            return [(source.name, source) for source in microphone.sources]
+        
+        sources = []
+        for position, index in enumerate(indexes):
+            speaker = speaker_names[position] if position < len(speaker_names) \
+                else device_names[index]
+            if any(speaker == name for name, _ in sources):
+                speaker = f"{speaker} ({index})"
+            sources.append((speaker, stack.enter_context(sr.Microphone(device_index=index))))
+        if len(sources) == 1:
+            return [(None, sources[0][1])]
+        return sources
+    
+    def make_listener(self, source, processor, vad):
+        """Capture callable for one source"""
+        def listen():
+            audio = processor.recognizer.listen(source, timeout=5, phrase_time_limit=10)
+            return self.prepare_phrase(audio, processor, vad)
+        return listen
+    
+    def prepare_phrase(self, audio, processor, vad):
+        """Capture stage: reduce noise, then trim silence or drop phrases without speech"""
+        processor.reduce_noise(audio)
+        if vad is None:
+            return audio
+        return vad.process(audio)
+    
+    def recognize_segment(self, audio, stream=None):
+        """Recognition stage: turn captured audio into (text, source language, confidence)"""
+        if self.session_options['auto_detect']:
+            text, confidence = self.recognizer_backend.recognize(audio)
+            # Detect language of text; the speaker's language sticks, so
+            # most phrases don't need a detect() call
+            try:
+                source_lang = self.language_detector.detect(text, stream, confidence).lang
+            except Exception:
+                source_lang = 'en'  # Default to English if detection fails
+        else:
+            # Default to English as source
+            source_lang = 'en'
+            text, confidence = self.recognizer_backend.recognize(audio, language=source_lang)
+        
+        return text, source_lang, confidence
+    
+    def recognize_interim(self, audio):
+        """Recognition for interim results: text only, no language detection"""
+        if self.session_options['auto_detect']:
+            return self.recognizer_backend.recognize(audio)[0], None
+        return self.recognizer_backend.recognize(audio, language='en')[0], 'en'
+    
+    def show_interim(self, result):
+        """Show (or take down) a partial caption until its final segment lands"""
+        if result.text is None:
+            self.ui_events.post_call(self.transcript_view.clear_interim, result.key)
+            return
+        speaker = f"{result.stream}: " if result.stream else ""
+        self.ui_events.post_call(self.transcript_view.set_interim, result.key,
+                                 datetime.now().strftime("%H:%M:%S"),
+                                 f"{speaker}{result.text} ...")
+    
+    def translate_segment(self, text, source_lang):
+        """Translation stage: translate text unless it is already in the target language"""
+        target_languages = self.session_options['target_languages']
+        if len(target_languages) > 1:
+            # {language: text or None}, as slow as the slowest translation
+            return self.translation_fanout.translate(text, source_lang, target_languages)
+        
+        target_language = self.session_options['target_language']
+        if source_lang == target_language:
+            return None
+        return self.translator.translate(text, src=source_lang, dest=target_language).text
+    
+    def parse_filler_words(self, filler_words):
+        """Turn the comma-separated filler words setting into a tuple"""
+        return tuple(word.strip() for word in filler_words.split(',') if word.strip())
+    
+    def format_segment(self, text):
+        """Format stage: apply the user's formatting options"""
+        return self.text_formatter.format_text(
+            text,
+            remove_fillers=self.session_options['remove_fillers'],
+            fix_punctuation=self.session_options['fix_punctuation'],
+            fix_capitalization=self.session_options['fix_capitalization'],
+            filler_words=self.session_options['filler_words']
+        )
+    
+    def commit_segment(self, segment):
+        """Committer: show and save segments in the order they were captured"""
+        # Log the recognized text
+        speaker = f" ({segment.stream})" if segment.stream else ""
+        self.log(f"Recognized{speaker}: {segment.text}", tag='source')
+        
+        # Log the formatted/translated text
+        if segment.stream:
+            self.log(f"{segment.stream}: {segment.formatted}", tag='translated')
+        else:
+            self.log(segment.formatted, tag='translated')
+        
+        # Replaces the segment's interim result, after the lines above
+        self.ui_events.post_call(self.transcript_view.clear_interim,
+                                 (segment.stream, segment.phrase))
+        
+        # Append to the transcript file
+        self.write_segment(segment)
+        
+        # Show how far behind the later stages are
+        backlog = sum(self.engine.get_queue_depths().values())
+        if backlog:
+            self.ui_events.post_status(f"Listening... ({backlog} phrases queued)")
+        else:
+            self.ui_events.post_status("Listening...")
+    
+    def on_pipeline_error(self, segment, error):
+        """Report errors raised by any pipeline stage"""
+        if isinstance(error, sr.UnknownValueError):
+            # Speech was unintelligible
+            self.ui_events.post_status("Could not understand audio")
+        elif isinstance(error, CircuitOpenError):
+            # Reported once by on_service_state
+            pass
+        elif segment is not None and segment.formatted is not None:
+            # Finished segments only fail in the committer
+            self.log(f"Could not save segment: {error}", tag='info')
+        elif segment is not None and segment.text:
+            self.log(f"Translation error: {error}", tag='info')
+        else:
+            self.log(f"Error: {error}", tag='info')
+    
+    def on_fanout_error(self, language, error):
+        """Report a failed translation into one of several target languages"""
+        if not isinstance(error, CircuitOpenError):
+            self.log(f"Translation error ({language}): {error}", tag='info')
+    
+    def on_service_state(self, service, state):
+        """Report an online service going down (its circuit opening) or coming back"""
+        if state == OPEN:
+            fallback = " (captions stay untranslated)" if service == "Translation" else ""
+            self.log(f"{service} service unavailable; pausing calls to it{fallback}", tag='info')
+        else:
+            self.log(f"{service} service is back", tag='info')
     
     def reset_buttons(self):
         """Reset button states"""
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
         self.is_listening = False
-        self.app.status_var.set("Ready")
\ No newline at end of file
+        self.app.status_var.set("Ready")
+        
+        # The pipeline has drained, so everything can go to disk now
+        self.sync_transcript()
+        self.transcript_view.clear_interim()
+        
+        if self.engine is not None:
+            for histogram in self.engine.latency.values():
+                if histogram.count:
+                    self.log(histogram.summary(), tag='info')
+        
+        for speaker, processor, vad in self.capture_tracks:
+            prefix = f"{speaker}: " if speaker else ""
+            noise_stats = processor.noise_reducer.stats.snapshot()
+            if noise_stats['chunks']:
+                self.log(f"{prefix}Noise reduction: {noise_stats['load']:.1%} of a CPU core, "
+                         f"{noise_stats['skipped']} phrases over budget", tag='info')
+            if vad is not None and vad.stats.chunks:
+                self.log(prefix + vad.stats.summary(), tag='info')
+        
+        for name, policy in (("Speech recognition", self.recognition_policy),
+                             ("Translation", self.translation_policy)):
+            if policy is not None and (policy.stats.retries or policy.stats.rejected):
+                self.log(policy.stats.summary(name), tag='info')
+        
+        if self.language_detector.stats.calls:
+            self.log(self.language_detector.stats.summary(), tag='info')
+        
+        cache_stats = self.translation_cache.get_stats()
+        if cache_stats['hits'] or cache_stats['misses']:
+            self.log(f"Translation cache: {cache_stats['hits']} hits, "
+                     f"{cache_stats['misses']} misses", tag='info')
+        # Expire old translations and write the session's new ones to disk
+        self.translation_cache.prune()
+        
+        if self.translation_fanout is not None and self.translation_fanout.stats.segments:
+            self.log(self.translation_fanout.stats.summary(), tag='info')
\ No newline at end of file
@@ -1,5 +1,35 @@
 # Package initialization
 from .audio import AudioProcessor
 from .formatting import TextFormatter
+from .engine import TranscriptionEngine
+from .interim import PhraseTap
+from .language_detection import LanguageDetector
+from .resilience import RetryPolicy
+from .transcript_writer import TranscriptWriter
+from .batch import BatchTranscriber
+from .translation_cache import TranslationCache, CachedTranslator
+from .translation_batcher import TranslationBatcher
+from .translation_fanout import TranslationFanout
+from .ui_events import UIEventBus
+from .segment_store import SegmentStore
+from .history_index import HistoryIndex
+from .mapped_transcript import MappedTranscript
+from .transcript_model import Segment, Transcript, SegmentWriter
+from .exporters import export_segments, export_transcript
+from .recognizers import RecognizerBackend, create_recognizer
+from .translators import TranslatorBackend, create_translator
+from .vad import VoiceActivityDetector
+from .noise_reduction import SpectralGate
+from .channels import MultiChannelMicrophone
+from .server import CaptionServer
 
-__all__ = ["AudioProcessor", "TextFormatter"]
\ No newline at end of file
+__all__ = ["AudioProcessor", "TextFormatter", "TranscriptionEngine",
+           "PhraseTap", "LanguageDetector", "RetryPolicy", "TranscriptWriter",
+           "BatchTranscriber", "TranslationCache", "CachedTranslator",
+           "TranslationBatcher", "TranslationFanout", "UIEventBus", "SegmentStore",
+           "HistoryIndex", "MappedTranscript", "Segment", "Transcript",
+           "SegmentWriter", "export_segments", "export_transcript",
+           "RecognizerBackend", "create_recognizer", "TranslatorBackend",
+           "create_translator", "VoiceActivityDetector",
+           "SpectralGate", "MultiChannelMicrophone",
+           "CaptionServer"]
@@ -0,0 +1,293 @@
+"""
+Batch (offline) transcription of recorded audio files.
+
+Each file is split into fixed-length chunks that are recognized in a
+process pool. Results are stitched back together in order, run through
+the same TextFormatter options as live transcription and written with
+the append-only TranscriptWriter.
+
+Usage: python -m src.utils.batch DIRECTORY [--output DIR] [--language en]
+       [--target es] [--chunk 30] [--workers N] [--engine google|vosk|sphinx]
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import speech_recognition as sr
+from .formatting import TextFormatter
+from .recognizers import RECOGNIZER_BACKENDS, create_recognizer
+from .transcript_writer import TranscriptWriter
+from .transcript_model import Segment, SegmentWriter, segment_path
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.aiff', '.aif')
+
+# One recognizer per worker process, one translator for the main process
+_recognizer = None
+_backends = {}
+_translator = None
+
+
+def recognize_google(audio, language):
+    """Default recognizer: Google Web Speech via speech_recognition"""
+    global _recognizer
+    if _recognizer is None:
+        _recognizer = sr.Recognizer()
+    return _recognizer.recognize_google(audio, language=language)
+
+
+def recognize_backend(name, audio, language):
+    """Recognize with a named backend from recognizers.py (one instance per process)"""
+    if name not in _backends:
+        _backends[name] = create_recognizer(name)
+    return _backends[name].recognize(audio, language)[0]
+
+
+def find_audio_files(directory):
+    """Return the supported audio files in a directory, sorted by name"""
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(AUDIO_EXTENSIONS) and
+        os.path.isfile(os.path.join(directory, name))
+    )
+
+
+def plan_chunks(duration, chunk_seconds):
+    """Split a duration into (offset, length) pairs"""
+    chunks = []
+    offset = 0.0
+    while offset < duration:
+        length = min(chunk_seconds, duration - offset)
+        chunks.append((offset, length))
+        offset += chunk_seconds
+    return chunks
+
+
+def read_chunks(source, chunks):
+    """Yield the audio of each (offset, length) chunk, reading an open AudioFile once in order"""
+    position = 0
+    for offset, length in chunks:
+        end = int(round((offset + length) * source.SAMPLE_RATE))
+        frames = source.stream.read(end - position)
+        position = end
+        yield sr.AudioData(frames, source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+
+
+def recognize_chunk(job):
+    """Worker: recognize one chunk of a file"""
+    path, index, audio, language, recognize = job
+    try:
+        return path, index, recognize(audio, language), None
+    except sr.UnknownValueError:
+        # Silence or unintelligible speech
+        return path, index, "", None
+    except Exception as e:
+        return path, index, "", str(e)
+
+
+class BatchReport:
+    """Summary of a batch run"""
+
+    def __init__(self):
+        self.files = 0
+        self.chunks = 0
+        self.failed_chunks = 0
+        self.audio_seconds = 0.0
+        self.elapsed = 0.0
+        self.outputs = []
+        self.errors = []
+
+    @property
+    def files_per_second(self):
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def audio_seconds_per_second(self):
+        return self.audio_seconds / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        """One-line human readable summary"""
+        return (f"{self.files} files, {self.audio_seconds:.1f}s of audio in {self.elapsed:.1f}s "
+                f"({self.files_per_second:.2f} files/sec, "
+                f"{self.audio_seconds_per_second:.1f} audio-seconds/sec, "
+                f"{self.failed_chunks} failed chunks)")
+
+
+class BatchTranscriber:
+    """Transcribe a directory of audio files with a process pool"""
+
+    def __init__(self, recognize=recognize_google, translate=None, language='en',
+                 target_language=None, chunk_seconds=30.0, workers=None,
+                 remove_fillers=True, fix_punctuation=True, fix_capitalization=True,
+                 filler_words=None, history_index=None):
+        self.recognize = recognize
+        self.history_index = history_index
+        self.translate = translate
+        self.language = language
+        self.target_language = target_language
+        self.chunk_seconds = chunk_seconds
+        self.workers = workers
+        self.formatting_options = {
+            'remove_fillers': remove_fillers,
+            'fix_punctuation': fix_punctuation,
+            'fix_capitalization': fix_capitalization,
+            'filler_words': filler_words,
+        }
+        self.text_formatter = TextFormatter()
+
+    def output_path(self, path, output_dir):
+        """Transcript path for an audio file"""
+        name = os.path.splitext(os.path.basename(path))[0]
+        return os.path.join(output_dir, f"professional_transcript_{name}.txt")
+
+    def transcribe_directory(self, directory, output_dir=None):
+        """Transcribe every supported audio file in a directory"""
+        return self.transcribe_files(find_audio_files(directory), output_dir or directory)
+
+    def transcribe_files(self, paths, output_dir):
+        """Transcribe the given files and write one transcript per file"""
+        report = BatchReport()
+        start = time.perf_counter()
+
+        # Each file is decoded once and read front to back; its chunks are
+        # recognized in parallel while the next ones are read, with only a
+        # few chunks in flight so long files aren't held in memory
+        results = {}
+        durations = {}
+        window = 2 * (self.workers or os.cpu_count() or 1)
+        pending = deque()
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for path in paths:
+                try:
+                    with sr.AudioFile(path) as source:
+                        duration = source.DURATION
+                        chunks = plan_chunks(duration, self.chunk_seconds)
+                        results[path] = [None] * len(chunks)
+                        durations[path] = duration
+                        report.audio_seconds += duration
+                        for index, audio in enumerate(read_chunks(source, chunks)):
+                            pending.append(executor.submit(
+                                recognize_chunk, (path, index, audio, self.language, self.recognize)))
+                            while len(pending) >= window:
+                                self.collect(pending.popleft(), results, report)
+                except Exception as e:
+                    report.errors.append(f"{path}: {e}")
+            while pending:
+                self.collect(pending.popleft(), results, report)
+
+        # Stitch each file back in order
+        os.makedirs(output_dir, exist_ok=True)
+        for path in results:
+            output = self.output_path(path, output_dir)
+            self.write_transcript(output, results[path], os.path.getmtime(path), durations[path])
+            if self.history_index is not None:
+                self.history_index.register(
+                    output, os.path.getmtime(path), self.target_language,
+                    size=os.path.getsize(output),
+                    segments=sum(1 for text in results[path] if text),
+                    duration=durations[path], source_languages=[self.language])
+                self.history_index.index_segments(output, [
+                    (self.format_offset(index), text, self.language)
+                    for index, text in enumerate(results[path]) if text])
+            report.outputs.append(output)
+            report.files += 1
+
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def collect(self, future, results, report):
+        """Store the text of a recognized chunk"""
+        path, index, text, error = future.result()
+        results[path][index] = text
+        report.chunks += 1
+        if error:
+            report.failed_chunks += 1
+            report.errors.append(f"{path} chunk {index}: {error}")
+
+    def process_text(self, text):
+        """Translate (if requested) and format recognized text"""
+        if self.translate and self.target_language and self.target_language != self.language:
+            try:
+                text = self.translate(text, self.language, self.target_language)
+            except Exception:
+                pass  # Keep the original text if translation fails
+        return self.text_formatter.format_text(text, **self.formatting_options)
+
+    def format_offset(self, index):
+        """HH:MM:SS offset of a chunk within its file"""
+        seconds = int(index * self.chunk_seconds)
+        return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+    def write_transcript(self, output, texts, started=0.0, duration=None):
+        """Write recognized chunks using the live transcript record format.
+
+        A segment file with each chunk's timing (from ``started``) is
+        written beside the text transcript.
+        """
+        target_language = self.target_language or self.language
+        with TranscriptWriter(output, terminator='\n\n', truncate=True) as writer, \
+                SegmentWriter(segment_path(output), truncate=True) as segments:
+            for index, text in enumerate(texts):
+                if not text:
+                    continue
+                timestamp = self.format_offset(index)
+                processed = self.process_text(text)
+                writer.append(f"[{timestamp}] Recognized: {text}\n"
+                              f"[{timestamp}] {processed}\n\n")
+
+                offset = index * self.chunk_seconds
+                end = offset + self.chunk_seconds
+                if duration is not None:
+                    end = min(end, duration)
+                segments.append(Segment(started + offset, started + end, text, processed,
+                                        self.language, target_language))
+
+
+def googletrans_translate(text, source_lang, target_lang):
+    """Translate with googletrans; imported lazily so recognition-only runs don't need it"""
+    global _translator
+    if _translator is None:
+        from googletrans import Translator
+        _translator = Translator()
+    return _translator.translate(text, src=source_lang, dest=target_lang).text
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Transcribe a directory of audio files")
+    parser.add_argument("directory", help="directory containing WAV/FLAC/AIFF files")
+    parser.add_argument("--output", help="directory for transcripts (default: the input directory)")
+    parser.add_argument("--language", default="en", help="source language code")
+    parser.add_argument("--target", help="translate transcripts into this language code")
+    parser.add_argument("--chunk", type=float, default=30.0, help="chunk length in seconds")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--engine", choices=sorted(RECOGNIZER_BACKENDS), default="google",
+                        help="speech recognition engine")
+    parser.add_argument("--no-fillers", action="store_true", help="keep filler words")
+    parser.add_argument("--no-punctuation", action="store_true", help="don't fix punctuation")
+    parser.add_argument("--no-caps", action="store_true", help="don't fix capitalization")
+    args = parser.parse_args(argv)
+
+    transcriber = BatchTranscriber(
+        recognize=partial(recognize_backend, args.engine),
+        translate=googletrans_translate if args.target else None,
+        language=args.language,
+        target_language=args.target,
+        chunk_seconds=args.chunk,
+        workers=args.workers,
+        remove_fillers=not args.no_fillers,
+        fix_punctuation=not args.no_punctuation,
+        fix_capitalization=not args.no_caps
+    )
+    report = transcriber.transcribe_directory(args.directory, args.output)
+
+    for error in report.errors:
+        print(f"Error: {error}", file=sys.stderr)
+    print(report.summary())
+    return 0 if report.files else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Multichannel capture.
+
+A MultiChannelMicrophone opens one multichannel input device (an audio
+interface with a microphone per speaker, say) and exposes each channel
+as a ChannelSource that speech_recognition's ``Recognizer.listen`` can
+read from, so every channel can be transcribed as its own speaker track.
+ChannelSource also takes audio fed in from elsewhere, as the caption
+server does with published audio.
+"""
+import threading
+import numpy as np
+import speech_recognition as sr
+
+
+def split_channels(data, channels, sample_width=2):
+    """Split interleaved multichannel audio into one bytes buffer per channel"""
+    frames = np.frombuffer(data, dtype=f'<i{sample_width}')
+    frames = frames[:len(frames) - len(frames) % channels].reshape(-1, channels)
+    return [frames[:, channel].tobytes() for channel in range(channels)]
+
+
+class ChannelStream:
+    """Blocking read() over audio fed in by a MultiChannelMicrophone"""
+
+    def __init__(self, sample_width, max_bytes):
+        self.sample_width = sample_width
+        self.max_bytes = max_bytes
+        self.dropped_bytes = 0
+        self.bytes_read = 0
+        self._buffer = bytearray()
+        self._closed = False
+        self._condition = threading.Condition()
+
+    def feed(self, data):
+        with self._condition:
+            self._buffer += data
+            # Keep the newest audio if the reader has fallen behind
+            excess = len(self._buffer) - self.max_bytes
+            if excess > 0:
+                excess += (-excess) % self.sample_width
+                del self._buffer[:excess]
+                self.dropped_bytes += excess
+            self._condition.notify_all()
+
+    def read(self, frames):
+        """Return frames samples, or what is left (b"" at the end) once closed"""
+        size = frames * self.sample_width
+        with self._condition:
+            while len(self._buffer) < size and not self._closed:
+                self._condition.wait()
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            self.bytes_read += len(data)
+            return data
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+
+class ChannelSource(sr.AudioSource):
+    """One channel of a MultiChannelMicrophone, usable with Recognizer.listen"""
+
+    def __init__(self, name, sample_rate, sample_width, chunk_size, max_seconds=30.0):
+        self.name = name
+        self.SAMPLE_RATE = sample_rate
+        self.SAMPLE_WIDTH = sample_width
+        self.CHUNK = chunk_size
+        self.stream = ChannelStream(sample_width, int(max_seconds * sample_rate) * sample_width)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+
+class MultiChannelMicrophone:
+    """Open one multichannel input device and expose each channel as a source.
+
+    ``sources`` has one ChannelSource per channel; a reader thread splits
+    the interleaved input between them. Like ``sr.Microphone`` this needs
+    PyAudio.
+    """
+
+    def __init__(self, device_index=None, channels=2, sample_rate=None, chunk_size=1024,
+                 names=None):
+        self.device_index = device_index
+        self.channels = channels
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.names = list(names or [])
+        self.sources = []
+        if sample_rate:
+            self._create_sources(sample_rate, 2)
+        self._audio = None
+        self._stream = None
+        self._reader = None
+        self._running = False
+
+    def _create_sources(self, sample_rate, sample_width):
+        self.sources = [
+            ChannelSource(self.names[channel] if channel < len(self.names)
+                          else f"Channel {channel + 1}",
+                          sample_rate, sample_width, self.chunk_size)
+            for channel in range(self.channels)]
+
+    def feed(self, data):
+        """Distribute a block of interleaved input to the channel sources"""
+        width = self.sources[0].SAMPLE_WIDTH
+        for source, channel in zip(self.sources, split_channels(data, self.channels, width)):
+            source.stream.feed(channel)
+
+    def _read_loop(self):
+        while self._running:
+            try:
+                data = self._stream.read(self.chunk_size, exception_on_overflow=False)
+            except Exception:
+                break
+            self.feed(data)
+        for source in self.sources:
+            source.stream.close()
+
+    def __enter__(self):
+        pyaudio = sr.Microphone.get_pyaudio()
+        self._audio = pyaudio.PyAudio()
+        try:
+            sample_rate = self.sample_rate
+            if sample_rate is None:
+                info = (self._audio.get_device_info_by_index(self.device_index)
+                        if self.device_index is not None
+                        else self._audio.get_default_input_device_info())
+                sample_rate = int(info["defaultSampleRate"])
+            self._stream = self._audio.open(
+                input_device_index=self.device_index, channels=self.channels,
+                format=pyaudio.paInt16, rate=sample_rate,
+                frames_per_buffer=self.chunk_size, input=True)
+        except Exception:
+            self._audio.terminate()
+            raise
+
+        if not self.sources:
+            self._create_sources(sample_rate, pyaudio.get_sample_size(pyaudio.paInt16))
+        self._running = True
+        self._reader = threading.Thread(target=self._read_loop, name="multichannel-reader",
+                                        daemon=True)
+        self._reader.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._running = False
+        if self._reader:
+            self._reader.join(timeout=2.0)
+        try:
+            self._stream.stop_stream()
+        finally:
+            self._stream.close()
+            self._audio.terminate()
+        for source in self.sources:
+            source.stream.close()
@@ -0,0 +1,621 @@
+"""
+asyncio transcription engine, independent of any GUI.
+
+The engine runs the capture -> recognize -> translate -> format stages
+for one or more capture streams and hands finished segments out as an
+async iterator:
+
+    engine = TranscriptionEngine(recognize, translate, format_text)
+    engine.add_stream(None, listen)
+    async for segment in engine.segments():
+        print(segment.formatted)
+
+- the blocking callables (listen, recognize, translate, format_text) run
+  in thread pool executors; the event loop only moves segments around
+- every queue between stages is bounded, so a slow consumer holds back
+  translation, then recognition, and finally capture (backpressure)
+  instead of piling up segments in memory
+- several capture streams (separate microphones, or the channels of a
+  MultiChannelMicrophone) are transcribed as speaker tracks: every stream
+  listens on its own thread, the recognition and translation queues hand
+  out work round-robin across streams so a talkative speaker can't
+  starve the others, and segments come out merged into one timeline
+  ordered by the time their phrase started
+- ``stop()`` stops capturing at once, interrupting a phrase being
+  recorded, and finishes what was already captured; ``cancel()`` also
+  abandons the phrases in flight. Both are safe to call from any thread.
+  Capture is interrupted through the sources' streams (see
+  ``wrap_source``), since speech_recognition's listen() can't be
+  cancelled otherwise
+- with ``interim_interval`` set, streams added with a PhraseTap get
+  interim results: every interval the phrase still being spoken is
+  recognized and passed to ``on_interim`` until its final segment comes
+  out. Caption latency (speech end to text) is kept in histograms
+
+``on_error`` may be called from worker threads.
+
+Usage: python -m src.utils.engine [--mic INDEX] [--engine google]
+       [--language en] [--target es] [--translator googletrans] [--interim]
+"""
+import argparse
+import asyncio
+import heapq
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+import speech_recognition as sr
+from .interim import InterimResult, PhraseTap
+from .pipeline import LatencyHistogram, PipelineSegment, StageStats, translate_and_format
+
+# Marker used to tell the stages to shut down
+_STOP = object()
+
+
+class ListenInterrupted(Exception):
+    """Raised inside listen() when the engine stops capturing"""
+
+
+class InterruptibleStream:
+    """Audio stream whose read() fails once ``interrupted`` is set.
+
+    speech_recognition reads one chunk at a time while it listens, so a
+    listen() on the wrapped stream ends within a chunk of a stop.
+    """
+
+    def __init__(self, stream, interrupted):
+        self.stream = stream
+        self.interrupted = interrupted
+
+    def read(self, size):
+        if self.interrupted.is_set():
+            raise ListenInterrupted()
+        return self.stream.read(size)
+
+    def __getattr__(self, name):
+        # close() and everything else go to the wrapped stream
+        return getattr(self.stream, name)
+
+
+class CaptureStream:
+    """One speaker track: a name and the listen() callable feeding it"""
+
+    def __init__(self, name, listen):
+        self.name = name
+        self.listen = listen
+        self.captured = 0
+        self.committed = 0
+        self.errors = 0
+        self.closed = False
+
+        # Phrases captured here start no earlier than listening_since;
+        # in_flight holds the start times of phrases still being processed
+        self.listening_since = None
+        self.in_flight = {}
+
+    def watermark(self):
+        """Earliest start time a segment of this stream can still have"""
+        times = list(self.in_flight.values())
+        if not self.closed and self.listening_since is not None:
+            times.append(self.listening_since)
+        return min(times) if times else float('inf')
+
+
+class FairQueue:
+    """Bounded asyncio queue handing out items round-robin across keys"""
+
+    def __init__(self, maxsize=0):
+        self.maxsize = maxsize
+        self._queues = OrderedDict()
+        self._size = 0
+        self._changed = asyncio.Condition()
+
+    async def put(self, key, item):
+        """Add an item, waiting while the queue is full"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: not self.maxsize or self._size < self.maxsize)
+            self._queues.setdefault(key, deque()).append(item)
+            self._size += 1
+            self._changed.notify_all()
+
+    async def get(self):
+        """Take the next item, moving on to the next key afterwards"""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._size)
+            key, items = next(iter(self._queues.items()))
+            item = items.popleft()
+            self._size -= 1
+            if items:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            self._changed.notify_all()
+            return item
+
+    def qsize(self):
+        return self._size
+
+
+class TranscriptionEngine:
+    """Capture, recognize, translate and format as asyncio tasks.
+
+    Callables:
+        listen(): one per stream; block until a phrase is captured and
+            return its audio (may raise ``sr.WaitTimeoutError`` or return
+            None on silence)
+        recognize(audio): return ``(text, source_lang)`` or
+            ``(text, source_lang, confidence)``
+        translate(text, source_lang): return translated text, None or a
+            {language: text or None} dictionary
+        format_text(text): return the formatted text
+        on_error(segment, error): receive errors; segment may be None
+        on_interim(result): receive InterimResults; runs on the event loop
+        interim_recognize(audio): recognition for interim results
+            (defaults to recognize); only the text is used
+
+    Streams are added with ``add_stream(name, listen)`` before iterating
+    over ``segments()``. ``max_delay`` caps how long a segment is held
+    back waiting for other streams.
+    """
+
+    def __init__(self, recognize, translate=None, format_text=None, on_error=None,
+                 queue_size=32, recognition_workers=2, translation_workers=2,
+                 error_delay=1.0, max_delay=None, poll_interval=0.05,
+                 on_interim=None, interim_recognize=None, interim_interval=None):
+        self.recognize = recognize
+        self.translate = translate
+        self.format_text = format_text
+        self.on_error = on_error
+        self.on_interim = on_interim
+        self.interim_recognize = interim_recognize or recognize
+        self.interim_interval = interim_interval
+        self.queue_size = queue_size
+        self.recognition_workers = max(1, recognition_workers)
+        self.translation_workers = max(1, translation_workers)
+        self.error_delay = error_delay
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+
+        self.streams = []
+        self.stats = {
+            'capture': StageStats('capture'),
+            'recognition': StageStats('recognition'),
+            'translation': StageStats('translation'),
+            'format': StageStats('format'),
+            'end_to_end': StageStats('end_to_end'),
+            'interim': StageStats('interim'),
+        }
+        # From the end of the speech a text covers to the text coming out:
+        # the first text of each phrase (interim or final) and final segments
+        self.latency = {
+            'first_text': LatencyHistogram("First text"),
+            'final_text': LatencyHistogram("Final text"),
+        }
+        # PhraseTap of each stream that has one, by stream name
+        self.taps = {}
+        # Per-stream recognize callables, by stream name
+        self.recognizers = {}
+        # (stream, phrase) of phrases with an interim result showing
+        self._interim_shown = set()
+
+        # Set by stop() and cancel(); wrapped streams fail their next read
+        self.interrupted = threading.Event()
+        self.is_running = False
+        self.cancelled = False
+        self._loop = None
+        self._tasks = []
+        self._sequence = 0
+        self._timeline = []
+        self._queues = {}
+
+    def add_stream(self, name, listen, tap=None, recognize=None):
+        """Add a capture stream; name is the speaker track (None for a single source).
+
+        ``tap`` is the PhraseTap listen() reads through, for interim results
+        and speech end times. ``recognize`` replaces the engine's recognize
+        for this stream's phrases (to keep per-speaker state, say).
+        """
+        if self.is_running:
+            raise RuntimeError("Streams must be added before the engine starts")
+        if any(stream.name == name for stream in self.streams):
+            raise ValueError(f"There is already a stream named {name!r}")
+        self.streams.append(CaptureStream(name, listen))
+        if tap is not None:
+            self.taps[name] = tap
+        if recognize is not None:
+            self.recognizers[name] = recognize
+
+    def wrap_source(self, source):
+        """Make listen() on an open speech_recognition source stop with the engine"""
+        if not isinstance(source.stream, InterruptibleStream):
+            source.stream = InterruptibleStream(source.stream, self.interrupted)
+        return source
+
+    def stop(self):
+        """Stop capturing; phrases already captured are still processed"""
+        self.interrupted.set()
+
+    def cancel(self):
+        """Stop at once, abandoning the phrases still being processed"""
+        self.interrupted.set()
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(self._cancel)
+            except RuntimeError:
+                # The loop has already shut down
+                pass
+
+    def get_queue_depths(self):
+        """Return the number of items waiting in front of each stage"""
+        depths = {name: queue.qsize() for name, queue in self._queues.items()}
+        depths['commit'] = len(self._timeline)
+        return depths
+
+    def get_stats(self):
+        """Return queue depths, per-stage latency figures and per-stream counts"""
+        return {
+            'queue_depth': self.get_queue_depths(),
+            'latency': {name: stats.snapshot() for name, stats in self.stats.items()},
+            'streams': {stream.name: {'captured': stream.captured,
+                                      'committed': stream.committed,
+                                      'errors': stream.errors}
+                        for stream in self.streams},
+            'caption_latency': {name: histogram.snapshot()
+                                for name, histogram in self.latency.items()},
+        }
+
+    async def segments(self):
+        """Run the engine, yielding finished segments until it stops"""
+        if self.is_running:
+            raise RuntimeError("The engine is already running")
+        if not self.streams:
+            raise RuntimeError("No capture streams were added")
+
+        self._loop = asyncio.get_running_loop()
+        self.is_running = True
+        self.interrupted.clear()
+        self.cancelled = False
+        self._queues = {
+            'audio': FairQueue(self.queue_size),
+            'text': FairQueue(self.queue_size),
+            'result': asyncio.Queue(self.queue_size),
+            'output': asyncio.Queue(self.queue_size),
+        }
+
+        # Capture threads block in listen(), so every stream gets its own
+        self._capture_executor = ThreadPoolExecutor(
+            max_workers=len(self.streams), thread_name_prefix="engine-capture")
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.recognition_workers + self.translation_workers,
+            thread_name_prefix="engine-worker")
+        # Interim recognition never waits behind final segments
+        interim_streams = [stream for stream in self.streams if stream.name in self.taps] \
+            if self.interim_interval else []
+        self._interim_executor = ThreadPoolExecutor(
+            max_workers=max(1, len(interim_streams)), thread_name_prefix="engine-interim")
+        self._interim_shown.clear()
+
+        captures = [self._spawn(self._capture_loop(stream)) for stream in self.streams]
+        interim = [self._spawn(self._interim_loop(stream, self.taps[stream.name]))
+                   for stream in interim_streams]
+        recognition = [self._spawn(self._recognition_worker())
+                       for _ in range(self.recognition_workers)]
+        translation = [self._spawn(self._translation_worker())
+                       for _ in range(self.translation_workers)]
+        committer = self._spawn(self._committer())
+        self._spawn(self._shutdown(captures, interim, recognition, translation, committer))
+
+        try:
+            while True:
+                segment = await self._queues['output'].get()
+                if segment is _STOP:
+                    break
+                yield segment
+        finally:
+            # Leaving the loop early (break, an exception or the consumer
+            # being cancelled) cancels everything still running
+            self._cancel(notify=False)
+            # Queued calls were cancelled with their tasks; a listen() still
+            # running ends at its next read
+            self._capture_executor.shutdown(wait=False)
+            self._executor.shutdown(wait=False)
+            self._interim_executor.shutdown(wait=False)
+            self.is_running = False
+
+    def _spawn(self, coroutine):
+        task = asyncio.ensure_future(coroutine)
+        self._tasks.append(task)
+        return task
+
+    def _cancel(self, notify=True):
+        """Cancel every stage; runs on the event loop"""
+        self.interrupted.set()
+        pending = [task for task in self._tasks if not task.done()]
+        if not pending:
+            return
+        self.cancelled = True
+        for task in pending:
+            task.cancel()
+        if notify:
+            # Segments nobody has taken yet are dropped too
+            output = self._queues['output']
+            while not output.empty():
+                output.get_nowait()
+            output.put_nowait(_STOP)
+
+    def _report_error(self, segment, error):
+        """Forward an error to the error callback, if any"""
+        if self.on_error:
+            try:
+                self.on_error(segment, error)
+            except Exception:
+                pass
+
+    def _show_interim(self, result):
+        """Pass an interim result on; runs on the event loop"""
+        key = result.key
+        if result.text is None:
+            if key not in self._interim_shown:
+                return
+            self._interim_shown.discard(key)
+        elif key not in self._interim_shown:
+            self._interim_shown.add(key)
+            if result.speech_ended_at is not None:
+                self.latency['first_text'].record(
+                    max(0.0, result.created_at - result.speech_ended_at))
+        if self.on_interim:
+            try:
+                self.on_interim(result)
+            except Exception:
+                pass
+
+    async def _run(self, executor, function, *args):
+        return await self._loop.run_in_executor(executor, function, *args)
+
+    async def _capture_loop(self, stream):
+        """Listen for phrases on one stream and queue them for recognition"""
+        tap = self.taps.get(stream.name)
+        try:
+            while not self.interrupted.is_set():
+                stream.listening_since = time.time()
+                phrase = tap.begin() if tap is not None else None
+                try:
+                    audio = await self._run(self._capture_executor, stream.listen)
+                except sr.WaitTimeoutError:
+                    # No speech detected, continue listening
+                    audio = None
+                except ListenInterrupted:
+                    break
+                except Exception as e:
+                    stream.errors += 1
+                    self._report_error(None, e)
+                    audio = None
+                    await asyncio.sleep(self.error_delay)
+                finally:
+                    speech_ended_at = tap.end() if tap is not None else None
+
+                if audio is None:
+                    # Nothing to replace an interim result with
+                    self._show_interim(InterimResult(stream.name, phrase, None))
+                    continue
+
+                segment = PipelineSegment(self._sequence, audio, time.time(), stream=stream.name)
+                segment.phrase = phrase
+                segment.speech_ended_at = speech_ended_at
+                self._sequence += 1
+                stream.captured += 1
+                stream.in_flight[segment.sequence] = segment.started_at
+
+                # Only the hand-off is timed; it is where backpressure shows
+                start = time.perf_counter()
+                await self._queues['audio'].put(stream.name, segment)
+                self.stats['capture'].record(time.perf_counter() - start)
+        finally:
+            stream.closed = True
+            if tap is not None:
+                # A phrase cut off by a stop never gets a final segment
+                self._show_interim(InterimResult(stream.name, tap.phrase, None))
+
+    async def _interim_loop(self, stream, tap):
+        """Recognize the phrase being spoken on one stream every interim_interval"""
+        while not self.interrupted.is_set():
+            await asyncio.sleep(self.interim_interval)
+            snapshot = tap.snapshot()
+            if snapshot is None:
+                continue
+
+            phrase, audio, speech_ended_at = snapshot
+            start = time.perf_counter()
+            try:
+                result = await self._run(self._interim_executor, self.interim_recognize, audio)
+            except Exception:
+                # Most are half words the recognizer can't make out yet; the
+                # final segment reports real errors
+                continue
+            self.stats['interim'].record(time.perf_counter() - start)
+
+            text = result[0] if isinstance(result, tuple) else result
+            # Too late once the phrase is over: its final segment is on the way
+            if text and tap.active and tap.phrase == phrase:
+                self._show_interim(InterimResult(stream.name, phrase, text, speech_ended_at))
+
+    async def _shutdown(self, captures, interim, recognition, translation, committer):
+        """Drain the stages one after another once capture has stopped"""
+        await asyncio.gather(*captures)
+        for task in interim:
+            task.cancel()
+        await asyncio.gather(*interim, return_exceptions=True)
+        for _ in recognition:
+            await self._queues['audio'].put(None, _STOP)
+        await asyncio.gather(*recognition)
+        for _ in translation:
+            await self._queues['text'].put(None, _STOP)
+        await asyncio.gather(*translation)
+        await self._queues['result'].put(_STOP)
+        await committer
+        await self._queues['output'].put(_STOP)
+
+    def _recognize(self, segment):
+        """Recognition stage for one segment; runs in the executor"""
+        start = time.perf_counter()
+        try:
+            recognize = self.recognizers.get(segment.stream, self.recognize)
+            result = recognize(segment.audio)
+            segment.text, segment.source_lang = result[:2]
+            # Backends that report a confidence return it third
+            segment.confidence = result[2] if len(result) > 2 else None
+        except Exception as e:
+            segment.error = e
+            self._report_error(segment, e)
+        self.stats['recognition'].record(time.perf_counter() - start)
+
+        # The audio is no longer needed once it has been recognized
+        segment.audio = None
+
+    async def _recognition_worker(self):
+        """Turn captured audio into text"""
+        while True:
+            segment = await self._queues['audio'].get()
+            if segment is _STOP:
+                break
+
+            await self._run(self._executor, self._recognize, segment)
+            if segment.error is not None or not segment.text:
+                await self._queues['result'].put(segment)
+            else:
+                await self._queues['text'].put(segment.stream, segment)
+
+    async def _translation_worker(self):
+        """Translate and format recognized text"""
+        while True:
+            segment = await self._queues['text'].get()
+            if segment is _STOP:
+                break
+
+            await self._run(self._executor, translate_and_format, segment, self.translate,
+                            self.format_text, self.stats, self._report_error)
+            await self._queues['result'].put(segment)
+
+    async def _committer(self):
+        """Merge finished segments from all streams into one timeline"""
+        streams = {stream.name: stream for stream in self.streams}
+        results = self._queues['result']
+        order = 0
+        while True:
+            try:
+                segment = await asyncio.wait_for(results.get(), self.poll_interval)
+            except asyncio.TimeoutError:
+                segment = None
+
+            if segment is _STOP:
+                await self._emit(float('inf'))
+                break
+
+            if segment is not None:
+                stream = streams[segment.stream]
+                stream.in_flight.pop(segment.sequence, None)
+                if segment.error is not None or not segment.text:
+                    stream.errors += segment.error is not None
+                    self._show_interim(InterimResult(segment.stream, segment.phrase, None))
+                else:
+                    # order breaks ties so segments themselves are never compared
+                    heapq.heappush(self._timeline, (segment.started_at, order, segment))
+                    order += 1
+
+            watermark = min(stream.watermark() for stream in self.streams)
+            if self.max_delay is not None:
+                watermark = max(watermark, time.time() - self.max_delay)
+            await self._emit(watermark)
+
+    async def _emit(self, watermark):
+        """Hand out the segments that started before the watermark"""
+        streams = {stream.name: stream for stream in self.streams}
+        while self._timeline and self._timeline[0][0] <= watermark:
+            segment = heapq.heappop(self._timeline)[2]
+            now = time.time()
+            self.stats['end_to_end'].record(now - segment.captured_at)
+            # Without a tap, the phrase ended up to a pause before it was captured
+            speech_ended_at = segment.speech_ended_at or segment.captured_at
+            latency = max(0.0, now - speech_ended_at)
+            self.latency['final_text'].record(latency)
+            key = (segment.stream, segment.phrase)
+            if key in self._interim_shown:
+                # The consumer replaces the interim result with this segment
+                self._interim_shown.discard(key)
+            else:
+                self.latency['first_text'].record(latency)
+            streams[segment.stream].committed += 1
+            # Waits while the consumer is behind
+            await self._queues['output'].put(segment)
+
+
+async def _print_segments(engine):
+    async for segment in engine.segments():
+        print(segment.formatted, flush=True)
+
+
+def main(argv=None):
+    """Command line entry point: transcribe a microphone to standard output"""
+    from .formatting import TextFormatter
+    from .recognizers import RECOGNIZER_BACKENDS, create_recognizer
+    from .translators import TRANSLATOR_BACKENDS, create_translator
+
+    parser = argparse.ArgumentParser(description="Transcribe a microphone without the GUI")
+    parser.add_argument("--mic", type=int, help="microphone device index")
+    parser.add_argument("--engine", choices=sorted(RECOGNIZER_BACKENDS), default="google",
+                        help="speech recognition engine")
+    parser.add_argument("--language", default="en", help="source language code")
+    parser.add_argument("--target", help="translate into this language code")
+    parser.add_argument("--translator", choices=sorted(TRANSLATOR_BACKENDS),
+                        default="googletrans", help="translation engine")
+    parser.add_argument("--interim", action="store_true",
+                        help="show interim results while a phrase is spoken")
+    args = parser.parse_args(argv)
+
+    backend = create_recognizer(args.engine)
+    translator = create_translator(args.translator) if args.target else None
+    formatter = TextFormatter()
+    recognizer = sr.Recognizer()
+
+    def recognize(audio):
+        text, confidence = backend.recognize(audio, language=args.language)
+        return text, args.language, confidence
+
+    def translate(text, source_lang):
+        if source_lang == args.target:
+            return None
+        return translator.translate(text, src=source_lang, dest=args.target).text
+
+    def report(segment, error):
+        if not isinstance(error, sr.UnknownValueError):
+            print(f"Error: {error}", file=sys.stderr)
+
+    def show_interim(result):
+        if result.text:
+            print(f"... {result.text}", file=sys.stderr, flush=True)
+
+    engine = TranscriptionEngine(recognize, translate if translator else None,
+                                 formatter.format_text, on_error=report,
+                                 on_interim=show_interim,
+                                 interim_interval=0.5 if args.interim else None)
+    with sr.Microphone(device_index=args.mic) as source:
+        recognizer.adjust_for_ambient_noise(source)
+        tap = PhraseTap.attach(source, recognizer)
+        engine.wrap_source(source)
+        engine.add_stream(None, lambda: recognizer.listen(source, timeout=5,
+                                                          phrase_time_limit=10), tap)
+        print("Listening (Ctrl+C to stop)...", file=sys.stderr)
+        try:
+            asyncio.run(_print_segments(engine))
+        except KeyboardInterrupt:
+            engine.cancel()
+    print(engine.latency['first_text'].summary(), file=sys.stderr)
+    if translator:
+        translator.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""
+Streaming transcript exporters: SRT, WebVTT, JSON Lines, DOCX and text.
+
+Every format is a generator that yields output one segment at a time, so
+exporting a long archive read with ``read_segments`` uses constant memory.
+Segment times are written relative to ``origin`` (by default the start
+of the first segment).
+
+Usage: python -m src.utils.exporters TRANSCRIPT OUTPUT [--format srt]
+       [--content translated|original|both]
+"""
+import argparse
+import json
+import os
+import sys
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+from .transcript_model import read_segments, segment_path
+
+EXPORT_FORMATS = ('srt', 'vtt', 'jsonl', 'docx', 'txt')
+
+# Minimal package parts for a WordprocessingML document
+_DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>')
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/'
+    '2006/relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>')
+_DOCX_NAMESPACE = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+
+
+def format_timestamp(seconds, separator=','):
+    """HH:MM:SS,mmm (SRT) or HH:MM:SS.mmm (WebVTT with separator='.')"""
+    milliseconds = max(0, int(round(seconds * 1000)))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{milliseconds:03d}"
+
+
+def segment_lines(segment, content='translated'):
+    """Return the text lines to show for a segment"""
+    if content == 'original':
+        lines = [segment.original]
+    elif content == 'both' and segment.translated is not None and \
+            segment.translated != segment.original:
+        lines = [segment.original, segment.translated]
+    else:
+        lines = [segment.text]
+    # Blank lines end a subtitle cue, so drop them
+    return [line for text in lines for line in text.splitlines() if line.strip()]
+
+
+def speaker_lines(segment, content='translated'):
+    """Text lines of a segment, the first one labelled with its speaker"""
+    lines = segment_lines(segment, content)
+    if lines and segment.speaker:
+        lines[0] = f"{segment.speaker}: {lines[0]}"
+    return lines
+
+
+def _relative(segments, origin):
+    """Yield (start, end, segment) with times relative to origin"""
+    for segment in segments:
+        if origin is None:
+            origin = segment.start
+        yield segment.start - origin, segment.end - origin, segment
+
+
+def iter_srt(segments, origin=None, content='translated'):
+    """Yield SubRip cues"""
+    number = 0
+    for start, end, segment in _relative(segments, origin):
+        lines = speaker_lines(segment, content)
+        if not lines:
+            continue
+        number += 1
+        yield (f"{number}\n{format_timestamp(start)} --> {format_timestamp(end)}\n"
+               + '\n'.join(lines) + "\n\n")
+
+
+def iter_vtt(segments, origin=None, content='translated'):
+    """Yield a WebVTT header and cues"""
+    yield "WEBVTT\n\n"
+    for start, end, segment in _relative(segments, origin):
+        lines = segment_lines(segment, content)
+        if not lines:
+            continue
+        # Cue text is HTML-like; escaping also keeps "-->" out of it
+        text = '\n'.join(escape(line) for line in lines)
+        if segment.speaker:
+            text = f"<v {escape(segment.speaker)}>{text}"
+        yield (f"{format_timestamp(start, '.')} --> {format_timestamp(end, '.')}\n"
+               f"{text}\n\n")
+
+
+def iter_jsonl(segments, origin=None, content=None):
+    """Yield one JSON object per segment"""
+    for start, end, segment in _relative(segments, origin):
+        yield json.dumps({
+            'start': round(start, 3),
+            'end': round(end, 3),
+            'original': segment.original,
+            'translated': segment.translated,
+            'source_language': segment.source_language,
+            'target_language': segment.target_language,
+            'confidence': segment.confidence,
+            'speaker': segment.speaker,
+        }, ensure_ascii=False) + "\n"
+
+
+def iter_text(segments, origin=None, content='translated', metadata=None):
+    """Yield a plain text transcript with a metadata header"""
+    header = "PROFESSIONAL TRANSCRIPTION\n"
+    for key, value in (metadata or {}).items():
+        header += f"{key}: {value}\n"
+    yield header + "=" * 50 + "\n\n"
+
+    for start, end, segment in _relative(segments, origin):
+        timestamp = format_timestamp(start)[:8]
+        yield ''.join(f"[{timestamp}] {line}\n" for line in speaker_lines(segment, content)) + "\n"
+
+
+def iter_docx_document(segments, origin=None, content='translated', metadata=None):
+    """Yield the word/document.xml part of a DOCX file"""
+    yield ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+           f'<w:document xmlns:w="{_DOCX_NAMESPACE}"><w:body>'
+           '<w:p><w:r><w:rPr><w:b/><w:sz w:val="32"/></w:rPr>'
+           '<w:t>PROFESSIONAL TRANSCRIPTION</w:t></w:r></w:p>')
+    for key, value in (metadata or {}).items():
+        yield f'<w:p><w:r><w:t xml:space="preserve">{escape(f"{key}: {value}")}</w:t></w:r></w:p>'
+
+    for start, end, segment in _relative(segments, origin):
+        runs = [f'<w:r><w:rPr><w:b/></w:rPr><w:t xml:space="preserve">'
+                f'[{format_timestamp(start)[:8]}] </w:t></w:r>']
+        for number, line in enumerate(speaker_lines(segment, content)):
+            if number:
+                runs.append('<w:r><w:br/></w:r>')
+            runs.append(f'<w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r>')
+        yield f"<w:p>{''.join(runs)}</w:p>"
+
+    yield '<w:sectPr/></w:body></w:document>'
+
+
+_TEXT_EXPORTERS = {
+    'srt': iter_srt,
+    'vtt': iter_vtt,
+    'jsonl': iter_jsonl,
+    'txt': iter_text,
+}
+
+
+def guess_format(path):
+    """Export format for an output path, from its extension"""
+    extension = os.path.splitext(path)[1].lower().lstrip('.')
+    if extension == 'json':
+        extension = 'jsonl'
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {extension or path}")
+    return extension
+
+
+def export_segments(segments, path, fmt=None, origin=None, content='translated',
+                    metadata=None):
+    """Stream segments to path in the given (or guessed) format.
+
+    Returns the number of segments written.
+    """
+    fmt = fmt or guess_format(path)
+    counted = _Counter(segments)
+
+    if fmt == 'docx':
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('[Content_Types].xml', _DOCX_CONTENT_TYPES)
+            archive.writestr('_rels/.rels', _DOCX_RELS)
+            with archive.open('word/document.xml', 'w') as part:
+                for chunk in iter_docx_document(counted, origin, content, metadata):
+                    part.write(chunk.encode('utf-8'))
+        return counted.count
+
+    if fmt not in _TEXT_EXPORTERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    options = {'metadata': metadata} if fmt == 'txt' else {}
+    with open(path, 'w', encoding='utf-8', newline='\n') as file:
+        for chunk in _TEXT_EXPORTERS[fmt](counted, origin, content, **options):
+            file.write(chunk)
+    return counted.count
+
+
+def export_transcript(source, destination, fmt=None, **options):
+    """Export a saved transcript (its .txt or .seg path) without the GUI"""
+    if not source.endswith('.seg'):
+        source = segment_path(source)
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"No segment data for this transcript: {source}")
+    return export_segments(read_segments(source), destination, fmt, **options)
+
+
+class _Counter:
+    """Iterator wrapper counting the segments that went through it"""
+
+    def __init__(self, segments):
+        self._segments = iter(segments)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        segment = next(self._segments)
+        self.count += 1
+        return segment
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Export a saved transcript")
+    parser.add_argument("transcript", help="transcript .txt file or its .seg segment file")
+    parser.add_argument("output", help="output file")
+    parser.add_argument("--format", choices=EXPORT_FORMATS,
+                        help="output format (default: from the output extension)")
+    parser.add_argument("--content", choices=('translated', 'original', 'both'),
+                        default='translated', help="which text to export")
+    args = parser.parse_args(argv)
+
+    try:
+        count = export_transcript(
+            args.transcript, args.output, args.format, content=args.content,
+            metadata={'Exported': datetime.now().strftime('%Y-%m-%d %H:%M:%S')})
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Exported {count} segments to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
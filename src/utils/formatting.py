@@ -1,4 +1,153 @@
 import re
+from functools import lru_cache
+
+# Collapses the gaps left behind by removed words
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Commas stranded by removed words: back to back, after a space, before
+# the end of a sentence, or at either end of the text
+_DOUBLE_COMMA_RE = re.compile(r',(\s*,)+')
+_SPACE_BEFORE_COMMA_RE = re.compile(r'\s+,')
+_LOOSE_COMMA_RE = re.compile(r',\s*(?=[.!?])|^[\s,]+|[\s,]+$')
+
+# Words and single punctuation marks; together they cover every
+# non-whitespace character of a text
+_TOKEN_RE = re.compile(r'\w+|[^\w\s]')
+
+# Trie key that holds the glossary form of a complete entry
+_ENTRY = None
+
+
+def _trie_alternation(words):
+    """Build a regex alternation for the given words, shaped like a trie.
+
+    Words sharing a prefix share a branch, so matching cost depends on the
+    length of the text rather than on the number of words. At every branch
+    the longer continuations are tried before stopping, which means the
+    longest entry wins when several could match.
+    """
+    trie = {}
+    for word in words:
+        # Merge case variants; keep the word as is if lowering changes its length
+        lowered = word.lower()
+        node = trie
+        for char in (lowered if len(lowered) == len(word) else word):
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        is_end = '' in node
+        branches = [re.escape(char) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if len(branches) == 1 and not is_end:
+            return branches[0]
+        group = '(?:' + '|'.join(branches) + ')'
+        return group + '?' if is_end else group
+
+    return build(trie)
+
+
+@lru_cache(maxsize=32)
+def compile_filler_pattern(filler_words):
+    """Compile a tuple of filler words into a single alternation.
+
+    Longer entries win over shorter ones, so a phrase such as "you know"
+    is removed as a whole rather than leaving "know" behind after "you"
+    matched.
+    """
+    words = [word for word in filler_words if word]
+    if not words:
+        return None
+    return re.compile(r'\b(?:' + _trie_alternation(words) + r')\b', flags=re.IGNORECASE)
+
+
+class ProperNounMatcher:
+    """Restore the glossary casing of proper nouns using a token trie.
+
+    Entries are split into word and punctuation tokens and stored in a
+    trie keyed on lowercase tokens, so "united states", "iPhone" and
+    "McDonald's" are all found in a single scan over the text. The cost of
+    a lookup depends on the text, not on the number of entries.
+    """
+
+    def __init__(self, entries=()):
+        self.root = {}
+        self.size = 0
+        self.add_all(entries)
+
+    def _keys(self, text):
+        """Trie keys for a text; tokens after whitespace get a leading space"""
+        keys = []
+        previous_end = None
+        for match in _TOKEN_RE.finditer(text):
+            key = match.group().lower()
+            if previous_end is not None and match.start() > previous_end:
+                key = ' ' + key
+            keys.append(key)
+            previous_end = match.end()
+        return keys
+
+    def add(self, entry):
+        """Add a glossary entry, written the way it should appear"""
+        keys = self._keys(entry.strip())
+        if not keys:
+            return
+        node = self.root
+        for key in keys:
+            node = node.setdefault(key, {})
+        if _ENTRY not in node:
+            self.size += 1
+        node[_ENTRY] = entry.strip()
+
+    def add_all(self, entries):
+        """Add several glossary entries"""
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return self.size
+
+    def apply(self, text):
+        """Replace every glossary match in the text with its glossary form"""
+        tokens = list(_TOKEN_RE.finditer(text))
+        count = len(tokens)
+        parts = []
+        last = 0
+        i = 0
+        while i < count:
+            node = self.root.get(tokens[i].group().lower())
+            match_end = None
+            replacement = None
+            j = i
+            # Walk the trie as far as it goes and keep the longest entry
+            while node is not None:
+                if _ENTRY in node:
+                    match_end = j
+                    replacement = node[_ENTRY]
+                j += 1
+                if j >= count:
+                    break
+                key = tokens[j].group().lower()
+                if tokens[j].start() > tokens[j - 1].end():
+                    key = ' ' + key
+                node = node.get(key)
+
+            if replacement is None:
+                i += 1
+                continue
+
+            parts.append(text[last:tokens[i].start()])
+            parts.append(replacement)
+            last = tokens[match_end].end()
+            i = match_end + 1
+
+        if not parts:
+            return text
+        parts.append(text[last:])
+        return ''.join(parts)
+
 
 class TextFormatter:
     """Class that handles all text formatting operations"""
@@ -11,17 +160,31 @@ class TextFormatter:
             "hmm", "err", "sort of", "kind of"
         ]
         
-        # Common proper nouns to capitalize
+        # Common proper nouns to capitalize, written the way they should appear
         self.common_proper_nouns = [
-            "i", "monday", "tuesday", "wednesday", "thursday", 
-            "friday", "saturday", "sunday", "january", "february", 
-            "march", "april", "may", "june", "july", "august", 
-            "september", "october", "november", "december",
-            "america", "europe", "asia", "africa", "australia",
-            "united states", "canada", "mexico", "china", "japan",
-            "india", "russia", "germany", "france", "uk", "england",
-            "brazil", "australia", "italy", "spain"
+            "I", "Monday", "Tuesday", "Wednesday", "Thursday", 
+            "Friday", "Saturday", "Sunday", "January", "February", 
+            "March", "April", "May", "June", "July", "August", 
+            "September", "October", "November", "December",
+            "America", "Europe", "Asia", "Africa", "Australia",
+            "United States", "Canada", "Mexico", "China", "Japan",
+            "India", "Russia", "Germany", "France", "UK", "England",
+            "Brazil", "Italy", "Spain"
         ]
+        self.proper_noun_matcher = ProperNounMatcher(self.common_proper_nouns)
+    
+    def add_proper_nouns(self, words):
+        """Add custom glossary entries (names, product terms, clients)"""
+        words = [word.strip() for word in words if word.strip()]
+        self.common_proper_nouns.extend(words)
+        self.proper_noun_matcher.add_all(words)
+        return len(words)
+    
+    def load_glossary(self, path):
+        """Load glossary entries from a file, one per line ('#' starts a comment)"""
+        with open(path, 'r', encoding='utf-8') as file:
+            words = [line for line in file if not line.lstrip().startswith('#')]
+        return self.add_proper_nouns(words)
     
     def format_text(self, text, remove_fillers=True, fix_punctuation=True, 
                    fix_capitalization=True, filler_words=None):
@@ -45,16 +208,24 @@ class TextFormatter:
         # Use custom filler words if provided, otherwise use defaults
         words_to_remove = filler_words if filler_words else self.default_filler_words
         
-        # Remove each filler word
-        for word in words_to_remove:
-            pattern = r'\b' + re.escape(word) + r'\b'
-            text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+        # Remove all filler words in a single pass
+        pattern = compile_filler_pattern(tuple(words_to_remove))
+        if pattern is not None:
+            text = pattern.sub('', text)
         
-        # Clean up extra spaces
-        text = re.sub(r'\s+', ' ', text).strip()
+        # Clean up stranded commas and extra spaces
+        text = self.remove_stranded_commas(text)
+        text = _WHITESPACE_RE.sub(' ', text).strip()
         
         return text
     
+    def remove_stranded_commas(self, text):
+        """Drop the commas left around words that were removed"""
+        # "this is, um, a test" leaves "this is, , a test"
+        text = _DOUBLE_COMMA_RE.sub(' ', text)
+        text = _SPACE_BEFORE_COMMA_RE.sub(',', text)
+        return _LOOSE_COMMA_RE.sub('', text)
+    
     def fix_punctuation(self, text):
         """Fix common punctuation issues"""
         # Add period at end if missing
@@ -85,9 +256,7 @@ class TextFormatter:
         text = re.sub(r'(^|[.!?]\s+)([a-z])', lambda m: m.group(1) + m.group(2).upper(), text)
         
         # Fix proper nouns
-        for word in self.common_proper_nouns:
-            pattern = r'\b' + word + r'\b'
-            text = re.sub(pattern, word.capitalize(), text, flags=re.IGNORECASE)
+        text = self.proper_noun_matcher.apply(text)
         
         # Fix "i" personal pronoun
         text = re.sub(r'\bi\b', 'I', text)
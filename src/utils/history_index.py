@@ -0,0 +1,305 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+TRANSCRIPT_PREFIX = "professional_transcript_"
+
+# Quoted phrases (optionally followed by * for a prefix) or bare words
+_QUERY_TOKEN_RE = re.compile(r'"[^"]*"\*?|[^\s"]+')
+
+# One saved segment: "[HH:MM:SS] Recognized: text" then "[HH:MM:SS] formatted"
+_RECORD_RE = re.compile(r'^\[(\d\d:\d\d:\d\d)\] Recognized: (.*)\n\[\d\d:\d\d:\d\d\] (.*)$',
+                        re.MULTILINE)
+
+
+def build_match_query(query):
+    """Turn user input into a safe FTS5 MATCH expression.
+
+    Quoted text is a phrase, a trailing * makes a prefix query and every
+    other word is quoted so FTS5 operators in it are taken literally.
+    """
+    terms = []
+    for token in _QUERY_TOKEN_RE.findall(query):
+        prefix = token.endswith('*')
+        token = token.rstrip('*').strip('"').replace('"', '""')
+        if token.strip():
+            terms.append(f'"{token}"' + ('*' if prefix else ''))
+    return ' '.join(terms)
+
+
+class SearchHit:
+    """A segment matching a full-text search"""
+    __slots__ = ('path', 'started', 'timestamp', 'language', 'snippet')
+
+    def __init__(self, path, started, timestamp, language, snippet):
+        self.path = path
+        self.started = started
+        self.timestamp = timestamp
+        self.language = language
+        self.snippet = snippet
+
+    @property
+    def display_name(self):
+        """Human readable list entry"""
+        started = datetime.fromtimestamp(self.started).strftime("%Y-%m-%d")
+        return f"{started} {self.timestamp}  {self.snippet}"
+
+
+class HistoryRecord:
+    """One transcript as recorded in the history index"""
+    __slots__ = ('id', 'path', 'started', 'duration', 'source_languages',
+                 'target_language', 'size', 'segments')
+
+    def __init__(self, id, path, started, duration, source_languages,
+                 target_language, size, segments):
+        self.id = id
+        self.path = path
+        self.started = started
+        self.duration = duration
+        self.source_languages = source_languages.split(',') if source_languages else []
+        self.target_language = target_language
+        self.size = size
+        self.segments = segments
+
+    @property
+    def display_name(self):
+        """Human readable list entry"""
+        started = datetime.fromtimestamp(self.started).strftime("%Y-%m-%d %H:%M:%S")
+        minutes = int(self.duration // 60)
+        languages = ','.join(self.source_languages) or '?'
+        if self.target_language:
+            languages += f"→{self.target_language}"
+        return f"{started}  ({minutes}m, {self.segments} segments, {languages})"
+
+
+class HistoryIndex:
+    """Persistent SQLite index of transcript files.
+
+    Transcripts are registered when they are created and updated as each
+    segment is written, so listing history never has to scan directories
+    or parse files.
+    """
+
+    COLUMNS = ("id, path, started, duration, source_languages, "
+               "target_language, size, segments")
+
+    def __init__(self, path="transcript_history.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS transcripts ("
+            "id INTEGER PRIMARY KEY, "
+            "path TEXT UNIQUE NOT NULL, "
+            "started REAL NOT NULL, "
+            "duration REAL NOT NULL DEFAULT 0, "
+            "source_languages TEXT NOT NULL DEFAULT '', "
+            "target_language TEXT, "
+            "size INTEGER NOT NULL DEFAULT 0, "
+            "segments INTEGER NOT NULL DEFAULT 0)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS transcripts_started ON transcripts (started)")
+        
+        # Segment text for full-text search; FTS5 when SQLite has it
+        try:
+            self._db.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS segment_text USING fts5("
+                "text, transcript_id UNINDEXED, language UNINDEXED, timestamp UNINDEXED, "
+                "tokenize='unicode61 remove_diacritics 2')")
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS segment_text ("
+                "text TEXT, transcript_id INTEGER, language TEXT, timestamp TEXT)")
+            self.has_fts = False
+        self._db.commit()
+
+    def register(self, path, started=None, target_language=None, size=0, segments=0,
+                 duration=0.0, source_languages=()):
+        """Add a transcript (or reset an existing entry for the same path)"""
+        path = os.path.abspath(path)
+        started = started if started is not None else time.time()
+        with self._lock:
+            # A rewritten file starts with an empty search index
+            self._db.execute("DELETE FROM segment_text WHERE transcript_id IN "
+                             "(SELECT id FROM transcripts WHERE path=?)", (path,))
+            self._db.execute(
+                "INSERT INTO transcripts (path, started, duration, source_languages, "
+                "target_language, size, segments) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET started=excluded.started, "
+                "duration=excluded.duration, source_languages=excluded.source_languages, "
+                "target_language=excluded.target_language, size=excluded.size, "
+                "segments=excluded.segments",
+                (path, started, duration, ','.join(source_languages), target_language,
+                 size, segments))
+            self._db.commit()
+
+    def record_segment(self, path, size, source_language=None, ended=None, text=None,
+                       timestamp=None):
+        """Update a transcript after a segment of ``size`` bytes was appended.
+
+        If ``text`` is given it is also added to the full-text index.
+        """
+        path = os.path.abspath(path)
+        ended = ended if ended is not None else time.time()
+        with self._lock:
+            row = self._db.execute("SELECT source_languages, id FROM transcripts WHERE path=?",
+                                   (path,)).fetchone()
+            if row is None:
+                return False
+
+            if text:
+                self._db.execute("INSERT INTO segment_text VALUES (?, ?, ?, ?)",
+                                 (text, row[1], source_language, timestamp))
+
+            languages = row[0].split(',') if row[0] else []
+            if source_language and source_language not in languages:
+                languages.append(source_language)
+
+            self._db.execute(
+                "UPDATE transcripts SET size=size+?, segments=segments+1, "
+                "duration=MAX(duration, ?-started), source_languages=? WHERE path=?",
+                (size, ended, ','.join(languages), path))
+            self._db.commit()
+            return True
+
+    def index_segments(self, path, segments):
+        """Add (timestamp, text, language) segments of a transcript to the search index"""
+        with self._lock:
+            row = self._db.execute("SELECT id FROM transcripts WHERE path=?",
+                                   (os.path.abspath(path),)).fetchone()
+            if row is None:
+                return False
+            self._db.executemany(
+                "INSERT INTO segment_text VALUES (?, ?, ?, ?)",
+                ((text, row[0], language, timestamp) for timestamp, text, language in segments))
+            self._db.commit()
+            return True
+
+    def search(self, query, since=None, until=None, language=None, limit=50):
+        """Full-text search over saved segments, best matches first.
+
+        Supports "quoted phrases" and prefix* queries; ``since`` and
+        ``until`` are timestamps that filter on the transcript start time.
+        """
+        conditions = []
+        params = []
+        if self.has_fts:
+            match = build_match_query(query)
+            if not match:
+                return []
+            conditions.append("segment_text MATCH ?")
+            params.append(match)
+            snippet = "snippet(segment_text, 0, '[', ']', '…', 12)"
+            order = "ORDER BY rank"
+        else:
+            terms = [term.rstrip('*').strip('"') for term in _QUERY_TOKEN_RE.findall(query)]
+            terms = [term for term in terms if term]
+            if not terms:
+                return []
+            for term in terms:
+                conditions.append("segment_text.text LIKE ?")
+                params.append(f"%{term}%")
+            snippet = "segment_text.text"
+            order = "ORDER BY transcripts.started DESC"
+
+        if since is not None:
+            conditions.append("transcripts.started >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("transcripts.started < ?")
+            params.append(until)
+        if language:
+            conditions.append("segment_text.language = ?")
+            params.append(language)
+
+        params.append(limit)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT transcripts.path, transcripts.started, segment_text.timestamp, "
+                f"segment_text.language, {snippet} FROM segment_text "
+                f"JOIN transcripts ON transcripts.id = segment_text.transcript_id "
+                f"WHERE {' AND '.join(conditions)} {order} LIMIT ?", params).fetchall()
+        return [SearchHit(*row) for row in rows]
+
+    def remove(self, path):
+        """Forget a transcript"""
+        with self._lock:
+            row = self._db.execute("SELECT id FROM transcripts WHERE path=?",
+                                   (os.path.abspath(path),)).fetchone()
+            if row is None:
+                return
+            self._db.execute("DELETE FROM segment_text WHERE transcript_id=?", (row[0],))
+            self._db.execute("DELETE FROM transcripts WHERE id=?", (row[0],))
+            self._db.commit()
+
+    def get(self, path):
+        """Return the record for a path, or None"""
+        with self._lock:
+            row = self._db.execute(f"SELECT {self.COLUMNS} FROM transcripts WHERE path=?",
+                                   (os.path.abspath(path),)).fetchone()
+        return HistoryRecord(*row) if row else None
+
+    def count(self):
+        """Number of indexed transcripts"""
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    def page(self, offset=0, limit=100):
+        """Return one page of records, newest first"""
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT {self.COLUMNS} FROM transcripts ORDER BY started DESC, id DESC "
+                "LIMIT ? OFFSET ?", (limit, offset)).fetchall()
+        return [HistoryRecord(*row) for row in rows]
+
+    def import_directory(self, directory="."):
+        """Index transcript files in a directory that are not indexed yet"""
+        with self._lock:
+            known = set(row[0] for row in self._db.execute("SELECT path FROM transcripts"))
+
+        added = 0
+        for name in os.listdir(directory):
+            if not (name.startswith(TRANSCRIPT_PREFIX) and name.endswith(".txt")):
+                continue
+            path = os.path.abspath(os.path.join(directory, name))
+            if path in known:
+                continue
+
+            stat = os.stat(path)
+            try:
+                stamp = name[len(TRANSCRIPT_PREFIX):-len(".txt")]
+                started = datetime.strptime(stamp, "%Y%m%d_%H%M%S").timestamp()
+            except ValueError:
+                started = stat.st_mtime
+
+            # Read the file once, at import time, for the segment count and
+            # the search index
+            with open(path, 'r', encoding='utf-8', errors='replace') as file:
+                records = _RECORD_RE.findall(file.read())
+
+            with self._lock:
+                cursor = self._db.execute(
+                    "INSERT OR IGNORE INTO transcripts (path, started, duration, size, segments) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (path, started, max(0.0, stat.st_mtime - started), stat.st_size, len(records)))
+                if cursor.rowcount == 0:
+                    # Registered since the known paths were read; lastrowid
+                    # would not be its id
+                    continue
+                self._db.executemany(
+                    "INSERT INTO segment_text VALUES (?, ?, NULL, ?)",
+                    ((f"{original}\n{formatted}", cursor.lastrowid, timestamp)
+                     for timestamp, original, formatted in records))
+            added += 1
+
+        with self._lock:
+            self._db.commit()
+        return added
+
+    def close(self):
+        with self._lock:
+            self._db.close()
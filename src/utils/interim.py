@@ -0,0 +1,138 @@
+"""
+Interim (partial) results while a phrase is still being spoken.
+
+``recognizer.listen`` only returns once a phrase is over, so captions
+normally lag the speaker by the phrase, the pause that ends it and the
+whole recognize/translate/format round trip. A PhraseTap sits between
+the audio source and listen(): it passes every chunk through and keeps
+the current phrase's speech (from just before the first chunk over the
+recognizer's energy threshold), so the engine can recognize sliding
+sub-windows of it while listen() is still recording.
+
+Interim results are hypotheses: they are shown until the final segment
+for the same phrase (``segment.phrase``) replaces them.
+"""
+import threading
+import time
+import numpy as np
+import speech_recognition as sr
+from .vad import audio_samples
+
+
+class InterimResult:
+    """A partial hypothesis for a phrase still being captured.
+
+    ``text`` is None when the phrase was dropped and an interim result
+    already shown for it should be taken down.
+    """
+    __slots__ = ('stream', 'phrase', 'text', 'speech_ended_at', 'created_at')
+
+    def __init__(self, stream, phrase, text, speech_ended_at=None):
+        self.stream = stream
+        self.phrase = phrase
+        self.text = text
+        # End of the speech the hypothesis covers
+        self.speech_ended_at = speech_ended_at
+        self.created_at = time.time()
+
+    @property
+    def key(self):
+        """(stream, phrase): the same for a phrase's interim and final results"""
+        return self.stream, self.phrase
+
+
+class PhraseTap:
+    """Audio stream wrapper keeping the speech of the phrase being captured.
+
+    The engine calls ``begin()`` before each listen() and ``end()`` once it
+    returns; ``snapshot()`` hands out the latest ``window`` seconds of the
+    phrase's speech when new audio has arrived since the last snapshot.
+    read() runs on the capture thread, the rest wherever the caller is.
+    """
+
+    def __init__(self, stream, sample_rate, sample_width, recognizer, window=6.0, preroll=0.3):
+        self.stream = stream
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.recognizer = recognizer
+        self.max_bytes = int(window * sample_rate) * sample_width
+        self.preroll_bytes = int(preroll * sample_rate) * sample_width
+        # Full scale of a sample, to compare with the recognizer's threshold
+        self.full_scale = float(1 << (8 * sample_width - 1))
+
+        self.phrase = 0
+        self.active = False
+        self.speaking = False
+        self.speech_ended_at = None
+        self._buffer = bytearray()
+        self._new_bytes = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def attach(cls, source, recognizer, window=6.0):
+        """Put a tap in front of an open speech_recognition source's stream"""
+        tap = cls(source.stream, source.SAMPLE_RATE, source.SAMPLE_WIDTH, recognizer, window)
+        source.stream = tap
+        return tap
+
+    def read(self, size):
+        data = self.stream.read(size)
+        if data and self.active:
+            self._record(data)
+        return data
+
+    def __getattr__(self, name):
+        # close() and everything else go to the wrapped stream
+        return getattr(self.stream, name)
+
+    def begin(self):
+        """Start a new phrase and return its number"""
+        with self._lock:
+            self.phrase += 1
+            self.active = True
+            self.speaking = False
+            self.speech_ended_at = None
+            self._buffer.clear()
+            self._new_bytes = 0
+            return self.phrase
+
+    def end(self):
+        """The phrase is over; returns when its speech ended (None if there was none)"""
+        with self._lock:
+            self.active = False
+            self._buffer.clear()
+            return self.speech_ended_at
+
+    def snapshot(self):
+        """(phrase, AudioData, speech end) of the phrase so far, or None if nothing is new"""
+        with self._lock:
+            if not self.active or not self.speaking or not self._new_bytes:
+                return None
+            self._new_bytes = 0
+            audio = sr.AudioData(bytes(self._buffer), self.sample_rate, self.sample_width)
+            return self.phrase, audio, self.speech_ended_at
+
+    def _record(self, data):
+        loud = self._is_loud(data)
+        with self._lock:
+            self._buffer += data
+            if loud:
+                self.speaking = True
+                self.speech_ended_at = time.time()
+            # Before the speech starts only a short lead-in is kept
+            limit = self.max_bytes if self.speaking else self.preroll_bytes
+            excess = len(self._buffer) - limit
+            if excess > 0:
+                excess += (-excess) % self.sample_width
+                del self._buffer[:excess]
+            if self.speaking:
+                self._new_bytes += len(data)
+
+    def _is_loud(self, data):
+        """Same test as recognizer.listen: RMS energy over the energy threshold"""
+        usable = len(data) - len(data) % self.sample_width
+        if not usable:
+            return False
+        samples = audio_samples(sr.AudioData(data[:usable], self.sample_rate, self.sample_width))
+        rms = float(np.sqrt(np.mean(np.square(samples, dtype=np.float64))))
+        return rms * self.full_scale > self.recognizer.energy_threshold
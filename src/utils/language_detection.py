@@ -0,0 +1,335 @@
+"""
+Sticky per-stream language detection.
+
+With auto-detect on, every recognized phrase used to go to
+``translator.detect()``: a network round trip per phrase, although a
+speaker's language almost never changes within a session. A
+LanguageDetector remembers the language each stream was detected in and
+only asks the translator again when:
+
+- ``recheck_every`` segments have gone by since the last check,
+- the recognizer's confidence in a phrase drops below
+  ``recheck_confidence`` (recognizing the wrong language does that), or
+- the local n-gram detector is confident the text is in another language.
+
+Short texts, which remote detectors get wrong about as often as right,
+are left to the local detector. Results are also cached by text.
+
+Usage:
+    detector = LanguageDetector(translator)
+    lang = detector.detect(text, stream="Alice", confidence=0.92).lang
+"""
+import math
+import threading
+from collections import Counter, OrderedDict
+from .translation_cache import normalize_text
+from .translators import Detection
+
+# A few sentences of everyday speech per language; enough for the
+# character trigram profiles to tell common languages apart
+SAMPLES = {
+    'en': "the and that have for not with you this but his from they say her she will "
+          "one all would there their what so up out if about who get which go me when "
+          "make can like time no just him know take people into year your good some "
+          "could them see other than then now look only come its over think also back "
+          "after use two how our work first well way even new want because any these "
+          "give day most us is are was were been has had do does did thank you very much "
+          "i think we should talk about this today what do you want to do next week "
+          "where are you going it is really nice to meet you let me know",
+    'es': "el la de que y en un ser se no haber por con su para como estar tener le lo "
+          "todo pero más hacer o poder decir este ir otro ese si me ya ver porque dar "
+          "cuando él muy sin vez mucho saber qué sobre mi alguno mismo yo también hasta "
+          "año dos querer entre así primero desde grande eso ni nos llegar pasar tiempo "
+          "ella sí día uno bien poco deber entonces poner cosa tanto hombre parecer "
+          "nuestro tan donde ahora parte después vida quedar siempre creer hablar "
+          "muchas gracias creo que deberíamos hablar de esto hoy qué quieres hacer la "
+          "semana que viene adónde vas es un placer conocerte avísame",
+    'fr': "le la de un être et à il avoir ne je son que se qui ce dans en du elle au pour "
+          "pas que vous par sur faire plus dire me on mon lui nous comme mais pouvoir "
+          "avec tout y aller voir en bien où sans tu ou leur homme si deux mari moi "
+          "vouloir te femme venir quand grand celui notre devoir là jour prendre même "
+          "votre rien petit encore aussi quelque dont tout mer trouver donner temps "
+          "merci beaucoup je pense que nous devrions en parler aujourd'hui qu'est-ce "
+          "que tu veux faire la semaine prochaine où vas-tu ravi de vous rencontrer",
+    'de': "der die und in den von zu das mit sich des auf für ist im dem nicht ein eine "
+          "als auch es an werden aus er hat dass sie nach wird bei einer um am sind noch "
+          "wie einem über einen so zum war haben nur oder aber vor zur bis mehr durch "
+          "man sein wurde sei ich du wir ihr jetzt heute gut schon immer wieder kann "
+          "muss wollen machen sagen gehen sehen wissen kommen denken zeit jahr tag "
+          "vielen dank ich glaube wir sollten heute darüber sprechen was willst du "
+          "nächste woche machen wohin gehst du schön dich kennenzulernen sag mir bescheid",
+    'it': "il di che e la un a per in non è una sono mi si ho lo ma ha le cosa con ti "
+          "se da io come questo bene qui del tu sei mio al hai cosa più era me anche "
+          "della tutto gli fatto solo ci perché suo lei voglio ora sta essere così "
+          "molto niente nel grazie allora dove prima siamo fare sempre tempo giorno "
+          "grazie mille penso che dovremmo parlarne oggi cosa vuoi fare la settimana "
+          "prossima dove stai andando piacere di conoscerti fammi sapere",
+    'pt': "o a de que e do da em um para é com não uma os no se na por mais as dos "
+          "como mas foi ao ele das tem à seu sua ou ser quando muito há nos já está eu "
+          "também só pelo pela até isso ela entre era depois sem mesmo aos ter seus "
+          "quem nas me esse eles estão você tinha foram essa num nem suas meu às minha "
+          "muito obrigado acho que devemos falar sobre isso hoje o que você quer fazer "
+          "na próxima semana aonde você vai prazer em conhecê-lo me avise",
+    'nl': "de en van ik te dat die in een hij het niet zijn is was op aan met als voor "
+          "had er maar om hem dan zou of wat mijn men dit zo door over ze zich bij ook "
+          "tot je mij uit der daar haar naar heb hoe heeft hebben deze u want nog zal "
+          "me zij nu ge geen omdat iets worden toch al waren veel meer doen toen moet "
+          "heel erg bedankt ik denk dat we het er vandaag over moeten hebben wat wil "
+          "je volgende week doen waar ga je naartoe leuk je te ontmoeten laat het weten",
+}
+
+
+def trigrams(text):
+    """Character trigrams of each word, padded with spaces"""
+    grams = []
+    for word in text.lower().split():
+        word = f" {word.strip('.,!?;:')} "
+        grams.extend(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+class NgramDetector:
+    """Offline character trigram language detector for short texts.
+
+    Each language is a trigram frequency profile; a text scores the
+    smoothed log likelihood of its trigrams under each profile, and
+    ``confidence`` is the winner's share of the softmax of the scores.
+    """
+
+    def __init__(self, samples=None, temperature=0.2):
+        self.temperature = temperature
+        self.profiles = {}
+        grams = set()
+        for lang, sample in (samples or SAMPLES).items():
+            counts = Counter(trigrams(sample))
+            self.profiles[lang] = (counts, sum(counts.values()))
+            grams.update(counts)
+        self.vocabulary = len(grams) + 1
+
+    def scores(self, text):
+        """{language: probability} for text (empty if it has no letters)"""
+        grams = trigrams(text)
+        if not grams:
+            return {}
+        logs = {}
+        for lang, (counts, total) in self.profiles.items():
+            denominator = total + self.vocabulary
+            logs[lang] = sum(math.log((counts.get(gram, 0) + 1) / denominator)
+                             for gram in grams)
+        # Softmax, flattened by the square root of the length so a couple of
+        # trigrams can't look certain
+        scale = self.temperature * math.sqrt(len(grams))
+        best = max(logs.values())
+        weights = {lang: math.exp((value - best) / scale) for lang, value in logs.items()}
+        total = sum(weights.values())
+        return {lang: weight / total for lang, weight in weights.items()}
+
+    def detect(self, text):
+        """Detection of the most likely language, or None if text has no letters"""
+        scores = self.scores(text)
+        if not scores:
+            return None
+        lang = max(scores, key=scores.get)
+        return Detection(lang, scores[lang])
+
+
+class LanguageDetectionStats:
+    """Count how each detect() call was answered"""
+
+    def __init__(self):
+        self.calls = 0
+        self.remote = 0
+        self.sticky = 0
+        self.local = 0
+        self.cached = 0
+        self.failures = 0
+        self.rechecks = 0
+        self.changes = 0
+        self._lock = threading.Lock()
+
+    def record(self, answer):
+        """Record one call answered by 'remote', 'sticky', 'local' or 'cached'"""
+        with self._lock:
+            self.calls += 1
+            setattr(self, answer, getattr(self, answer) + 1)
+
+    def record_check(self, changed):
+        """Record a stream's language being checked again"""
+        with self._lock:
+            self.rechecks += 1
+            self.changes += changed
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+
+    @property
+    def calls_saved(self):
+        """detect() calls answered without the translator"""
+        with self._lock:
+            return self.calls - self.remote
+
+    def snapshot(self):
+        """Return the current figures as a plain dictionary"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'remote': self.remote,
+                'sticky': self.sticky,
+                'local': self.local,
+                'cached': self.cached,
+                'failures': self.failures,
+                'rechecks': self.rechecks,
+                'changes': self.changes,
+                'saved': 1 - self.remote / self.calls if self.calls else 0.0,
+            }
+
+    def summary(self):
+        """One-line human readable summary"""
+        stats = self.snapshot()
+        return (f"Language detection: {stats['remote']} of {stats['calls']} phrases sent to "
+                f"the translator ({stats['saved']:.0%} saved), {stats['changes']} language "
+                f"changes")
+
+
+class StreamLanguage:
+    """What a LanguageDetector knows about one stream"""
+    __slots__ = ('lang', 'confidence', 'since_check')
+
+    def __init__(self):
+        self.lang = None
+        self.confidence = None
+        self.since_check = 0
+
+
+class LanguageDetector:
+    """Keep each stream on its detected language, re-checking now and then.
+
+    ``translator`` is anything with a googletrans-style ``detect(text)``;
+    without one only the local detector is used. Thread safe: recognition
+    workers share one detector. Remote detections under
+    ``min_confidence`` don't stick, so the next phrase is checked again.
+    """
+
+    def __init__(self, translator=None, recheck_every=25, recheck_confidence=0.6,
+                 min_confidence=0.5, short_words=3, local_confidence=0.9,
+                 cache_size=1000, local=None, default='en'):
+        self.translator = translator
+        self.recheck_every = recheck_every
+        self.recheck_confidence = recheck_confidence
+        self.min_confidence = min_confidence
+        self.short_words = short_words
+        self.local_confidence = local_confidence
+        self.cache_size = cache_size
+        self.local = local if local is not None else NgramDetector()
+        self.default = default
+        self.stats = LanguageDetectionStats()
+        self.streams = {}
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def language(self, stream=None):
+        """The language a stream is currently on, or None"""
+        with self._lock:
+            state = self.streams.get(stream)
+            return state.lang if state else None
+
+    def reset(self, stream=None):
+        """Forget a stream's language (all streams if stream is None)"""
+        with self._lock:
+            if stream is None:
+                self.streams.clear()
+            else:
+                self.streams.pop(stream, None)
+
+    def detect(self, text, stream=None, confidence=None):
+        """Return a Detection for text recognized on stream.
+
+        ``confidence`` is the recognizer's confidence in the text, if it
+        reported one.
+        """
+        key = normalize_text(text)
+        local = self.local.detect(text)
+        with self._lock:
+            state = self.streams.setdefault(stream, StreamLanguage())
+            if state.lang is not None and not self._needs_check(state, local, confidence):
+                state.since_check += 1
+                answer = Detection(state.lang, state.confidence)
+                sticky = True
+            else:
+                sticky = False
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+        if sticky:
+            self.stats.record('sticky')
+            return answer
+        if cached is not None:
+            self.stats.record('cached')
+            return self._settle(stream, cached)
+
+        # Short texts: the local guess is as good as any, unless it is unsure
+        # and the stream has no language yet
+        if local is not None and (len(key.split()) <= self.short_words or self.translator is None):
+            if local.confidence >= self.local_confidence or self.translator is None:
+                self.stats.record('local')
+                return self._settle(stream, local, remember=False)
+
+        if self.translator is None or not key:
+            self.stats.record('local')
+            return self._fallback(stream, local)
+
+        self.stats.record('remote')
+        try:
+            result = self.translator.detect(text)
+        except Exception:
+            self.stats.record_failure()
+            return self._fallback(stream, local)
+        detection = Detection(result.lang, getattr(result, 'confidence', None))
+        self._remember(key, detection)
+        return self._settle(stream, detection)
+
+    def _needs_check(self, state, local, confidence):
+        """Whether a stream's language has to be confirmed; called with the lock held"""
+        if state.since_check >= self.recheck_every:
+            return True
+        if confidence is not None and confidence < self.recheck_confidence:
+            return True
+        # The local detector is sure the speaker switched
+        return (local is not None and local.lang != state.lang
+                and local.confidence >= self.local_confidence)
+
+    def _settle(self, stream, detection, remember=True):
+        """Make a detection the stream's language if it is confident enough"""
+        confident = detection.confidence is None or detection.confidence >= self.min_confidence
+        with self._lock:
+            state = self.streams.setdefault(stream, StreamLanguage())
+            if state.lang is not None:
+                self.stats.record_check(detection.lang != state.lang)
+            if remember and confident:
+                state.lang = detection.lang
+                state.confidence = detection.confidence
+                state.since_check = 0
+            elif not remember and state.lang is None and confident:
+                # A local guess holds a new stream until the next phrase
+                state.lang = detection.lang
+                state.confidence = detection.confidence
+                state.since_check = self.recheck_every
+        return detection
+
+    def _fallback(self, stream, local):
+        """The stream's language, else the local guess, else the default"""
+        with self._lock:
+            state = self.streams.get(stream)
+            if state is not None and state.lang is not None:
+                return Detection(state.lang, state.confidence)
+        if local is not None:
+            return local
+        return Detection(self.default, None)
+
+    def _remember(self, key, detection):
+        with self._lock:
+            self._cache[key] = detection
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
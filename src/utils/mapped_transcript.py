@@ -0,0 +1,138 @@
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+# Header of a cached line index: magic, version, file mtime (ns), file size, line count
+_INDEX_HEADER = struct.Struct('<4sHqQQ')
+_INDEX_MAGIC = b'TSIX'
+_INDEX_VERSION = 1
+
+
+class MappedTranscript:
+    """Read-only, memory-mapped view of a transcript file.
+
+    A line offset index (one 8-byte start offset per line) is built once
+    and cached beside the file as ``<file>.idx``; the cache is thrown away
+    when the file's mtime or size no longer match. Fetching a page of
+    lines only touches the bytes of that page, so files of hundreds of MB
+    open and scroll as quickly as small ones.
+    """
+
+    def __init__(self, path, cache=True, block_size=4 * 1024 * 1024):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.block_size = block_size
+        self.index_rebuilt = False
+
+        self._file = open(path, 'rb')
+        stat = os.fstat(self._file.fileno())
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime_ns
+
+        # mmap refuses empty files
+        self._map = None
+        if self.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._offsets = self._load_index() if cache else None
+        if self._offsets is None:
+            self._offsets = self._build_index()
+            self.index_rebuilt = True
+            if cache:
+                self._save_index()
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _build_index(self):
+        """Scan the file once for line starts; the last entry is the file size"""
+        offsets = array('Q', [0])
+        for base in range(0, self.size, self.block_size):
+            block = self._map[base:base + self.block_size]
+            parts = block.split(b'\n')
+            # Every part but the last ends in a newline, so the next line
+            # starts one byte after it
+            starts = accumulate(map((1).__add__, map(len, parts[:-1])), initial=base)
+            next(starts)
+            offsets.extend(starts)
+
+        if offsets[-1] != self.size:
+            # Last line has no trailing newline
+            offsets.append(self.size)
+        return offsets
+
+    def _load_index(self):
+        """Return the cached index if it still matches the file, else None"""
+        try:
+            with open(self.index_path, 'rb') as file:
+                header = file.read(_INDEX_HEADER.size)
+                if len(header) != _INDEX_HEADER.size:
+                    return None
+                magic, version, mtime, size, count = _INDEX_HEADER.unpack(header)
+                if (magic != _INDEX_MAGIC or version != _INDEX_VERSION or
+                        mtime != self.mtime or size != self.size):
+                    return None
+
+                offsets = array('Q')
+                offsets.fromfile(file, count)
+                return offsets
+        except (OSError, EOFError):
+            return None
+
+    def _save_index(self):
+        """Write the index beside the file; failing to cache is not an error"""
+        temp_path = self.index_path + ".tmp"
+        try:
+            with open(temp_path, 'wb') as file:
+                file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _INDEX_VERSION, self.mtime,
+                                              self.size, len(self._offsets)))
+                self._offsets.tofile(file)
+            os.replace(temp_path, self.index_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def line_at(self, offset):
+        """Return the number of the line containing a byte offset"""
+        return max(0, min(bisect_right(self._offsets, offset) - 1, len(self) - 1))
+
+    def read(self, start, stop):
+        """Return the raw bytes of lines start..stop-1"""
+        start = max(0, start)
+        stop = min(stop, len(self))
+        if start >= stop:
+            return b''
+        return self._map[self._offsets[start]:self._offsets[stop]]
+
+    def text(self, start, stop):
+        """Return lines start..stop-1 as one string"""
+        return self.read(start, stop).decode('utf-8', errors='replace')
+
+    def lines(self, start, stop):
+        """Return lines start..stop-1 without their line endings"""
+        return self.text(start, stop).splitlines()
+
+    def find(self, term, start=0):
+        """Return the first line at or after start containing term, or None"""
+        if self._map is None or not term or start >= len(self):
+            return None
+        position = self._map.find(term.encode('utf-8'), self._offsets[max(0, start)])
+        return self.line_at(position) if position >= 0 else None
+
+    def close(self):
+        """Release the mapping and the file"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
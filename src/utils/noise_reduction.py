@@ -0,0 +1,191 @@
+"""
+Spectral gating noise reduction.
+
+Audio is split into overlapping FFT frames (512 samples, 50% overlap,
+square-root Hann windows so the frames add back up exactly). A noise
+profile gives every frequency bin a threshold: the mean magnitude of the
+ambient noise in that bin plus ``n_std`` standard deviations. Bins below
+their threshold are attenuated by ``strength`` (0 leaves the audio alone,
+1 silences them); the gain mask is smoothed over neighbouring bins and
+frames to avoid "musical" noise. The frames are then transformed back
+and overlap-added.
+
+The noise profile comes from the ambient noise recorded before listening
+starts (``estimate_noise``). Without one, each buffer's quietest frames
+are used instead.
+
+``reduce`` rewrites the samples of the AudioData buffer it is given and
+returns the same object. Immutable ``bytes`` buffers are swapped for a
+``bytearray`` once so later stages can slice and read them as usual.
+
+The gate keeps track of its own CPU time per second of audio. While that
+is above ``cpu_budget`` (0.25 means a quarter of one core) buffers are
+passed through untouched, so the capture thread never falls behind the
+microphone.
+"""
+import threading
+import time
+import numpy as np
+
+# Attenuation for each position of the "Noise Reduction" slider (0 = off)
+STRENGTH_LEVELS = (0.0, 0.5, 0.7, 0.85, 0.95)
+
+
+def gate_gains(magnitudes, thresholds, strength):
+    """Per-bin gains: 1 above the threshold, 1 - strength below it, smoothed"""
+    gains = np.where(magnitudes > thresholds, np.float32(1.0), np.float32(1.0 - strength))
+
+    # 3x3 box filter over (frame, bin) with edge padding
+    padded = np.pad(gains, 1, mode='edge')
+    rows = padded[:-2] + padded[1:-1] + padded[2:]
+    return (rows[:, :-2] + rows[:, 1:-1] + rows[:, 2:]) / np.float32(9.0)
+
+
+class NoiseReductionStats:
+    """CPU time spent per second of audio"""
+
+    def __init__(self):
+        self.chunks = 0
+        self.skipped = 0
+        self.audio_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, audio_seconds, cpu_seconds, skipped=False):
+        with self._lock:
+            self.chunks += 1
+            self.audio_seconds += audio_seconds
+            self.cpu_seconds += cpu_seconds
+            if skipped:
+                self.skipped += 1
+
+    @property
+    def load(self):
+        """CPU seconds per second of audio so far (0.1 = 10% of a core)"""
+        with self._lock:
+            return self.cpu_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def snapshot(self):
+        """Return the current figures as a plain dictionary"""
+        with self._lock:
+            return {
+                'chunks': self.chunks,
+                'skipped': self.skipped,
+                'audio_seconds': self.audio_seconds,
+                'cpu_seconds': self.cpu_seconds,
+                'load': self.cpu_seconds / self.audio_seconds if self.audio_seconds else 0.0,
+            }
+
+
+class SpectralGate:
+    """Reduce stationary background noise in AudioData buffers"""
+
+    def __init__(self, strength=0.85, n_std=1.5, frame_length=512, cpu_budget=0.25):
+        self.strength = strength
+        self.n_std = n_std
+        self.frame_length = frame_length
+        self.hop_length = frame_length // 2
+        self.cpu_budget = cpu_budget
+        self.stats = NoiseReductionStats()
+
+        # Periodic Hann; its square roots applied before and after the FFT
+        # sum to 1 at 50% overlap
+        self.window = np.sqrt(0.5 - 0.5 * np.cos(
+            2 * np.pi * np.arange(frame_length) / frame_length)).astype(np.float32)
+        self.noise_profile = None
+        self.profile_rate = None
+        self._work = np.zeros(0, dtype=np.float32)
+
+    @property
+    def enabled(self):
+        return self.strength > 0
+
+    def _spectrum(self, signal):
+        """STFT of a padded signal whose length is a multiple of the hop"""
+        frames = np.lib.stride_tricks.sliding_window_view(
+            signal, self.frame_length)[::self.hop_length]
+        return np.fft.rfft(frames * self.window, axis=1)
+
+    def _padded(self, samples, scale):
+        """Copy samples into the reusable work buffer, half a frame of zeros either side"""
+        hop = self.hop_length
+        frames = -(-len(samples) // hop) + 1
+        length = (frames + 1) * hop
+        if len(self._work) < length:
+            self._work = np.zeros(length, dtype=np.float32)
+        work = self._work[:length]
+        work[:hop] = 0
+        np.multiply(samples, np.float32(scale), out=work[hop:hop + len(samples)])
+        work[hop + len(samples):] = 0
+        return work
+
+    def _thresholds(self, magnitudes):
+        """Per-bin thresholds from magnitudes of noise frames"""
+        return magnitudes.mean(axis=0) + self.n_std * magnitudes.std(axis=0)
+
+    def estimate_noise(self, audio):
+        """Build the noise profile from a recording of ambient noise"""
+        samples, scale = self._samples(audio)
+        if samples is None or len(samples) < self.frame_length:
+            return False
+        magnitudes = np.abs(self._spectrum(self._padded(samples, scale)))
+        self.noise_profile = self._thresholds(magnitudes).astype(np.float32)
+        self.profile_rate = audio.sample_rate
+        return True
+
+    def _samples(self, audio):
+        """Writable integer view of the audio buffer and its scale to [-1, 1]"""
+        if audio.sample_width not in (1, 2, 4):
+            return None, None
+        if not isinstance(audio.frame_data, bytearray):
+            audio.frame_data = bytearray(audio.frame_data)
+        samples = np.frombuffer(audio.frame_data, dtype=f'<i{audio.sample_width}')
+        return samples, 1.0 / float(1 << (8 * audio.sample_width - 1))
+
+    def reduce(self, audio):
+        """Gate the noise in audio in place and return it"""
+        seconds = len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+        if not self.enabled or not seconds:
+            return audio
+        if self.stats.load > self.cpu_budget:
+            # Over budget: let this buffer through so capture keeps up
+            self.stats.record(seconds, 0.0, skipped=True)
+            return audio
+
+        start = time.thread_time()
+        samples, scale = self._samples(audio)
+        if samples is not None and len(samples) >= self.frame_length:
+            self._gate(samples, scale, audio.sample_rate)
+        self.stats.record(seconds, time.thread_time() - start)
+        return audio
+
+    def _gate(self, samples, scale, sample_rate):
+        hop = self.hop_length
+        work = self._padded(samples, scale)
+        spectrum = self._spectrum(work)
+        magnitudes = np.abs(spectrum)
+
+        if self.noise_profile is not None and self.profile_rate == sample_rate:
+            thresholds = self.noise_profile
+        else:
+            # No usable profile: treat the quietest tenth of the frames as noise
+            energy = magnitudes.sum(axis=1)
+            quiet = magnitudes[energy <= np.percentile(energy, 10)]
+            thresholds = self._thresholds(quiet)
+
+        spectrum *= gate_gains(magnitudes, thresholds, self.strength)
+        frames = np.fft.irfft(spectrum, n=self.frame_length, axis=1).astype(np.float32)
+        frames *= self.window
+
+        # Overlap-add: with 50% overlap each hop is the first half of one
+        # frame plus the second half of the frame before it
+        output = work[:len(frames) * hop].reshape(len(frames), hop)
+        output[:] = frames[:, :hop]
+        output[1:] += frames[:-1, hop:]
+
+        limit = float(np.iinfo(samples.dtype).max)
+        result = work[hop:hop + len(samples)]
+        result /= np.float32(scale)
+        np.clip(result, -limit - 1, limit, out=result)
+        np.rint(result, out=result)
+        samples[:] = result
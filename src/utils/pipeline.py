@@ -0,0 +1,189 @@
+"""
+Pipeline segments and stage statistics used by the transcription engine.
+"""
+import bisect
+import threading
+import time
+
+
+class StageStats:
+    """Track latency figures for a single pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+        self.max_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed):
+        """Record the time (in seconds) one item spent in this stage"""
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            self.last_time = elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
+
+    @property
+    def average_time(self):
+        """Average time per item in seconds"""
+        with self._lock:
+            return self.total_time / self.count if self.count else 0.0
+
+    def snapshot(self):
+        """Return the current figures as a plain dictionary"""
+        with self._lock:
+            return {
+                'count': self.count,
+                'average': self.total_time / self.count if self.count else 0.0,
+                'last': self.last_time,
+                'max': self.max_time,
+            }
+
+
+class LatencyHistogram:
+    """Distribution of latencies over fixed buckets (upper bounds in seconds)"""
+
+    BOUNDS = (0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+    def __init__(self, name, bounds=BOUNDS):
+        self.name = name
+        self.bounds = tuple(bounds)
+        # One count per bound, plus one for everything above the last
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed):
+        """Record one latency in seconds"""
+        with self._lock:
+            self.counts[bisect.bisect_left(self.bounds, elapsed)] += 1
+            self.count += 1
+            self.total_time += elapsed
+            if elapsed > self.max_time:
+                self.max_time = elapsed
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding that fraction of the values"""
+        with self._lock:
+            return self._percentile(fraction)
+
+    def _percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        seen = 0
+        for bound, count in zip(self.bounds, self.counts):
+            seen += count
+            if seen >= fraction * self.count:
+                return min(bound, self.max_time)
+        return self.max_time
+
+    def snapshot(self):
+        """Return the current figures as a plain dictionary"""
+        with self._lock:
+            labels = [f"<={bound:g}s" for bound in self.bounds] + [f">{self.bounds[-1]:g}s"]
+            return {
+                'count': self.count,
+                'average': self.total_time / self.count if self.count else 0.0,
+                'p50': self._percentile(0.5),
+                'p95': self._percentile(0.95),
+                'max': self.max_time,
+                'buckets': dict(zip(labels, self.counts)),
+            }
+
+    def summary(self):
+        """One-line human readable summary"""
+        stats = self.snapshot()
+        buckets = ", ".join(f"{label} {count}" for label, count in stats['buckets'].items()
+                            if count)
+        return (f"{self.name}: median {stats['p50'] * 1000:.0f} ms, "
+                f"95% {stats['p95'] * 1000:.0f} ms, max {stats['max'] * 1000:.0f} ms "
+                f"over {stats['count']} phrases ({buckets})")
+
+
+def audio_duration(audio):
+    """Length of captured audio in seconds (0 if it is not AudioData)"""
+    try:
+        return len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+    except (AttributeError, TypeError, ZeroDivisionError):
+        return 0.0
+
+
+class PipelineSegment:
+    """A single captured phrase as it moves through the pipeline"""
+    __slots__ = ('sequence', 'audio', 'captured_at', 'duration', 'text', 'source_lang',
+                 'confidence', 'translated', 'formatted', 'translations',
+                 'formatted_translations', 'error', 'stream', 'phrase', 'speech_ended_at')
+
+    def __init__(self, sequence, audio, captured_at, stream=None):
+        self.sequence = sequence
+        self.audio = audio
+        self.captured_at = captured_at
+        self.duration = audio_duration(audio)
+        # Name of the capture stream (speaker track) in multi-stream sessions
+        self.stream = stream
+        self.text = None
+        self.source_lang = None
+        self.confidence = None
+        self.translated = None
+        self.formatted = None
+        # {language: text or None} and {language: formatted text} when the
+        # segment is translated into several target languages
+        self.translations = None
+        self.formatted_translations = None
+        self.error = None
+        # Phrase number of the stream's PhraseTap (matches its interim
+        # results) and when the speech in the phrase ended, if known
+        self.phrase = None
+        self.speech_ended_at = None
+
+    @property
+    def started_at(self):
+        """When the phrase started (captured_at is when it ended)"""
+        return self.captured_at - self.duration
+
+
+def translate_and_format(segment, translate, format_text, stats, report_error):
+    """Translation stage for one recognized segment.
+
+    ``translate`` may return a {language: text or None} dictionary to
+    translate into several languages; the first language is the primary
+    one kept in ``translated`` and ``formatted``.
+    """
+    if translate:
+        start = time.perf_counter()
+        try:
+            result = translate(segment.text, segment.source_lang)
+        except Exception as e:
+            # Keep the original text if translation fails
+            result = None
+            report_error(segment, e)
+        if isinstance(result, dict):
+            segment.translations = result
+            result = next(iter(result.values()), None)
+        segment.translated = result
+        stats['translation'].record(time.perf_counter() - start)
+
+    texts = segment.translations or {None: segment.translated}
+    formatted = {}
+    for language, text in texts.items():
+        text = text if text else segment.text
+        if text not in formatted:
+            formatted[text] = text
+            if format_text:
+                start = time.perf_counter()
+                try:
+                    formatted[text] = format_text(text)
+                except Exception as e:
+                    report_error(segment, e)
+                stats['format'].record(time.perf_counter() - start)
+
+    segment.formatted = formatted[segment.translated if segment.translated else segment.text]
+    if segment.translations:
+        segment.formatted_translations = {
+            language: formatted[text if text else segment.text]
+            for language, text in segment.translations.items()}
@@ -0,0 +1,206 @@
+"""
+Speech recognizer backends.
+
+Every backend has ``recognize(audio, language) -> (text, confidence)``
+where ``audio`` is a speech_recognition AudioData, ``language`` is a code
+such as 'en' or 'en-US' (None means the backend's default) and
+``confidence`` is a float in [0, 1] or None when the engine doesn't
+report one. Unintelligible audio raises ``sr.UnknownValueError``.
+
+Offline engines are optional dependencies and are imported lazily.
+"""
+import importlib
+import json
+import math
+import threading
+import time
+import speech_recognition as sr
+
+
+def audio_seconds(audio):
+    """Length of AudioData in seconds"""
+    return len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+
+
+class RecognizerBackend:
+    """Base class for speech recognizer backends"""
+
+    name = None
+    # Whether the backend works without a network connection
+    offline = False
+    # Module that must be importable for the backend to work
+    requires = None
+
+    @classmethod
+    def is_available(cls):
+        """True if the backend's optional dependency is installed"""
+        if cls.requires is None:
+            return True
+        try:
+            importlib.import_module(cls.requires)
+            return True
+        except ImportError:
+            return False
+
+    def recognize(self, audio, language=None):
+        """Return (text, confidence) for the audio"""
+        raise NotImplementedError
+
+    def close(self):
+        """Release engine resources"""
+
+
+class GoogleRecognizer(RecognizerBackend):
+    """Google Web Speech API via speech_recognition (needs a network connection)"""
+
+    name = 'google'
+
+    def __init__(self, key=None, default_language='en-US'):
+        self.key = key
+        self.default_language = default_language
+        self._recognizer = sr.Recognizer()
+
+    def recognize(self, audio, language=None):
+        # show_all returns every alternative with the top one's confidence
+        result = self._recognizer.recognize_google(
+            audio, key=self.key, language=language or self.default_language, show_all=True)
+        if not isinstance(result, dict) or not result.get('alternative'):
+            raise sr.UnknownValueError()
+
+        best = result['alternative'][0]
+        return best['transcript'], best.get('confidence')
+
+
+class VoskRecognizer(RecognizerBackend):
+    """Offline recognition with Vosk (Kaldi).
+
+    ``model_paths`` maps language codes ('en', 'es', ...) to unpacked Vosk
+    model directories; ``model_path`` is used for any other language.
+    Models are loaded once and shared by all calls.
+    """
+
+    name = 'vosk'
+    offline = True
+    requires = 'vosk'
+    sample_rate = 16000
+
+    def __init__(self, model_path="model", model_paths=None):
+        self.model_path = model_path
+        self.model_paths = model_paths or {}
+        self._models = {}
+        self._lock = threading.Lock()
+
+    def _model(self, language):
+        path = self.model_paths.get((language or '').split('-')[0], self.model_path)
+        with self._lock:
+            if path not in self._models:
+                vosk = importlib.import_module('vosk')
+                vosk.SetLogLevel(-1)
+                self._models[path] = vosk.Model(path)
+            return self._models[path]
+
+    def recognize(self, audio, language=None):
+        vosk = importlib.import_module('vosk')
+        recognizer = vosk.KaldiRecognizer(self._model(language), self.sample_rate)
+        recognizer.SetWords(True)
+        # Noise reduction leaves a bytearray behind; Vosk only takes bytes
+        recognizer.AcceptWaveform(bytes(audio.get_raw_data(convert_rate=self.sample_rate,
+                                                           convert_width=2)))
+        result = json.loads(recognizer.FinalResult())
+
+        text = result.get('text', '').strip()
+        if not text:
+            raise sr.UnknownValueError()
+        words = result.get('result') or []
+        confidence = sum(word['conf'] for word in words) / len(words) if words else None
+        return text, confidence
+
+
+class SphinxRecognizer(RecognizerBackend):
+    """Offline recognition with CMU PocketSphinx via speech_recognition"""
+
+    name = 'sphinx'
+    offline = True
+    requires = 'pocketsphinx'
+
+    def __init__(self, default_language='en-US'):
+        self.default_language = default_language
+        self._recognizer = sr.Recognizer()
+
+    def recognize(self, audio, language=None):
+        language = language or self.default_language
+        if language == 'en':
+            # PocketSphinx ships its models under full locale names
+            language = 'en-US'
+        decoder = self._recognizer.recognize_sphinx(audio, language=language, show_all=True)
+
+        hypothesis = decoder.hyp()
+        if hypothesis is None or not hypothesis.hypstr.strip():
+            raise sr.UnknownValueError()
+
+        # The hypothesis score is a log probability
+        confidence = None
+        try:
+            confidence = min(1.0, decoder.get_logmath().exp(hypothesis.prob))
+        except Exception:
+            pass
+        return hypothesis.hypstr, confidence
+
+
+class StubRecognizer(RecognizerBackend):
+    """Deterministic recognizer for tests and benchmarks.
+
+    Returns the next entry of ``script`` for each call (cycling), or a
+    description of the audio's length when no script is given. Audio
+    shorter than ``min_seconds`` is treated as unintelligible.
+    ``realtime_factor`` makes each call take that fraction of the audio's
+    length, to simulate an engine's speed.
+    """
+
+    name = 'stub'
+    offline = True
+
+    def __init__(self, script=None, confidence=1.0, min_seconds=0.0, realtime_factor=0.0):
+        self.script = list(script or [])
+        self.confidence = confidence
+        self.min_seconds = min_seconds
+        self.realtime_factor = realtime_factor
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def recognize(self, audio, language=None):
+        seconds = audio_seconds(audio)
+        if self.realtime_factor:
+            time.sleep(seconds * self.realtime_factor)
+        if seconds < self.min_seconds:
+            raise sr.UnknownValueError()
+
+        with self._lock:
+            call = self.calls
+            self.calls += 1
+        if self.script:
+            return self.script[call % len(self.script)], self.confidence
+        return f"{math.floor(seconds * 10) / 10:.1f} seconds of {language or 'speech'}", \
+            self.confidence
+
+
+RECOGNIZER_BACKENDS = {
+    backend.name: backend
+    for backend in (GoogleRecognizer, VoskRecognizer, SphinxRecognizer, StubRecognizer)
+}
+
+
+def available_backends():
+    """Names of the backends whose dependencies are installed"""
+    return [name for name, backend in RECOGNIZER_BACKENDS.items() if backend.is_available()]
+
+
+def create_recognizer(name, **options):
+    """Create a backend by name"""
+    try:
+        backend = RECOGNIZER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown recognizer backend: {name}")
+    if not backend.is_available():
+        raise ImportError(f"The {name} recognizer needs the '{backend.requires}' package")
+    return backend(**options)
@@ -0,0 +1,303 @@
+"""
+Rate limiting, retries and circuit breaking for recognition and translation calls.
+
+Network backends fail in two ways that matter to a live session: they
+throttle (googletrans and hosted APIs answer 429 once calls come too
+fast) and they go down. A RetryPolicy handles both for one service:
+
+- a TokenBucket paces calls so bursts don't trip the service's limits,
+- failed calls are retried with exponential backoff and full jitter,
+  waiting at least as long as a ``Retry-After`` the service sent,
+- a CircuitBreaker stops calling a service that keeps failing; calls
+  fail at once with CircuitOpenError until ``reset_timeout`` has passed,
+  then a single trial call decides whether it is back.
+
+ResilientTranslator and ResilientRecognizer put a policy in front of a
+backend. The pipeline keeps the original text when translation fails, so
+while a translator's circuit is open captions come out untranslated
+instead of waiting on timeouts.
+
+Usage:
+    translator = ResilientTranslator(backend, RetryPolicy(rate=5, burst=10))
+"""
+import random
+import threading
+import time
+import speech_recognition as sr
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class ServiceError(ConnectionError):
+    """A service refused a call; ``retry_after`` is how long it asked us to wait"""
+
+    def __init__(self, message, status=None, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a service whose circuit is open"""
+
+
+def parse_retry_after(value):
+    """Seconds from a Retry-After header (seconds form only), or None"""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """Allow ``rate`` calls per second on average, in bursts of up to ``burst``"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self):
+        """Take a token if one is available"""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self):
+        """Take a token, waiting for one if needed; returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Reserve the token now so waiting callers queue up in order
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+
+class Backoff:
+    """Exponential backoff with full jitter: attempt n waits up to base * factor**n"""
+
+    def __init__(self, base=0.5, factor=2.0, max_delay=8.0):
+        self.base = base
+        self.factor = factor
+        self.max_delay = max_delay
+
+    def delay(self, attempt):
+        return random.uniform(0, min(self.max_delay, self.base * self.factor ** attempt))
+
+
+class CircuitBreaker:
+    """Stop calling a service after ``failure_threshold`` failures in a row.
+
+    ``on_change(state)`` is called (from the calling thread) whenever the
+    circuit opens or closes again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, on_change=None):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.on_change = on_change
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Whether a call may go ahead; in half-open state only one at a time does"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._trial = False
+            if self._trial:
+                return False
+            self._trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            changed = self.state != CLOSED
+            self.state = CLOSED
+            self.failures = 0
+            self._trial = False
+        if changed:
+            self._changed(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial = False
+            if self.state == HALF_OPEN or (self.state == CLOSED
+                                           and self.failures >= self.failure_threshold):
+                changed = self.state == CLOSED
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            else:
+                changed = False
+        if changed:
+            self._changed(OPEN)
+
+    def _changed(self, state):
+        if self.on_change is not None:
+            try:
+                self.on_change(state)
+            except Exception:
+                pass
+
+
+class ResilienceStats:
+    """Count calls, retries and calls refused for one service"""
+
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.throttle_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, name, count=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def snapshot(self):
+        """Return the current figures as a plain dictionary"""
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'retries': self.retries,
+                'failures': self.failures,
+                'rejected': self.rejected,
+                'throttled': self.throttled,
+                'throttle_time': self.throttle_time,
+            }
+
+    def summary(self, name="Service"):
+        """One-line human readable summary"""
+        stats = self.snapshot()
+        return (f"{name}: {stats['calls']} calls, {stats['retries']} retries, "
+                f"{stats['failures']} failed, {stats['rejected']} skipped while down, "
+                f"{stats['throttled']} paced ({stats['throttle_time']:.1f}s)")
+
+
+class RetryPolicy:
+    """Rate limit, retry and circuit-break the calls to one service.
+
+    ``rate`` (calls per second, None for no limit) and ``burst`` set the
+    token bucket. Errors that are instances of ``retry_on`` but not of
+    ``give_up_on`` are retried up to ``max_retries`` times and count
+    against the circuit; any other error is the service's answer and is
+    raised at once.
+    """
+
+    def __init__(self, rate=None, burst=None, max_retries=3, base_delay=0.5, max_delay=8.0,
+                 failure_threshold=5, reset_timeout=30.0, retry_on=(Exception,),
+                 give_up_on=(ValueError, TypeError, KeyError, NotImplementedError),
+                 on_change=None):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_retries = max_retries
+        self.backoff = Backoff(base_delay, max_delay=max_delay)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout, on_change)
+        self.retry_on = retry_on
+        self.give_up_on = give_up_on
+        self.stats = ResilienceStats()
+
+    def retryable(self, error):
+        return isinstance(error, self.retry_on) and not isinstance(error, self.give_up_on)
+
+    def call(self, func, *args, **kwargs):
+        """Call func(*args, **kwargs) under the policy"""
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.stats.record('rejected')
+                raise CircuitOpenError("Service unavailable; calls are paused")
+            if self.bucket is not None:
+                waited = self.bucket.acquire()
+                if waited:
+                    self.stats.record('throttled')
+                    self.stats.record('throttle_time', waited)
+
+            self.stats.record('calls')
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not self.retryable(e):
+                    self.breaker.record_success()
+                    raise
+                self.breaker.record_failure()
+                if attempt >= self.max_retries or self.breaker.state == OPEN:
+                    self.stats.record('failures')
+                    raise
+                delay = self.backoff.delay(attempt)
+                retry_after = getattr(e, 'retry_after', None)
+                if retry_after is not None:
+                    # Never sooner than the service asked, never past max_delay
+                    delay = min(max(delay, retry_after), self.backoff.max_delay)
+                attempt += 1
+                self.stats.record('retries')
+                time.sleep(delay)
+                continue
+            self.breaker.record_success()
+            return result
+
+
+class ResilientTranslator:
+    """A translator backend whose translate() and detect() go through a RetryPolicy"""
+
+    def __init__(self, translator, policy=None):
+        self.translator = translator
+        self.policy = policy if policy is not None else RetryPolicy()
+
+    def translate(self, text, dest='en', src='auto', **kwargs):
+        return self.policy.call(self.translator.translate, text, dest=dest, src=src, **kwargs)
+
+    def detect(self, text):
+        return self.policy.call(self.translator.detect, text)
+
+    def __getattr__(self, name):
+        # name, close() and everything else go to the wrapped translator
+        return getattr(self.translator, name)
+
+
+class ResilientRecognizer:
+    """A recognizer backend whose recognize() goes through a RetryPolicy.
+
+    ``policy`` should give up on sr.UnknownValueError (see
+    recognizer_policy): unintelligible audio is an answer, not an outage.
+    """
+
+    def __init__(self, recognizer, policy):
+        self.recognizer = recognizer
+        self.policy = policy
+
+    def recognize(self, audio, language=None):
+        return self.policy.call(self.recognizer.recognize, audio, language=language)
+
+    def __getattr__(self, name):
+        return getattr(self.recognizer, name)
+
+
+def recognizer_policy(**options):
+    """RetryPolicy for a recognizer: unintelligible audio is not retried"""
+    options.setdefault('give_up_on', (sr.UnknownValueError, ValueError, TypeError, KeyError,
+                                      NotImplementedError))
+    return RetryPolicy(**options)
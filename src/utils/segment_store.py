@@ -0,0 +1,82 @@
+import tempfile
+import threading
+from array import array
+
+# Separates the fields of a stored entry
+_FIELD_SEPARATOR = '\x1f'
+
+
+class SegmentStore:
+    """Compact, append-only store for transcript display entries.
+
+    Entries are (timestamp, message, tag) triples. Their text is spilled to
+    an anonymous temporary file and only an 8-byte offset per entry stays
+    in memory, so a multi-hour session costs a few hundred KB of RAM no
+    matter how much was said.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._offsets = array('Q', [0])
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def append(self, timestamp, message, tag):
+        """Store an entry and return its index"""
+        data = _FIELD_SEPARATOR.join((timestamp, tag, message)).encode('utf-8')
+        with self._lock:
+            self._file.seek(self._offsets[-1])
+            self._file.write(data)
+            self._offsets.append(self._offsets[-1] + len(data))
+            return len(self._offsets) - 2
+
+    def extend(self, entries):
+        """Store several (timestamp, message, tag) entries"""
+        for timestamp, message, tag in entries:
+            self.append(timestamp, message, tag)
+
+    def get(self, index):
+        """Return the entry at index"""
+        return self.range(index, index + 1)[0]
+
+    def range(self, start, stop):
+        """Return entries start..stop-1 with a single read"""
+        with self._lock:
+            start = max(0, start)
+            stop = min(stop, len(self._offsets) - 1)
+            if start >= stop:
+                return []
+            self._file.seek(self._offsets[start])
+            data = self._file.read(self._offsets[stop] - self._offsets[start])
+
+        entries = []
+        base = self._offsets[start]
+        for i in range(start, stop):
+            record = data[self._offsets[i] - base:self._offsets[i + 1] - base].decode('utf-8')
+            timestamp, tag, message = record.split(_FIELD_SEPARATOR, 2)
+            entries.append((timestamp, message, tag))
+        return entries
+
+    def search(self, term, start=0, page_size=1000):
+        """Yield indexes of entries whose message contains term (case-insensitive)"""
+        term = term.lower()
+        count = len(self)
+        for page_start in range(max(0, start), count, page_size):
+            entries = self.range(page_start, page_start + page_size)
+            for offset, (_, message, _) in enumerate(entries):
+                if term in message.lower():
+                    yield page_start + offset
+
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._file.seek(0)
+            self._file.truncate()
+            self._offsets = array('Q', [0])
+
+    def close(self):
+        """Release the spill file"""
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,701 @@
+"""
+Live caption server.
+
+Serves transcription to many clients from one machine, on top of the
+headless TranscriptionEngine:
+
+- ``GET /sessions/NAME/publish`` (WebSocket): the client streams raw PCM
+  (binary messages; ``rate``, ``width``, ``language`` and ``targets``
+  query parameters, 16 kHz 16-bit mono by default) and receives the
+  session's segments back. A text message ``{"type": "end"}`` finishes
+  the audio; the remaining segments and an ``end`` message follow
+- ``GET /sessions/NAME/subscribe`` (WebSocket): receive a session's
+  segments as JSON messages (original, translated, formatted and every
+  target language). With ``interim_interval`` set, ``partial`` messages
+  carry interim results for the phrase being spoken; the segment with
+  the same ``phrase`` replaces them (``text`` null: drop the partial)
+- ``POST /jobs`` (body: a WAV/FLAC/AIFF file; ``language``, ``target``
+  and ``filename`` query parameters) queues a file job run by
+  BatchTranscriber; ``GET /jobs/ID`` returns its status and segments.
+  Finished jobs are forgotten, and their files deleted, ``job_ttl``
+  seconds after they finish or once more than ``max_jobs`` have finished
+- ``GET /sessions`` and ``GET /stats`` report what is going on
+
+Each segment is serialized and framed once and the same bytes are written
+to every subscriber without waiting on any of them, so a session can have
+hundreds of subscribers. A subscriber that stops reading is disconnected
+once ``max_buffer`` bytes are waiting for it rather than holding up the
+others.
+
+Usage: python -m src.utils.server [--host 127.0.0.1] [--port 8765]
+       [--engine google] [--translator googletrans] [--language en]
+       [--targets es,fr] [--jobs-dir DIR] [--job-ttl 3600] [--interim 0.5]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from functools import partial
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlsplit
+import speech_recognition as sr
+from .batch import BatchTranscriber, recognize_backend
+from .engine import ListenInterrupted, TranscriptionEngine
+from .interim import PhraseTap
+from .language_detection import LanguageDetector
+from .resilience import ResilientRecognizer, ResilientTranslator, RetryPolicy, recognizer_policy
+from .exporters import iter_jsonl
+from .formatting import TextFormatter
+from .recognizers import RECOGNIZER_BACKENDS, create_recognizer
+from .channels import ChannelSource
+from .transcript_model import read_segments, segment_path
+from .translation_batcher import TranslationBatcher
+from .translation_cache import CachedTranslator
+from .translation_fanout import TranslationFanout
+from .translators import TRANSLATOR_BACKENDS, create_translator
+from .vad import VoiceActivityDetector
+from .websocket import OP_TEXT, WebSocket, WebSocketClosed, accept_key, encode_frame
+
+AUDIO_TYPES = {'.wav', '.flac', '.aiff', '.aif'}
+
+
+class HTTPError(Exception):
+    """A request that gets an error response with the given status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    """A parsed HTTP request"""
+    __slots__ = ('method', 'path', 'query', 'headers', 'body')
+
+    def __init__(self, method, path, query, headers, body=b""):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    @property
+    def is_websocket(self):
+        return (self.headers.get('upgrade', '').lower() == 'websocket' and
+                'sec-websocket-key' in self.headers)
+
+
+async def read_request(reader, max_body):
+    """Read one HTTP/1.1 request head and its body"""
+    head = await reader.readuntil(b"\r\n\r\n")
+    request_line, *lines = head.decode('latin-1').rstrip("\r\n").split("\r\n")
+    headers = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        method, target, _ = request_line.split(" ", 2)
+        length = int(headers.get('content-length', 0) or 0)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request")
+    if length > max_body:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+
+    parts = urlsplit(target)
+    request = Request(method.upper(), parts.path, dict(parse_qsl(parts.query)), headers)
+    if length:
+        request.body = await reader.readexactly(length)
+    return request
+
+
+def segment_message(session, segment, start=None, end=None):
+    """JSON-ready message for a finished segment (start/end in seconds of audio)"""
+    translations = segment.formatted_translations
+    if translations is None and segment.translated is not None:
+        translations = {session.targets[0]: segment.formatted}
+    return {
+        'type': 'segment',
+        'session': session.name,
+        'sequence': segment.sequence,
+        'phrase': segment.phrase,
+        'start': start,
+        'end': end,
+        'source_language': segment.source_lang,
+        'original': segment.text,
+        'translated': segment.translated,
+        'formatted': segment.formatted,
+        'translations': translations or {},
+        'confidence': segment.confidence,
+        'sent_at': time.time(),
+    }
+
+
+class CaptionSession:
+    """One live session: PCM in from a publisher, segments out to subscribers"""
+
+    def __init__(self, name, server):
+        self.name = name
+        self.server = server
+        self.subscribers = set()
+        self.publisher = None
+        self.source = None
+        self.engine = None
+        self.task = None
+        self.targets = []
+        # Where each phrase is in the published audio, by segment sequence
+        self.offsets = {}
+        self.phrases = 0
+        self.segments = 0
+        self.errors = 0
+        self.dropped_subscribers = 0
+
+    @property
+    def running(self):
+        return self.task is not None and not self.task.done()
+
+    def start(self, sample_rate, sample_width, language, targets):
+        """Start transcribing audio fed in with feed()"""
+        self.targets = targets
+        self.source = ChannelSource(self.name, sample_rate, sample_width, chunk_size=1024)
+        recognizer = sr.Recognizer()
+        tap = PhraseTap.attach(self.source, recognizer)
+        vad = VoiceActivityDetector() if self.server.voice_activity_detection else None
+        bytes_per_second = sample_rate * sample_width
+
+        def listen():
+            audio = recognizer.listen(self.source, phrase_time_limit=10)
+            if not audio.frame_data:
+                # Only happens once the publisher is done and the stream is empty
+                raise ListenInterrupted()
+            # Wall clock times say nothing when audio arrives faster than realtime
+            end = self.source.stream.bytes_read / bytes_per_second
+            start = end - len(audio.frame_data) / bytes_per_second
+            if vad is not None:
+                audio = vad.process(audio)
+            if audio is not None:
+                # One stream, so the engine numbers phrases in the order they come back
+                self.offsets[self.phrases] = (round(start, 3), round(end, 3))
+                self.phrases += 1
+            return audio
+
+        self.engine = TranscriptionEngine(
+            recognize=partial(self.server.recognize, language, stream=self.name),
+            translate=partial(self.server.translate, targets) if targets else None,
+            format_text=self.server.text_formatter.format_text,
+            on_error=self.on_error,
+            recognition_workers=self.server.recognition_workers,
+            translation_workers=self.server.translation_workers,
+            on_interim=self.on_interim,
+            interim_recognize=partial(self.server.recognize_interim, language),
+            interim_interval=self.server.interim_interval)
+        self.engine.wrap_source(self.source)
+        self.engine.add_stream(None, listen, tap)
+        self.task = asyncio.ensure_future(self.run())
+
+    def feed(self, data):
+        self.source.stream.feed(data)
+
+    def finish(self):
+        """No more audio: transcribe what was sent, then end the session"""
+        if self.source is not None:
+            self.source.stream.close()
+
+    def on_error(self, segment, error):
+        # Called from worker threads; unintelligible audio is not an error
+        if segment is not None:
+            self.offsets.pop(segment.sequence, None)
+        if not isinstance(error, sr.UnknownValueError):
+            self.errors += 1
+
+    def on_interim(self, result):
+        # Called on the event loop
+        self.broadcast({'type': 'partial', 'session': self.name, 'phrase': result.phrase,
+                        'text': result.text, 'sent_at': time.time()})
+
+    async def run(self):
+        try:
+            async for segment in self.engine.segments():
+                self.segments += 1
+                start, end = self.offsets.pop(segment.sequence, (None, None))
+                self.broadcast(segment_message(self, segment, start, end))
+        finally:
+            if self.server.language_detector is not None:
+                # The next session by this name may be someone else
+                self.server.language_detector.reset(self.name)
+            self.broadcast({'type': 'end', 'session': self.name, 'segments': self.segments})
+
+    def broadcast(self, message):
+        """Send a message to every subscriber, dropping the ones too far behind"""
+        frame = encode_frame(OP_TEXT, json.dumps(message, ensure_ascii=False).encode('utf-8'))
+        for websocket in list(self.subscribers):
+            if websocket.closed or websocket.writer.transport.is_closing():
+                self.subscribers.discard(websocket)
+            elif websocket.buffered > self.server.max_buffer:
+                self.subscribers.discard(websocket)
+                self.dropped_subscribers += 1
+                websocket.abort()
+            else:
+                websocket.send_frame(frame)
+
+    def get_stats(self):
+        stats = {
+            'subscribers': len(self.subscribers),
+            'publishing': self.publisher is not None,
+            'running': self.running,
+            'segments': self.segments,
+            'errors': self.errors,
+            'dropped_subscribers': self.dropped_subscribers,
+        }
+        if self.source is not None:
+            stats['dropped_audio_bytes'] = self.source.stream.dropped_bytes
+        if self.running:
+            stats['engine'] = self.engine.get_stats()
+        return stats
+
+
+class CaptionServer:
+    """WebSocket/HTTP caption server; see the module docstring for the API.
+
+    Recognition and translation backends are shared by all sessions; the
+    translator (with a cache and batcher in front) is only created once a
+    session or job asks for a translation.
+    """
+
+    def __init__(self, host='127.0.0.1', port=8765, recognizer='google',
+                 translator='googletrans', language='en', targets=(),
+                 recognizer_options=None, translator_options=None,
+                 voice_activity_detection=True, max_buffer=256 * 1024,
+                 max_body=200 * 1024 * 1024, jobs_dir=None, job_workers=None,
+                 job_ttl=3600.0, max_jobs=100,
+                 recognition_workers=2, translation_workers=4, interim_interval=None):
+        self.host = host
+        self.port = port
+        self.language = language
+        self.targets = list(targets)
+        self.voice_activity_detection = voice_activity_detection
+        self.max_buffer = max_buffer
+        self.max_body = max_body
+        self.jobs_dir = jobs_dir or os.path.join(tempfile.gettempdir(), "caption_server_jobs")
+        self.job_workers = job_workers
+        self.job_ttl = job_ttl
+        self.max_jobs = max_jobs
+        self.recognition_workers = recognition_workers
+        self.translation_workers = translation_workers
+        self.interim_interval = interim_interval
+
+        self.recognizer_name = recognizer
+        self.recognizer_backend = create_recognizer(recognizer, **(recognizer_options or {}))
+        # Online services are paced, retried with backoff and skipped while
+        # they are down (segments then go out untranslated)
+        self.policies = {}
+        if not self.recognizer_backend.offline:
+            self.policies['recognition'] = recognizer_policy()
+            self.recognizer_backend = ResilientRecognizer(self.recognizer_backend,
+                                                          self.policies['recognition'])
+        self.translator_name = translator
+        self.translator_options = translator_options or {}
+        self.translator = None
+        self.fanout = None
+        self.language_detector = None
+        self._translator_lock = threading.Lock()
+        self.text_formatter = TextFormatter()
+
+        self.sessions = {}
+        self.jobs = {}
+        # Upload and transcript files of each job, deleted when it expires
+        self._job_files = {}
+        self._job_tasks = set()
+        self.connections = 0
+        self._server = None
+        self._loop = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def ws_url(self):
+        return f"ws://{self.host}:{self.port}"
+
+    def get_translator(self):
+        """The shared translator, created on first use"""
+        with self._translator_lock:
+            if self.translator is None:
+                backend = create_translator(self.translator_name, **self.translator_options)
+                if not backend.offline:
+                    self.policies['translation'] = RetryPolicy(rate=5.0, burst=10)
+                    backend = ResilientTranslator(backend, self.policies['translation'])
+                self.translator = CachedTranslator(TranslationBatcher(backend, senders=10))
+                self.fanout = TranslationFanout(self.translator, max_workers=32)
+                # Each session stays on the language detected for it
+                self.language_detector = LanguageDetector(self.translator)
+            return self.translator
+
+    def recognize(self, language, audio, stream=None):
+        """Recognition stage shared by the sessions; stream is the session name"""
+        if language == 'auto':
+            text, confidence = self.recognizer_backend.recognize(audio)
+            try:
+                self.get_translator()
+                language = self.language_detector.detect(text, stream, confidence).lang
+            except Exception:
+                language = 'en'
+            return text, language, confidence
+        text, confidence = self.recognizer_backend.recognize(audio, language=language)
+        return text, language, confidence
+
+    def recognize_interim(self, language, audio):
+        """Recognition for interim results: text only, no language detection"""
+        if language == 'auto':
+            return self.recognizer_backend.recognize(audio)[0], None
+        return self.recognizer_backend.recognize(audio, language=language)[0], language
+
+    def translate(self, targets, text, source_lang):
+        """Translation stage shared by the sessions"""
+        translator = self.get_translator()
+        if len(targets) > 1:
+            return self.fanout.translate(text, source_lang, targets)
+        if source_lang == targets[0]:
+            return None
+        return translator.translate(text, src=source_lang, dest=targets[0]).text
+
+    def get_stats(self):
+        """Sessions, connections, jobs, language detection and online services"""
+        stats = {
+            'connections': self.connections,
+            'sessions': {name: session.get_stats() for name, session in self.sessions.items()},
+            'jobs': {status: sum(1 for job in self.jobs.values() if job['status'] == status)
+                     for status in ('queued', 'running', 'done', 'error')},
+        }
+        if self.language_detector is not None:
+            stats['language_detection'] = self.language_detector.stats.snapshot()
+        for name, policy in self.policies.items():
+            stats[name] = dict(policy.stats.snapshot(), circuit=policy.breaker.state)
+        return stats
+
+    async def serve(self):
+        """Start listening; returns once the socket is bound"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        """Stop accepting connections and finish the sessions"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        sessions = list(self.sessions.values())
+        for session in sessions:
+            if session.engine is not None:
+                session.engine.cancel()
+                session.finish()
+            for websocket in list(session.subscribers):
+                websocket.abort()
+        # Let the engines wind down before the loop goes away
+        await asyncio.gather(*(session.task for session in sessions if session.task is not None),
+                             return_exceptions=True)
+        # Jobs already running in a worker are left to finish on their own
+        for task in list(self._job_tasks):
+            task.cancel()
+        await asyncio.gather(*self._job_tasks, return_exceptions=True)
+
+    def start(self):
+        """Serve on an event loop in a daemon thread and return self"""
+        ready = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.serve())
+            ready.set()
+            self._loop.run_forever()
+            self._loop.run_until_complete(self.close())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="caption-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        """Shut down a server started with start()"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    async def _handle(self, reader, writer):
+        """Serve one connection: a WebSocket or a single HTTP request"""
+        self.connections += 1
+        request = None
+        try:
+            try:
+                request = await read_request(reader, self.max_body)
+            except HTTPError as e:
+                return await self._respond(writer, e.status, {'error': str(e)})
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+
+            parts = request.path.strip("/").split("/")
+            if request.is_websocket and len(parts) == 3 and parts[0] == 'sessions' and \
+                    parts[2] in ('publish', 'subscribe'):
+                if parts[2] == 'publish':
+                    await self._publish(request, reader, writer, parts[1])
+                else:
+                    await self._subscribe(request, reader, writer, parts[1])
+            elif request.method == 'GET' and parts == ['sessions']:
+                await self._respond(writer, HTTPStatus.OK, {
+                    name: session.get_stats() for name, session in self.sessions.items()})
+            elif request.method == 'GET' and parts == ['stats']:
+                await self._respond(writer, HTTPStatus.OK, self.get_stats())
+            elif request.method == 'POST' and parts == ['jobs']:
+                await self._create_job(request, writer)
+            elif request.method == 'GET' and len(parts) == 2 and parts[0] == 'jobs':
+                self._expire_jobs()
+                job = self.jobs.get(parts[1])
+                if job is None:
+                    await self._respond(writer, HTTPStatus.NOT_FOUND, {'error': "No such job"})
+                else:
+                    await self._respond(writer, HTTPStatus.OK, job)
+            else:
+                await self._respond(writer, HTTPStatus.NOT_FOUND, {'error': "Not found"})
+        except Exception as e:
+            if request is not None and request.is_websocket:
+                writer.close()
+            elif not writer.transport.is_closing():
+                await self._respond(writer, HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)})
+        finally:
+            self.connections -= 1
+            if not writer.transport.is_closing():
+                writer.close()
+
+    async def _respond(self, writer, status, payload):
+        """Write a JSON response and close the connection"""
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                     f"Content-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\n"
+                     f"Connection: close\r\n\r\n".encode('latin-1') + body)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _accept(self, request, reader, writer):
+        """Complete the WebSocket handshake"""
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\n"
+                      "Upgrade: websocket\r\n"
+                      "Connection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept_key(request.headers['sec-websocket-key'])}"
+                      "\r\n\r\n").encode('latin-1'))
+        await writer.drain()
+        return WebSocket(reader, writer)
+
+    def _session(self, name):
+        if name not in self.sessions:
+            self.sessions[name] = CaptionSession(name, self)
+        return self.sessions[name]
+
+    def _release(self, session):
+        """Forget a session nobody is using any more"""
+        if not session.subscribers and session.publisher is None and not session.running:
+            self.sessions.pop(session.name, None)
+
+    async def _publish(self, request, reader, writer, name):
+        """Feed a publisher's audio into its session"""
+        session = self._session(name)
+        if session.publisher is not None or session.running:
+            self._release(session)
+            return await self._respond(writer, HTTPStatus.CONFLICT,
+                                       {'error': f"Session {name} already has a publisher"})
+
+        query = request.query
+        targets = [target for target in query.get('targets', ','.join(self.targets)).split(",")
+                   if target]
+        try:
+            sample_rate = int(query.get('rate', 16000))
+            sample_width = int(query.get('width', 2))
+            if sample_rate <= 0 or sample_width not in (1, 2, 3, 4):
+                raise ValueError(f"Unsupported audio format: {sample_rate} Hz, "
+                                 f"{sample_width} bytes per sample")
+        except ValueError as e:
+            self._release(session)
+            return await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': str(e)})
+
+        websocket = await self._accept(request, reader, writer)
+        session.publisher = websocket
+        session.subscribers.add(websocket)
+        session.start(sample_rate, sample_width, query.get('language', self.language), targets)
+        try:
+            while True:
+                message = await websocket.recv()
+                if isinstance(message, bytes):
+                    session.feed(message)
+                    continue
+                try:
+                    control = json.loads(message)
+                except ValueError:
+                    control = None
+                if isinstance(control, dict) and control.get('type') == 'end':
+                    break
+            # Stay connected for the rest of the segments
+            session.finish()
+            await asyncio.shield(session.task)
+            await websocket.close()
+        except WebSocketClosed:
+            session.finish()
+        finally:
+            session.publisher = None
+            session.subscribers.discard(websocket)
+            if session.task is not None and not session.task.done():
+                session.task.add_done_callback(lambda task: self._release(session))
+            else:
+                self._release(session)
+
+    async def _subscribe(self, request, reader, writer, name):
+        """Send a session's segments to a subscriber until it disconnects"""
+        session = self._session(name)
+        websocket = await self._accept(request, reader, writer)
+        session.subscribers.add(websocket)
+        try:
+            while True:
+                # Subscribers only ever send pings and the close frame
+                await websocket.recv()
+        except WebSocketClosed:
+            pass
+        finally:
+            session.subscribers.discard(websocket)
+            self._release(session)
+
+    async def _create_job(self, request, writer):
+        """Queue a file job and answer with its id"""
+        filename = request.query.get('filename', 'upload.wav')
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in AUDIO_TYPES:
+            return await self._respond(writer, HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+                                       {'error': f"Unsupported audio type {extension}"})
+        if not request.body:
+            return await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': "Empty body"})
+
+        self._expire_jobs()
+        job_id = uuid.uuid4().hex
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        path = os.path.join(self.jobs_dir, job_id + extension)
+        self._job_files[job_id] = [path]
+        with open(path, 'wb') as file:
+            file.write(request.body)
+
+        job = {'id': job_id, 'url': f"/jobs/{job_id}", 'status': 'queued', 'filename': filename,
+               'created': time.time()}
+        self.jobs[job_id] = job
+        task = asyncio.ensure_future(self._run_job(
+            job, path, request.query.get('language', self.language), request.query.get('target')))
+        self._job_tasks.add(task)
+        task.add_done_callback(self._job_tasks.discard)
+        await self._respond(writer, HTTPStatus.ACCEPTED, dict(job))
+
+    async def _run_job(self, job, path, language, target):
+        """Transcribe a job's file with BatchTranscriber in the background"""
+        def translate(text, source_lang, target_lang):
+            return self.get_translator().translate(text, src=source_lang, dest=target_lang).text
+
+        transcriber = BatchTranscriber(
+            recognize=partial(recognize_backend, self.recognizer_name),
+            translate=translate if target else None,
+            language=language, target_language=target, workers=self.job_workers)
+        output = transcriber.output_path(path, self.jobs_dir)
+        self._job_files[job['id']] += [output, segment_path(output)]
+
+        def run():
+            report = transcriber.transcribe_files([path], self.jobs_dir)
+            if report.errors and not report.outputs:
+                raise RuntimeError("; ".join(report.errors))
+            output = report.outputs[0]
+            # Times relative to the start of the file
+            segments = [json.loads(line) for line in iter_jsonl(
+                read_segments(segment_path(output)), origin=os.path.getmtime(path))]
+            return report, segments
+
+        job['status'] = 'running'
+        try:
+            report, segments = await asyncio.get_running_loop().run_in_executor(None, run)
+        except Exception as e:
+            job.update(status='error', error=str(e))
+        else:
+            job.update(status='done', summary=report.summary(), segments=segments,
+                       errors=report.errors)
+        job['finished'] = time.time()
+        self._expire_jobs()
+
+    def _expire_jobs(self):
+        """Forget finished jobs past job_ttl or beyond max_jobs and delete their files"""
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if 'finished' in job),
+                          key=lambda job: job['finished'])
+        excess = len(finished) - self.max_jobs
+        for position, job in enumerate(finished):
+            if position < excess or now - job['finished'] > self.job_ttl:
+                del self.jobs[job['id']]
+                for path in self._job_files.pop(job['id'], ()):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Serve live captions over WebSocket")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--engine", choices=sorted(RECOGNIZER_BACKENDS), default="google",
+                        help="speech recognition engine")
+    parser.add_argument("--translator", choices=sorted(TRANSLATOR_BACKENDS),
+                        default="googletrans", help="translation engine")
+    parser.add_argument("--language", default="en",
+                        help="default source language code ('auto' to detect)")
+    parser.add_argument("--targets", default="",
+                        help="default comma-separated target language codes")
+    parser.add_argument("--jobs-dir", help="directory for uploaded files and their transcripts")
+    parser.add_argument("--job-workers", type=int, help="worker processes per file job")
+    parser.add_argument("--job-ttl", type=float, default=3600.0,
+                        help="seconds a finished job and its files are kept")
+    parser.add_argument("--interim", type=float, metavar="SECONDS",
+                        help="send interim results this often while a phrase is spoken")
+    args = parser.parse_args(argv)
+
+    server = CaptionServer(args.host, args.port, recognizer=args.engine,
+                           translator=args.translator, language=args.language,
+                           targets=[target for target in args.targets.split(",") if target],
+                           jobs_dir=args.jobs_dir, job_workers=args.job_workers,
+                           job_ttl=args.job_ttl,
+                           interim_interval=args.interim)
+
+    async def run():
+        await server.serve()
+        print(f"Caption server on {server.ws_url}", file=sys.stderr)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
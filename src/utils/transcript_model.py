@@ -0,0 +1,408 @@
+import math
+import os
+import struct
+from array import array
+
+# File header: magic and format version
+_FILE_HEADER = struct.Struct('<4sH')
+_FILE_MAGIC = b'TSEG'
+_FILE_VERSION = 1
+
+# Record: payload length, then start, end, confidence and the byte lengths
+# of source language, target language, original and translated text and
+# speaker
+_LENGTH = struct.Struct('<I')
+_RECORD = struct.Struct('<dddHHIIH')
+
+# Translated length meaning "no translation" (as opposed to an empty one)
+_NO_TEXT = 0xFFFFFFFF
+
+
+def segment_path(transcript_path):
+    """Return the path of the segment file kept beside a text transcript"""
+    return os.path.splitext(transcript_path)[0] + ".seg"
+
+
+def language_path(transcript_path, language):
+    """Return the path of the transcript kept for another target language"""
+    root, extension = os.path.splitext(transcript_path)
+    return f"{root}.{language}{extension}"
+
+
+class Segment:
+    """One recognized phrase with its timing, languages and translation.
+
+    ``start`` and ``end`` are Unix timestamps; ``confidence`` and
+    ``translated`` are None when unknown or not translated. ``speaker``
+    names the track (microphone or channel) of multi-speaker sessions.
+    """
+    __slots__ = ('start', 'end', 'original', 'translated', 'source_language',
+                 'target_language', 'confidence', 'speaker')
+
+    def __init__(self, start, end, original, translated=None, source_language=None,
+                 target_language=None, confidence=None, speaker=None):
+        self.start = start
+        self.end = end
+        self.original = original
+        self.translated = translated
+        self.source_language = source_language
+        self.target_language = target_language
+        self.confidence = confidence
+        self.speaker = speaker
+
+    @property
+    def duration(self):
+        """Length of the phrase in seconds"""
+        return self.end - self.start
+
+    @property
+    def text(self):
+        """The text shown to the user: the translation if there is one"""
+        return self.translated if self.translated is not None else self.original
+
+    def __eq__(self, other):
+        if not isinstance(other, Segment):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return f"Segment({self.start!r}, {self.end!r}, {self.original!r}, {self.translated!r})"
+
+
+def encode_segment(segment):
+    """Return the length-prefixed binary record for a segment"""
+    source = (segment.source_language or '').encode('utf-8')
+    target = (segment.target_language or '').encode('utf-8')
+    original = segment.original.encode('utf-8')
+    translated = segment.translated.encode('utf-8') if segment.translated is not None else b''
+    speaker = (segment.speaker or '').encode('utf-8')
+    confidence = segment.confidence if segment.confidence is not None else math.nan
+
+    payload = b''.join((
+        _RECORD.pack(segment.start, segment.end, confidence, len(source), len(target),
+                     len(original),
+                     len(translated) if segment.translated is not None else _NO_TEXT,
+                     len(speaker)),
+        source, target, original, translated, speaker))
+    return _LENGTH.pack(len(payload)) + payload
+
+
+class Transcript:
+    """Compact, column-oriented collection of segments.
+
+    Timing and confidence live in ``array`` columns, languages are stored
+    as indexes into a small table, and all text stays UTF-8 encoded in one
+    buffer until a segment is actually accessed. Loading a file keeps its
+    bytes as that buffer, so nothing is decoded up front.
+    """
+
+    def __init__(self):
+        self.starts = array('d')
+        self.ends = array('d')
+        self.confidences = array('d')
+        self.languages = []
+        self._language_ids = {}
+        self._sources = array('H')
+        self._targets = array('H')
+        self.speakers = []
+        self._speaker_ids = {}
+        self._speaker_column = array('H')
+
+        # Text buffer and the (start, stop) of every segment's original
+        # and translated text in it; a stop of -1 means no translation
+        self._data = bytearray()
+        self._text_spans = array('q')
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("segment index out of range")
+
+        confidence = self.confidences[index]
+        return Segment(self.starts[index], self.ends[index], self.original(index),
+                       self.translated(index), self.source_language(index),
+                       self.target_language(index),
+                       None if math.isnan(confidence) else confidence,
+                       self.speaker(index))
+
+    def _label_id(self, labels, ids, label):
+        """Index of a label in a small lookup table, adding it if needed"""
+        label = label or ''
+        if label not in ids:
+            ids[label] = len(labels)
+            labels.append(label)
+        return ids[label]
+
+    def _language_id(self, language):
+        return self._label_id(self.languages, self._language_ids, language)
+
+    def _add(self, start, end, confidence, source, target, spans, speaker=None):
+        self.starts.append(start)
+        self.ends.append(end)
+        self.confidences.append(confidence)
+        self._sources.append(self._language_id(source))
+        self._targets.append(self._language_id(target))
+        self._speaker_column.append(self._label_id(self.speakers, self._speaker_ids, speaker))
+        self._text_spans.extend(spans)
+
+    def append(self, segment):
+        """Add a segment"""
+        original = segment.original.encode('utf-8')
+        spans = [len(self._data), len(self._data) + len(original)]
+        self._data += original
+        if segment.translated is None:
+            spans += [len(self._data), -1]
+        else:
+            translated = segment.translated.encode('utf-8')
+            spans += [len(self._data), len(self._data) + len(translated)]
+            self._data += translated
+
+        confidence = segment.confidence if segment.confidence is not None else math.nan
+        self._add(segment.start, segment.end, confidence, segment.source_language,
+                  segment.target_language, spans, segment.speaker)
+
+    def extend(self, segments):
+        """Add several segments"""
+        for segment in segments:
+            self.append(segment)
+
+    def clear(self):
+        """Remove all segments"""
+        self.__init__()
+
+    def _text(self, index, which):
+        start, stop = self._text_spans[index * 4 + which * 2:index * 4 + which * 2 + 2]
+        if stop < 0:
+            return None
+        return self._data[start:stop].decode('utf-8')
+
+    def original(self, index):
+        """Decode the recognized text of one segment"""
+        return self._text(index, 0)
+
+    def translated(self, index):
+        """Decode the translated text of one segment, or None"""
+        return self._text(index, 1)
+
+    def source_language(self, index):
+        """Source language code of one segment, or None"""
+        return self.languages[self._sources[index]] or None
+
+    def target_language(self, index):
+        """Target language code of one segment, or None"""
+        return self.languages[self._targets[index]] or None
+
+    def speaker(self, index):
+        """Speaker track of one segment, or None"""
+        return self.speakers[self._speaker_column[index]] or None
+
+    def text_bytes(self):
+        """Number of bytes of encoded text held"""
+        return len(self._data)
+
+    def to_bytes(self):
+        """Serialize to the binary file format"""
+        return _FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION) + b''.join(
+            encode_segment(segment) for segment in self)
+
+    def save(self, path):
+        """Write all segments to path, replacing it atomically"""
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(self.to_bytes())
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Parse the binary format; an incomplete trailing record is ignored"""
+        transcript = cls()
+        transcript._load(bytearray(data))
+        return transcript
+
+    @classmethod
+    def load(cls, path):
+        """Read a transcript saved with ``save`` or a ``SegmentWriter``"""
+        with open(path, 'rb') as file:
+            data = bytearray(os.fstat(file.fileno()).st_size)
+            size = file.readinto(data)
+        transcript = cls()
+        transcript._load(data[:size] if size < len(data) else data)
+        return transcript
+
+    def _load(self, data):
+        """Index the records in data and adopt it as the text buffer"""
+        check_header(data)
+
+        # Texts are decoded in place from the file data when accessed
+        self._data = data
+        scan_records(data, self._add_record)
+
+    def _add_record(self, data, offset):
+        start, end, confidence, source_length, target_length, original_length, \
+            translated_length, speaker_length = _RECORD.unpack_from(data, offset)
+        position = offset + _RECORD.size
+        source = data[position:position + source_length].decode('utf-8')
+        position += source_length
+        target = data[position:position + target_length].decode('utf-8')
+        position += target_length
+
+        spans = [position, position + original_length]
+        position += original_length
+        if translated_length == _NO_TEXT:
+            spans += [position, -1]
+        else:
+            spans += [position, position + translated_length]
+            position += translated_length
+
+        speaker = data[position:position + speaker_length].decode('utf-8')
+        self._add(start, end, confidence, source, target, spans, speaker)
+
+
+def check_header(header):
+    """Raise ValueError unless header starts a segment file of this format"""
+    if len(header) < _FILE_HEADER.size or _FILE_HEADER.unpack_from(header) != (
+            _FILE_MAGIC, _FILE_VERSION):
+        raise ValueError("not a segment file")
+
+
+def scan_records(data, on_record=None):
+    """Walk the records in data and return the length of the valid prefix.
+
+    ``on_record(data, offset)`` is called with the offset of each complete
+    record's payload.
+    """
+    offset = _FILE_HEADER.size
+    while offset + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        if length < _RECORD.size or offset + _LENGTH.size + length > len(data):
+            break
+        if on_record:
+            on_record(data, offset + _LENGTH.size)
+        offset += _LENGTH.size + length
+    return min(offset, len(data))
+
+
+def decode_segment(data, offset=0):
+    """Decode the record payload starting at offset into a Segment"""
+    start, end, confidence, *lengths = _RECORD.unpack_from(data, offset)
+    position = offset + _RECORD.size
+    texts = []
+    for length in lengths:
+        if length == _NO_TEXT:
+            texts.append(None)
+            continue
+        texts.append(bytes(data[position:position + length]).decode('utf-8'))
+        position += length
+
+    source, target, original, translated, speaker = texts
+    return Segment(start, end, original, translated, source or None, target or None,
+                   None if math.isnan(confidence) else confidence, speaker or None)
+
+
+def read_segments(path, buffer_size=64 * 1024):
+    """Yield the segments of a segment file one at a time.
+
+    Unlike ``Transcript.load`` only one record is held in memory, so this
+    is what exporters use for large archives. An incomplete trailing
+    record is ignored.
+    """
+    with open(path, 'rb', buffering=buffer_size) as file:
+        check_header(file.read(_FILE_HEADER.size))
+
+        while True:
+            prefix = file.read(_LENGTH.size)
+            if len(prefix) < _LENGTH.size:
+                return
+            (length,) = _LENGTH.unpack(prefix)
+            payload = file.read(length)
+            if length < _RECORD.size or len(payload) < length:
+                return
+            yield decode_segment(payload)
+
+
+class SegmentWriter:
+    """Append-only writer for a segment file.
+
+    Opening cuts off an incomplete record left by a crash, so the file
+    stays readable; after that each segment costs a single write.
+    ``records`` counts the complete records in the file.
+    """
+
+    def __init__(self, path, truncate=False):
+        self.path = path
+        self.truncate = truncate
+        self.recovered_bytes = 0
+        self.records = 0
+        self._file = None
+
+    def open(self):
+        """Open (creating or repairing) the file and return self"""
+        self._file = open(self.path, 'a+b')
+        if self.truncate:
+            self._file.truncate(0)
+        size = self._file.seek(0, os.SEEK_END)
+        self._file.seek(0)
+        header = self._file.read(_FILE_HEADER.size)
+        self.records = 0
+        if len(header) < _FILE_HEADER.size or header[:4] != _FILE_MAGIC:
+            # New, empty or foreign file: start over
+            self._file.truncate(0)
+            self._file.write(_FILE_HEADER.pack(_FILE_MAGIC, _FILE_VERSION))
+            self.recovered_bytes = size
+        else:
+            try:
+                check_header(header)
+            except ValueError:
+                # Written in another format version; don't destroy it
+                self._file.close()
+                self._file = None
+                raise
+            valid = self._skip_records(size)
+            if valid < size:
+                self._file.truncate(valid)
+                self.recovered_bytes = size - valid
+        return self
+
+    def _skip_records(self, size):
+        """Count the complete records and return the offset where they end.
+
+        Only the length prefixes are read; the payloads are skipped.
+        """
+        offset = _FILE_HEADER.size
+        while offset + _LENGTH.size <= size:
+            self._file.seek(offset)
+            (length,) = _LENGTH.unpack(self._file.read(_LENGTH.size))
+            if length < _RECORD.size or offset + _LENGTH.size + length > size:
+                break
+            offset += _LENGTH.size + length
+            self.records += 1
+        return offset
+
+    def append(self, segment):
+        """Write one segment record"""
+        self._file.write(encode_segment(segment))
+        self.records += 1
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
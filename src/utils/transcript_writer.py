@@ -0,0 +1,135 @@
+import os
+import threading
+import time
+
+
+class TranscriptWriter:
+    """Append-only transcript sink.
+
+    Each call to ``append`` writes one complete record ending in
+    ``terminator`` (a newline by default). Data is handed to the OS on
+    every append, but the (expensive) fsync is batched and only happens
+    once ``sync_interval`` seconds have passed or ``sync_bytes`` bytes have
+    been written since the last one.
+
+    When an existing file is opened, a tail that does not end in the
+    terminator is treated as a record cut short by a crash and is
+    truncated away.
+    """
+
+    def __init__(self, path, sync_interval=5.0, sync_bytes=64 * 1024,
+                 terminator='\n', truncate=False):
+        self.path = path
+        self.terminator = terminator
+        self.sync_interval = sync_interval
+        self.sync_bytes = sync_bytes
+        self.truncate = truncate
+
+        self.bytes_written = 0
+        self.recovered_bytes = 0
+        self.sync_count = 0
+
+        self._file = None
+        self._unsynced_bytes = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._file is not None
+
+    def open(self):
+        """Open the file for appending, recovering a truncated tail first"""
+        with self._lock:
+            if self._file is not None:
+                return self
+
+            if self.truncate or not os.path.exists(self.path):
+                self._file = open(self.path, 'wb')
+            else:
+                self.recovered_bytes = self._recover()
+                self._file = open(self.path, 'ab')
+
+            self._unsynced_bytes = 0
+            self._last_sync = time.monotonic()
+        return self
+
+    def _recover(self):
+        """Drop a partially written final record; return the number of bytes removed"""
+        with open(self.path, 'rb+') as file:
+            size = file.seek(0, os.SEEK_END)
+            if size == 0:
+                return 0
+
+            # Scan backwards in blocks for the end of the last complete
+            # record; blocks overlap so a terminator is never split
+            terminator = self.terminator.encode('utf-8')
+            block = 4096
+            position = size
+            end = 0
+            while position > 0:
+                start = max(0, position - block)
+                file.seek(start)
+                chunk = file.read(min(size, position + len(terminator) - 1) - start)
+                found = chunk.rfind(terminator)
+                if found != -1:
+                    end = start + found + len(terminator)
+                    break
+                position = start
+
+            if end == size:
+                return 0
+
+            file.truncate(end)
+            file.flush()
+            os.fsync(file.fileno())
+            return size - end
+
+    def append(self, text):
+        """Append one record; the terminator is added if missing"""
+        if not text.endswith(self.terminator):
+            text += self.terminator
+        data = text.encode('utf-8')
+
+        with self._lock:
+            if self._file is None:
+                raise ValueError("Transcript writer is not open")
+
+            self._file.write(data)
+            self._file.flush()
+            self.bytes_written += len(data)
+            self._unsynced_bytes += len(data)
+
+            if (self._unsynced_bytes >= self.sync_bytes or
+                    time.monotonic() - self._last_sync >= self.sync_interval):
+                self._sync()
+
+    def sync(self):
+        """Force buffered data to disk now"""
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+
+    def _sync(self):
+        if self._unsynced_bytes:
+            os.fsync(self._file.fileno())
+            self.sync_count += 1
+        self._unsynced_bytes = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Sync and close the file"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.flush()
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
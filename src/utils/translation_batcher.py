@@ -0,0 +1,140 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from .translators import Translation
+
+
+class _Request:
+    __slots__ = ('text', 'src', 'dest', 'future', 'arrived')
+
+    def __init__(self, text, src, dest):
+        self.text = text
+        self.src = src
+        self.dest = dest
+        self.future = Future()
+        self.arrived = time.monotonic()
+
+
+class TranslationBatcher:
+    """Coalesce single translation requests into batched calls.
+
+    Requests arriving within ``window`` seconds of the oldest waiting one
+    (or until ``max_batch`` requests are waiting) are sent together, one
+    call per (src, dest) pair, using googletrans' support for lists. No
+    request waits longer than ``window`` before it is sent.
+
+    ``translate`` has the googletrans signature and blocks for the result,
+    so the batcher can sit behind CachedTranslator or be used directly by
+    several worker threads. At most ``senders`` calls are in flight; while
+    they all are, requests keep collecting into the next batch.
+    """
+
+    def __init__(self, translator, window=0.3, max_batch=8, senders=2):
+        self.translator = translator
+        self.window = window
+        self.max_batch = max(1, max_batch)
+        self.senders = senders
+
+        self.calls = 0
+        self.segments = 0
+
+        self._pending = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = None
+        self._executor = ThreadPoolExecutor(max_workers=senders)
+        # Released when a call returns, so calls never queue up in the executor
+        self._free_senders = threading.Semaphore(senders)
+
+    def submit(self, text, dest='en', src='auto'):
+        """Queue text for translation and return a Future for the result"""
+        request = _Request(text, src, dest)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Translation batcher is closed")
+            self._pending.append(request)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._collect, name="translation-batcher")
+                self._thread.daemon = True
+                self._thread.start()
+            self._condition.notify()
+        return request.future
+
+    def translate(self, text, dest='en', src='auto', **kwargs):
+        """Translate one text; blocks until its batch has been sent"""
+        if isinstance(text, (list, tuple)):
+            # Already a batch, no point in holding it back
+            return self.translator.translate(list(text), dest=dest, src=src, **kwargs)
+        return Translation(self.submit(text, dest, src).result(), src, dest, text)
+
+    def __getattr__(self, name):
+        # detect() and everything else go straight to the wrapped translator
+        return getattr(self.translator, name)
+
+    def get_stats(self):
+        """Return the number of backend calls and segments sent"""
+        with self._condition:
+            return {
+                'calls': self.calls,
+                'segments': self.segments,
+                'average_batch': self.segments / self.calls if self.calls else 0.0,
+                'pending': len(self._pending),
+            }
+
+    def close(self):
+        """Send whatever is waiting and stop the background thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _collect(self):
+        """Wait for a batch to fill up or for its window to run out"""
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+
+                deadline = self._pending[0].arrived + self.window
+                while len(self._pending) < self.max_batch and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+
+                batch = self._pending[:self.max_batch]
+                del self._pending[:self.max_batch]
+
+            # One call per (src, dest) pair, each sent on another thread so
+            # the next window starts right away and the target languages of
+            # a batch are translated side by side
+            groups = {}
+            for request in batch:
+                groups.setdefault((request.src, request.dest), []).append(request)
+            for (src, dest), requests in groups.items():
+                self._free_senders.acquire()
+                self._executor.submit(self._send, src, dest, requests)
+
+    def _send(self, src, dest, requests):
+        """Send one call for a (src, dest) pair and hand out the results in order"""
+        try:
+            results = self.translator.translate(
+                [request.text for request in requests], src=src, dest=dest)
+            if len(results) != len(requests):
+                raise ValueError(f"Expected {len(requests)} translations, got {len(results)}")
+        except Exception as e:
+            for request in requests:
+                request.future.set_exception(e)
+            return
+        finally:
+            with self._condition:
+                self.calls += 1
+                self.segments += len(requests)
+            self._free_senders.release()
+
+        for request, result in zip(requests, results):
+            request.future.set_result(result.text)
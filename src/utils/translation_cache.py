@@ -0,0 +1,217 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from .translators import Translation
+
+# Keeps memory and disk entries apart from the "no entry" case
+_MISSING = object()
+
+
+def normalize_text(text):
+    """Normalize text for use in a cache key"""
+    # Only whitespace: case can change a translation
+    return ' '.join(text.split())
+
+
+class TranslationCache:
+    """Translation results keyed by (normalized text, src, dest).
+
+    An in-memory LRU sits in front of an optional SQLite store so results
+    survive across sessions. Entries expire after ``ttl`` seconds (None
+    disables expiry). Memory holds at most ``max_entries`` and the disk
+    store ``max_disk_entries``. Writes are committed every
+    ``commit_every`` puts and the disk store is pruned every
+    ``prune_every``; flush() commits whatever is pending.
+    """
+
+    def __init__(self, max_entries=5000, ttl=30 * 24 * 3600, path=None,
+                 max_disk_entries=100000, commit_every=20, prune_every=1000):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl = ttl
+        self.path = path
+        self.commit_every = commit_every
+        self.prune_every = prune_every
+
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        # Puts not yet committed, and since the disk store was last pruned
+        self._uncommitted = 0
+        self._unpruned = 0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "text TEXT, src TEXT, dest TEXT, result TEXT, created REAL, "
+                "PRIMARY KEY (text, src, dest))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS translations_created "
+                             "ON translations (created)")
+            self._db.commit()
+
+    def make_key(self, text, src, dest):
+        return (normalize_text(text), src or 'auto', dest)
+
+    def _expired(self, created):
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def get(self, text, src, dest):
+        """Return a cached translation, or None on a miss"""
+        key = self.make_key(text, src, dest)
+        with self._lock:
+            entry = self._memory.get(key, _MISSING)
+            if entry is not _MISSING:
+                result, created = entry
+                if not self._expired(created):
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return result
+                del self._memory[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT result, created FROM translations WHERE text=? AND src=? AND dest=?",
+                    key).fetchone()
+                if row and not self._expired(row[1]):
+                    self._remember(key, row[0], row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, text, src, dest, result):
+        """Store a translation in memory and, if enabled, on disk"""
+        key = self.make_key(text, src, dest)
+        created = time.time()
+        with self._lock:
+            self._remember(key, result, created)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?)",
+                    key + (result, created))
+                self._uncommitted += 1
+                self._unpruned += 1
+                if self._unpruned >= self.prune_every:
+                    self._prune_disk()
+                elif self._uncommitted >= self.commit_every:
+                    self._commit()
+
+    def _remember(self, key, result, created):
+        self._memory[key] = (result, created)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _commit(self):
+        self._db.commit()
+        self._uncommitted = 0
+
+    def _prune_disk(self):
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM translations WHERE created < ?",
+                             (time.time() - self.ttl,))
+        self._db.execute(
+            "DELETE FROM translations WHERE rowid IN ("
+            "SELECT rowid FROM translations ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,))
+        self._commit()
+        self._unpruned = 0
+
+    def flush(self):
+        """Commit pending writes to the disk store"""
+        with self._lock:
+            if self._db is not None and self._uncommitted:
+                self._commit()
+
+    def prune(self):
+        """Drop expired entries and trim the disk store to its size cap"""
+        with self._lock:
+            for key in [key for key, (_, created) in self._memory.items()
+                        if self._expired(created)]:
+                del self._memory[key]
+
+            if self._db is not None:
+                self._prune_disk()
+
+    def clear(self):
+        """Remove every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM translations")
+                self._commit()
+
+    def get_stats(self):
+        """Return hit/miss counters and sizes"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'memory_entries': len(self._memory),
+            }
+
+    def close(self):
+        """Trim and close the disk store"""
+        if self._db is not None:
+            self.prune()
+            with self._lock:
+                self._db.close()
+                self._db = None
+
+
+class CachedTranslator:
+    """Wrap a googletrans-style translator so cache hits skip the network.
+
+    ``translate`` returns an object with ``text``, ``src`` and ``dest``
+    just like googletrans; anything else is passed through untouched.
+    """
+
+    def __init__(self, translator, cache=None):
+        self.translator = translator
+        self.cache = cache if cache is not None else TranslationCache()
+
+    def translate(self, text, dest='en', src='auto', **kwargs):
+        if isinstance(text, (list, tuple)):
+            return self.translate_batch(list(text), dest, src, **kwargs)
+        cached = self.cache.get(text, src, dest)
+        if cached is not None:
+            return Translation(cached, src, dest, text)
+
+        result = self.translator.translate(text, dest=dest, src=src, **kwargs)
+        self.cache.put(text, src, dest, result.text)
+        return result
+
+    def translate_batch(self, texts, dest='en', src='auto', **kwargs):
+        """Translate a list, sending only the cache misses in one call"""
+        results = [None] * len(texts)
+        misses = []
+        for i, text in enumerate(texts):
+            cached = self.cache.get(text, src, dest)
+            if cached is not None:
+                results[i] = Translation(cached, src, dest, text)
+            else:
+                misses.append(i)
+
+        if misses:
+            translated = self.translator.translate([texts[i] for i in misses],
+                                                   dest=dest, src=src, **kwargs)
+            for i, result in zip(misses, translated):
+                self.cache.put(texts[i], src, dest, result.text)
+                results[i] = result
+        return results
+
+    def __getattr__(self, name):
+        # detect() and everything else go straight to the wrapped translator
+        return getattr(self.translator, name)
+
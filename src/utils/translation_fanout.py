@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .pipeline import StageStats
+
+
+class FanoutStats:
+    """Per-segment and per-language translation times"""
+
+    def __init__(self):
+        self.segments = 0
+        self.total_time = 0.0
+        self.serial_time = 0.0
+        self.languages = {}
+        self._lock = threading.Lock()
+
+    def record_language(self, language, elapsed):
+        """Record the time one translation into language took"""
+        with self._lock:
+            stats = self.languages.get(language)
+            if stats is None:
+                stats = self.languages[language] = StageStats(language)
+        stats.record(elapsed)
+        return elapsed
+
+    def record(self, elapsed, serial):
+        """Record one segment: wall time and the sum of its translations"""
+        with self._lock:
+            self.segments += 1
+            self.total_time += elapsed
+            self.serial_time += serial
+
+    def snapshot(self):
+        """Return the current figures as a plain dictionary"""
+        with self._lock:
+            count = self.segments
+            return {
+                'segments': count,
+                'average': self.total_time / count if count else 0.0,
+                'average_serial': self.serial_time / count if count else 0.0,
+                'languages': {language: stats.snapshot()
+                              for language, stats in self.languages.items()},
+            }
+
+    def summary(self):
+        """One-line human readable summary"""
+        stats = self.snapshot()
+        return (f"Translated {stats['segments']} segments into {len(stats['languages'])} "
+                f"languages in {stats['average'] * 1000:.0f} ms each "
+                f"({stats['average_serial'] * 1000:.0f} ms one after another)")
+
+
+class TranslationFanout:
+    """Translate a segment into several target languages at once.
+
+    ``translator`` has the googletrans signature (usually a CachedTranslator
+    in front of a TranslationBatcher, so every language shares the cache and
+    batching). The first target is translated on the calling thread and the
+    rest on a thread pool, so a segment takes as long as its slowest
+    translation rather than the sum of them.
+
+    A failed translation is passed to ``on_error(language, error)`` and
+    comes back as None, like a target that matches the source language;
+    the other languages are not held up by it.
+    """
+
+    def __init__(self, translator, max_workers=16, on_error=None):
+        self.translator = translator
+        self.on_error = on_error
+        self.stats = FanoutStats()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix="translation-fanout")
+
+    def translate(self, text, source_lang, targets):
+        """Return {language: translated text or None} in the order of targets"""
+        start = time.perf_counter()
+        targets = list(dict.fromkeys(targets))
+        futures = [(language, self._executor.submit(self._translate, text, source_lang, language))
+                   for language in targets[1:]]
+
+        results = {}
+        serial = 0.0
+        if targets:
+            results[targets[0]], elapsed = self._translate(text, source_lang, targets[0])
+            serial += elapsed
+        for language, future in futures:
+            results[language], elapsed = future.result()
+            serial += elapsed
+
+        self.stats.record(time.perf_counter() - start, serial)
+        return results
+
+    def _translate(self, text, source_lang, language):
+        """Translate into one language; returns (text or None, seconds taken)"""
+        if language == source_lang:
+            return None, 0.0
+
+        start = time.perf_counter()
+        try:
+            result = self.translator.translate(text, src=source_lang, dest=language).text
+        except Exception as e:
+            result = None
+            if self.on_error:
+                try:
+                    self.on_error(language, e)
+                except Exception:
+                    pass
+        return result, self.stats.record_language(language, time.perf_counter() - start)
+
+    def close(self):
+        """Wait for running translations and stop the thread pool"""
+        self._executor.shutdown(wait=True)
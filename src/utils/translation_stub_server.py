@@ -0,0 +1,183 @@
+"""
+Local stand-in for a translation service.
+
+Serves the LibreTranslate endpoints HttpTranslator uses (/translate and
+/detect) over HTTP/1.1 keep-alive, answering with deterministic "dest: text"
+translations after an optional simulated latency. Used by the tests and
+the translator benchmark, and handy for running the app without network
+access (translator_backend "http" pointed at this server).
+
+It can also misbehave like a real service: ``failure_rate`` answers a
+share of requests with 503, ``rate_limit`` answers requests beyond that
+many per second with 429 and a Retry-After header, and setting ``down``
+fails everything until it is cleared.
+
+Usage: python -m src.utils.translation_stub_server [--port 5000] [--latency 0.05]
+       [--failure-rate 0.1] [--rate-limit 5]
+"""
+import argparse
+import json
+import random
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from .resilience import TokenBucket
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle's
+        # algorithm and delayed ACKs add ~40 ms to every keep-alive reply
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.server.stub.record('connections')
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        stub = self.server.stub
+        stub.record('requests')
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            return self._reply(400, {'error': "Invalid JSON"})
+
+        refusal = stub.refuse()
+        if refusal is not None:
+            status, retry_after = refusal
+            return self._reply(status, {'error': "Service unavailable" if status == 503
+                                        else "Too many requests"}, retry_after)
+
+        if stub.latency:
+            time.sleep(stub.latency)
+
+        if self.path.endswith('/translate'):
+            texts = payload.get('q', '')
+            target = payload.get('target', 'en')
+            if isinstance(texts, list):
+                stub.record('segments', len(texts))
+                result = [f"{target}: {text}" for text in texts]
+            else:
+                stub.record('segments')
+                result = f"{target}: {texts}"
+            self._reply(200, {'translatedText': result})
+        elif self.path.endswith('/detect'):
+            self._reply(200, [{'language': stub.language, 'confidence': 90.0}])
+        else:
+            self._reply(404, {'error': "Not found"})
+
+    def _reply(self, status, body, retry_after=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        if retry_after is not None:
+            self.send_header('Retry-After', f"{retry_after:g}")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class StubTranslationServer:
+    """LibreTranslate-compatible stub server running on a background thread.
+
+    ``port=0`` picks a free port; the actual address is in ``url`` once
+    started. Counts connections, requests, translated segments and the
+    requests refused with 503 (failures) or 429 (throttled).
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, language='en',
+                 failure_rate=0.0, rate_limit=None, retry_after=1.0, seed=None):
+        self.latency = latency
+        self.language = language
+        self.failure_rate = failure_rate
+        self.retry_after = retry_after
+        self.down = False
+        self.counts = {'connections': 0, 'requests': 0, 'segments': 0,
+                       'failures': 0, 'throttled': 0}
+        self._bucket = TokenBucket(rate_limit) if rate_limit else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        self._server = ThreadingHTTPServer((host, port), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, name, count=1):
+        with self._lock:
+            self.counts[name] += count
+
+    def refuse(self):
+        """(status, Retry-After) to refuse the current request with, or None"""
+        if self.down:
+            self.record('failures')
+            return 503, self.retry_after
+        if self._bucket is not None and not self._bucket.try_acquire():
+            self.record('throttled')
+            return 429, self.retry_after
+        with self._lock:
+            failed = self.failure_rate and self._random.random() < self.failure_rate
+        if failed:
+            self.record('failures')
+            return 503, None
+        return None
+
+    def start(self):
+        """Serve on a daemon thread and return self"""
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name="translation-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Shut the server down"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run a local stub translation server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="simulated seconds per request")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="share of requests answered with 503")
+    parser.add_argument("--rate-limit", type=float,
+                        help="requests per second before answering 429")
+    args = parser.parse_args(argv)
+
+    server = StubTranslationServer(args.host, args.port, args.latency,
+                                   failure_rate=args.failure_rate, rate_limit=args.rate_limit)
+    print(f"Stub translation server on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
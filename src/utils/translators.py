@@ -0,0 +1,294 @@
+"""
+Translator backends.
+
+Every backend has the googletrans call signature,
+``translate(text, dest='en', src='auto')``, returning an object with
+``text``, ``src``, ``dest`` and ``origin`` (or a list of them when given a
+list), so a backend can sit behind TranslationBatcher and CachedTranslator
+in place of ``googletrans.Translator``. Backends only implement
+``translate_batch(texts, src, dest)``.
+
+Optional dependencies are imported lazily.
+"""
+import http.client
+import importlib
+import json
+import queue
+import threading
+import time
+from urllib.parse import urlsplit
+from .resilience import ServiceError, parse_retry_after
+
+
+class Translation:
+    """A translated text, shaped like a googletrans Translated result"""
+    __slots__ = ('text', 'src', 'dest', 'origin')
+
+    def __init__(self, text, src, dest, origin):
+        self.text = text
+        self.src = src
+        self.dest = dest
+        self.origin = origin
+
+
+class Detection:
+    """A detected language, shaped like a googletrans Detected result"""
+    __slots__ = ('lang', 'confidence')
+
+    def __init__(self, lang, confidence=None):
+        self.lang = lang
+        self.confidence = confidence
+
+
+class TranslatorBackend:
+    """Base class for translator backends"""
+
+    name = None
+    # Whether the backend works without a network connection
+    offline = False
+    # Module that must be importable for the backend to work
+    requires = None
+
+    @classmethod
+    def is_available(cls):
+        """True if the backend's optional dependency is installed"""
+        if cls.requires is None:
+            return True
+        try:
+            importlib.import_module(cls.requires)
+            return True
+        except ImportError:
+            return False
+
+    def translate(self, text, dest='en', src='auto', **kwargs):
+        """Translate a text or a list of texts"""
+        texts = [text] if isinstance(text, str) else list(text)
+        results = self.translate_batch(texts, src, dest)
+        if len(results) != len(texts):
+            raise ValueError(f"Expected {len(texts)} translations, got {len(results)}")
+
+        translations = [Translation(result, src, dest, origin)
+                        for origin, result in zip(texts, results)]
+        return translations[0] if isinstance(text, str) else translations
+
+    def translate_batch(self, texts, src, dest):
+        """Return the translations of texts, in order"""
+        raise NotImplementedError
+
+    def detect(self, text):
+        """Return a Detection for text"""
+        raise NotImplementedError(f"The {self.name} translator cannot detect languages")
+
+    def close(self):
+        """Release connections or models"""
+
+
+class GoogletransTranslator(TranslatorBackend):
+    """googletrans (unofficial Google Translate web API)"""
+
+    name = 'googletrans'
+    requires = 'googletrans'
+
+    def __init__(self, **options):
+        self._translator = importlib.import_module('googletrans').Translator(**options)
+
+    def translate(self, text, dest='en', src='auto', **kwargs):
+        return self._translator.translate(text, dest=dest, src=src, **kwargs)
+
+    def translate_batch(self, texts, src, dest):
+        return [result.text for result in self._translator.translate(texts, dest=dest, src=src)]
+
+    def detect(self, text):
+        return self._translator.detect(text)
+
+
+class ArgosTranslator(TranslatorBackend):
+    """Offline translation with Argos Translate (CTranslate2 models on CPU).
+
+    Language packages must be installed with argospm or the Argos GUI.
+    Argos cannot detect languages, so ``src='auto'`` uses
+    ``default_source``.
+    """
+
+    name = 'argos'
+    offline = True
+    requires = 'argostranslate'
+
+    def __init__(self, default_source='en'):
+        self.default_source = default_source
+        self._translations = {}
+        self._lock = threading.Lock()
+
+    def _translation(self, src, dest):
+        """Installed model for a language pair, loaded once"""
+        src = self.default_source if src in (None, 'auto') else src.split('-')[0]
+        dest = dest.split('-')[0]
+        with self._lock:
+            if (src, dest) not in self._translations:
+                argos = importlib.import_module('argostranslate.translate')
+                languages = {language.code: language
+                             for language in argos.get_installed_languages()}
+                if src not in languages or dest not in languages:
+                    raise ValueError(f"No Argos model installed for {src} -> {dest}")
+                translation = languages[src].get_translation(languages[dest])
+                if translation is None:
+                    raise ValueError(f"No Argos model installed for {src} -> {dest}")
+                self._translations[(src, dest)] = translation
+            return self._translations[(src, dest)]
+
+    def translate_batch(self, texts, src, dest):
+        translation = self._translation(src, dest)
+        return [translation.translate(text) for text in texts]
+
+
+class HttpTranslator(TranslatorBackend):
+    """Translation over HTTP with a LibreTranslate-compatible API.
+
+    Requests go over a small pool of persistent (keep-alive) connections,
+    so consecutive calls skip the TCP and TLS handshakes. A batch is sent
+    as a single request. A connection the server has closed is replaced
+    and the request retried once.
+    """
+
+    name = 'http'
+
+    def __init__(self, url="http://localhost:5000", api_key=None, timeout=10.0, pool_size=4,
+                 keep_alive=True):
+        parts = urlsplit(url)
+        self.url = url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.connections_opened = 0
+
+        self._scheme = parts.scheme or 'http'
+        self._host = parts.hostname or 'localhost'
+        self._port = parts.port
+        self._base_path = parts.path.rstrip('/')
+        self._pool = queue.LifoQueue(maxsize=max(1, pool_size))
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        connection_class = (http.client.HTTPSConnection if self._scheme == 'https'
+                            else http.client.HTTPConnection)
+        with self._lock:
+            self.connections_opened += 1
+        return connection_class(self._host, self._port, timeout=self.timeout)
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _release(self, connection):
+        try:
+            self._pool.put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def request(self, path, payload):
+        """POST JSON to path and return the decoded JSON response"""
+        body = json.dumps(payload).encode('utf-8')
+        headers = {'Content-Type': 'application/json',
+                   'Connection': 'keep-alive' if self.keep_alive else 'close'}
+
+        connection = self._acquire()
+        for attempt in (0, 1):
+            try:
+                connection.request('POST', self._base_path + path, body, headers)
+                response = connection.getresponse()
+                data = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                # Stale keep-alive connection; retry once on a fresh one
+                connection.close()
+                if attempt:
+                    raise
+                connection = self._connect()
+            except Exception:
+                connection.close()
+                raise
+
+        if response.will_close or not self.keep_alive:
+            connection.close()
+        else:
+            self._release(connection)
+
+        if response.status != 200:
+            # 429 and 503 usually say when to come back
+            raise ServiceError(f"Translation server returned {response.status}: "
+                               f"{data[:200].decode('utf-8', errors='replace')}",
+                               response.status, parse_retry_after(response.getheader('Retry-After')))
+        return json.loads(data)
+
+    def translate_batch(self, texts, src, dest):
+        payload = {'q': texts, 'source': src or 'auto', 'target': dest, 'format': 'text'}
+        if self.api_key:
+            payload['api_key'] = self.api_key
+        result = self.request('/translate', payload)['translatedText']
+        return [result] if isinstance(result, str) else result
+
+    def detect(self, text):
+        payload = {'q': text}
+        if self.api_key:
+            payload['api_key'] = self.api_key
+        best = self.request('/detect', payload)[0]
+        confidence = best.get('confidence')
+        return Detection(best['language'], confidence / 100.0 if confidence is not None else None)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class StubTranslator(TranslatorBackend):
+    """Deterministic translator for tests and benchmarks.
+
+    Prefixes each text with the target language ("es: hello"), optionally
+    sleeping ``latency`` seconds per call to simulate a service.
+    """
+
+    name = 'stub'
+    offline = True
+
+    def __init__(self, latency=0.0, language='en'):
+        self.latency = latency
+        self.language = language
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def translate_batch(self, texts, src, dest):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [f"{dest}: {text}" for text in texts]
+
+    def detect(self, text):
+        return Detection(self.language, 1.0)
+
+
+TRANSLATOR_BACKENDS = {
+    backend.name: backend
+    for backend in (GoogletransTranslator, ArgosTranslator, HttpTranslator, StubTranslator)
+}
+
+
+def available_backends():
+    """Names of the backends whose dependencies are installed"""
+    return [name for name, backend in TRANSLATOR_BACKENDS.items() if backend.is_available()]
+
+
+def create_translator(name, **options):
+    """Create a backend by name"""
+    try:
+        backend = TRANSLATOR_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown translator backend: {name}")
+    if not backend.is_available():
+        raise ImportError(f"The {name} translator needs the '{backend.requires}' package")
+    return backend(**options)
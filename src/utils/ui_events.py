@@ -0,0 +1,94 @@
+import queue
+from datetime import datetime
+
+
+class UIEventBus:
+    """Hand UI updates from worker threads to the Tk main loop.
+
+    Workers only put events on a thread-safe queue. The main loop drains
+    the queue every ``interval`` milliseconds via ``after()``: consecutive
+    log lines are handed over as one batch, only the latest status is
+    applied, and queued calls run in the order they were posted.
+    """
+
+    def __init__(self, on_log=None, on_status=None, interval=50, max_events=2000):
+        self.on_log = on_log
+        self.on_status = on_status
+        self.interval = interval
+        self.max_events = max_events
+
+        self._queue = queue.Queue()
+        self._widget = None
+        self._after_id = None
+
+    def post_log(self, message, tag='info'):
+        """Queue a log line; the timestamp is taken now, not when it is shown"""
+        self._queue.put(('log', (datetime.now().strftime("%H:%M:%S"), message, tag)))
+
+    def post_status(self, text):
+        """Queue a status bar update; only the latest one per tick is applied"""
+        self._queue.put(('status', text))
+
+    def post_call(self, function, *args):
+        """Queue a function to run on the main thread"""
+        self._queue.put(('call', (function, args)))
+
+    def start(self, widget):
+        """Start draining on the widget's event loop"""
+        self._widget = widget
+        if self._after_id is None:
+            self._after_id = widget.after(self.interval, self._tick)
+
+    def stop(self):
+        """Stop the periodic drain"""
+        if self._widget is not None and self._after_id is not None:
+            self._widget.after_cancel(self._after_id)
+        self._after_id = None
+
+    def _tick(self):
+        try:
+            self.drain()
+        finally:
+            self._after_id = self._widget.after(self.interval, self._tick)
+
+    def drain(self):
+        """Process queued events; returns the number of events handled"""
+        logs = []
+        status = None
+        handled = 0
+
+        while handled < self.max_events:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
+
+            if kind == 'log':
+                logs.append(payload)
+            elif kind == 'status':
+                status = payload
+            else:
+                # Keep calls ordered relative to the updates posted before them
+                if logs:
+                    self._flush_logs(logs)
+                    logs = []
+                if status is not None:
+                    self._flush_status(status)
+                    status = None
+                function, args = payload
+                function(*args)
+
+        if logs:
+            self._flush_logs(logs)
+        if status is not None:
+            self._flush_status(status)
+        return handled
+
+    def _flush_logs(self, logs):
+        if self.on_log:
+            self.on_log(logs)
+
+    def _flush_status(self, status):
+        if self.on_status:
+            self.on_status(status)
@@ -0,0 +1,184 @@
+"""
+Voice activity detection for captured phrases.
+
+``recognizer.listen`` ends a phrase on its energy threshold alone, so
+phrases still arrive with long silent lead-ins and tails, and background
+noise that crosses the threshold arrives as a "phrase" of its own. The
+detector looks at each phrase before it is recognized:
+
+- the audio is cut into short frames (30 ms by default) and the energy
+  (dBFS) and zero-crossing rate of every frame are computed with NumPy
+- frames louder than the noise floor by ``margin_db`` and with a
+  speech-like zero-crossing rate count as speech; hiss and clicks don't
+- runs of speech shorter than ``min_speech_ms`` are ignored, and the
+  speech that remains is padded by ``padding_ms`` on both sides, like the
+  hangover of WebRTC's VAD, so word onsets and endings are kept
+
+Leading and trailing silence is trimmed off, and phrases without any
+speech are dropped, saving a recognition call.
+"""
+import threading
+import numpy as np
+import speech_recognition as sr
+
+# Keeps log10 finite for digital silence
+_EPSILON = 1e-10
+
+
+def audio_samples(audio):
+    """Samples of AudioData as floats in [-1, 1]"""
+    data = audio.frame_data
+    width = audio.sample_width
+    if width == 3:
+        # NumPy has no 24-bit type
+        data = audio.get_raw_data(convert_width=4)
+        width = 4
+    samples = np.frombuffer(data, dtype=f'<i{width}')
+    return samples.astype(np.float32) / float(1 << (8 * width - 1))
+
+
+def frame_features(samples, frame_length):
+    """Energy (dBFS) and zero-crossing rate of each whole frame"""
+    count = len(samples) // frame_length
+    frames = samples[:count * frame_length].reshape(count, frame_length)
+    energy = 10 * np.log10(np.mean(np.square(frames, dtype=np.float64), axis=1) + _EPSILON)
+    signs = np.signbit(frames)
+    crossings = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1)
+    return energy, crossings / float(max(1, frame_length - 1))
+
+
+def speech_runs(mask, min_length):
+    """(starts, ends) of the runs of True in mask at least min_length long"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = ends - starts >= min_length
+    return starts[keep], ends[keep]
+
+
+class VadStats:
+    """Count the phrases and audio the detector let through"""
+
+    def __init__(self):
+        self.chunks = 0
+        self.dropped = 0
+        self.seconds_in = 0.0
+        self.seconds_out = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds_in, seconds_out):
+        """Record one phrase; seconds_out is 0 if it was dropped"""
+        with self._lock:
+            self.chunks += 1
+            self.seconds_in += seconds_in
+            self.seconds_out += seconds_out
+            if not seconds_out:
+                self.dropped += 1
+
+    @property
+    def calls_saved(self):
+        """Recognition calls skipped because a phrase had no speech"""
+        return self.dropped
+
+    @property
+    def seconds_saved(self):
+        """Audio that was never sent to the recognizer"""
+        with self._lock:
+            return self.seconds_in - self.seconds_out
+
+    def snapshot(self):
+        """Return the current figures as a plain dictionary"""
+        with self._lock:
+            return {
+                'chunks': self.chunks,
+                'dropped': self.dropped,
+                'seconds_in': self.seconds_in,
+                'seconds_out': self.seconds_out,
+                'seconds_saved': self.seconds_in - self.seconds_out,
+            }
+
+    def summary(self):
+        """One-line human readable summary"""
+        stats = self.snapshot()
+        share = stats['seconds_saved'] / stats['seconds_in'] if stats['seconds_in'] else 0.0
+        return (f"Voice detection skipped {stats['dropped']} of {stats['chunks']} phrases "
+                f"and trimmed {stats['seconds_saved']:.1f}s of {stats['seconds_in']:.1f}s "
+                f"of audio ({share:.0%})")
+
+
+class VoiceActivityDetector:
+    """Trim silence from phrases and drop the ones without speech.
+
+    The noise floor is the quietest tenth of each phrase's frames, or the
+    running floor of earlier phrases if that is lower (so a phrase that
+    is speech from end to end is still judged against real silence).
+    ``noise_floor_db`` seeds the running floor; ``min_energy_db`` is an
+    absolute threshold below which nothing counts as speech.
+    """
+
+    def __init__(self, frame_ms=30, margin_db=10.0, min_energy_db=-55.0, max_zcr=0.35,
+                 min_speech_ms=90, padding_ms=200, noise_floor_db=None, adaptation=0.2):
+        self.frame_ms = frame_ms
+        self.margin_db = margin_db
+        self.min_energy_db = min_energy_db
+        self.max_zcr = max_zcr
+        self.min_speech_ms = min_speech_ms
+        self.padding_ms = padding_ms
+        self.noise_floor_db = noise_floor_db
+        self.adaptation = adaptation
+        self.stats = VadStats()
+        self._lock = threading.Lock()
+
+    def _update_floor(self, quiet_db):
+        """Move the running noise floor towards this phrase's quiet level"""
+        with self._lock:
+            if self.noise_floor_db is None:
+                self.noise_floor_db = quiet_db
+            else:
+                self.noise_floor_db += self.adaptation * (quiet_db - self.noise_floor_db)
+            return self.noise_floor_db
+
+    def detect(self, samples, sample_rate):
+        """Return the (start, end) sample range holding speech, or None"""
+        frame_length = max(1, int(sample_rate * self.frame_ms / 1000))
+        energy, zcr = frame_features(samples, frame_length)
+        if not len(energy):
+            return None
+
+        quiet_db = float(np.percentile(energy, 10))
+        floor_db = min(quiet_db, self.noise_floor_db if self.noise_floor_db is not None
+                       else quiet_db)
+        self._update_floor(quiet_db)
+
+        threshold = max(floor_db + self.margin_db, self.min_energy_db)
+        speech = (energy >= threshold) & (zcr <= self.max_zcr)
+
+        min_frames = max(1, int(round(self.min_speech_ms / self.frame_ms)))
+        starts, ends = speech_runs(speech, min_frames)
+        if not len(starts):
+            return None
+
+        padding = int(round(self.padding_ms / self.frame_ms))
+        start = max(0, starts[0] - padding) * frame_length
+        end_frame = ends[-1] + padding
+        # Keep the partial frame at the end if the padding reaches it
+        end = len(samples) if end_frame >= len(energy) else end_frame * frame_length
+        return int(start), int(end)
+
+    def process(self, audio):
+        """Return audio trimmed to its speech, or None if it has none"""
+        sample_count = len(audio.frame_data) // audio.sample_width
+        seconds = sample_count / float(audio.sample_rate)
+
+        span = self.detect(audio_samples(audio), audio.sample_rate)
+        if span is None:
+            self.stats.record(seconds, 0.0)
+            return None
+
+        start, end = span
+        self.stats.record(seconds, (end - start) / float(audio.sample_rate))
+        if start == 0 and end == sample_count:
+            return audio
+        width = audio.sample_width
+        return sr.AudioData(audio.frame_data[start * width:end * width],
+                            audio.sample_rate, width)
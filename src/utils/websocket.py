@@ -0,0 +1,216 @@
+"""
+Minimal WebSocket (RFC 6455) support on asyncio streams.
+
+Just enough of the protocol for the caption server and its clients:
+the opening handshake, text/binary messages (fragmented ones are put back
+together), ping/pong and the closing handshake. No extensions or
+subprotocols. Frames from clients are masked, frames from the server are
+not, as the RFC requires.
+
+Frames are built with ``encode_frame`` so a message going to many
+connections is only encoded once (see ``WebSocket.send_frame``).
+"""
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+from urllib.parse import urlsplit
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+# Appended to the client's key in the handshake (RFC 6455 section 1.3)
+_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+class WebSocketClosed(Exception):
+    """The connection was closed; ``code`` is the close code, if any"""
+
+    def __init__(self, code=None, reason=""):
+        super().__init__(f"WebSocket closed ({code}) {reason}".strip())
+        self.code = code
+        self.reason = reason
+
+
+def accept_key(key):
+    """Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key"""
+    digest = hashlib.sha1(key.strip().encode('ascii') + _GUID).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+def _apply_mask(payload, mask):
+    """XOR payload with the 4-byte mask (masking and unmasking are the same)"""
+    if not payload:
+        return payload
+    repeated = (mask * (len(payload) // 4 + 1))[:len(payload)]
+    value = int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')
+    return value.to_bytes(len(payload), 'big')
+
+
+def encode_frame(opcode, payload=b"", mask=False, fin=True):
+    """Encode one frame; clients must set mask"""
+    header = bytearray([(0x80 if fin else 0) | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack('!H', length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack('!Q', length)
+
+    if mask:
+        key = os.urandom(4)
+        return bytes(header) + key + _apply_mask(payload, key)
+    return bytes(header) + payload
+
+
+async def read_frame(reader, max_size=1 << 20):
+    """Read one frame and return (fin, opcode, payload)"""
+    first, second = await reader.readexactly(2)
+    fin = bool(first & 0x80)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', await reader.readexactly(2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', await reader.readexactly(8))[0]
+    if length > max_size:
+        raise WebSocketClosed(1009, "Message too big")
+
+    mask = await reader.readexactly(4) if second & 0x80 else None
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = _apply_mask(payload, mask)
+    return fin, opcode, payload
+
+
+class WebSocket:
+    """One open WebSocket connection (either end)"""
+
+    def __init__(self, reader, writer, client=False, max_size=1 << 20):
+        self.reader = reader
+        self.writer = writer
+        self.client = client
+        self.max_size = max_size
+        self.closed = False
+        self.close_code = None
+
+    @property
+    def buffered(self):
+        """Bytes written but not yet sent to the peer"""
+        transport = self.writer.transport
+        return transport.get_write_buffer_size() if not transport.is_closing() else 0
+
+    def send_frame(self, frame):
+        """Queue an already encoded frame without waiting for it to be sent"""
+        if self.closed:
+            raise WebSocketClosed(self.close_code)
+        self.writer.write(frame)
+
+    async def send(self, data):
+        """Send a text (str) or binary (bytes) message"""
+        opcode = OP_TEXT if isinstance(data, str) else OP_BINARY
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.send_frame(encode_frame(opcode, data, mask=self.client))
+        await self.writer.drain()
+
+    async def recv(self):
+        """Return the next message as str or bytes; raises WebSocketClosed"""
+        message = None
+        message_opcode = None
+        while True:
+            try:
+                fin, opcode, payload = await read_frame(self.reader, self.max_size)
+            except (asyncio.IncompleteReadError, ConnectionError) as e:
+                self.abort()
+                raise WebSocketClosed(1006, "Connection lost") from e
+            except WebSocketClosed as e:
+                await self.close(e.code, e.reason)
+                raise
+
+            if opcode == OP_CLOSE:
+                code = struct.unpack('!H', payload[:2])[0] if len(payload) >= 2 else 1005
+                reason = payload[2:].decode('utf-8', 'replace')
+                await self.close(code if code != 1005 else 1000)
+                raise WebSocketClosed(code, reason)
+            if opcode == OP_PING:
+                if not self.closed:
+                    self.send_frame(encode_frame(OP_PONG, payload, mask=self.client))
+                continue
+            if opcode == OP_PONG:
+                continue
+
+            if opcode in (OP_TEXT, OP_BINARY):
+                message, message_opcode = bytearray(payload), opcode
+            elif message is not None:
+                message += payload
+            if len(message or b"") > self.max_size:
+                await self.close(1009, "Message too big")
+                raise WebSocketClosed(1009, "Message too big")
+
+            if fin and message is not None:
+                if message_opcode == OP_TEXT:
+                    return message.decode('utf-8')
+                return bytes(message)
+
+    async def close(self, code=1000, reason=""):
+        """Send a close frame (once) and close the connection"""
+        if self.closed:
+            return
+        self.closed = True
+        self.close_code = code
+        try:
+            payload = struct.pack('!H', code) + reason.encode('utf-8')
+            self.writer.write(encode_frame(OP_CLOSE, payload, mask=self.client))
+            await self.writer.drain()
+        except (ConnectionError, RuntimeError):
+            pass
+        self.abort()
+
+    def abort(self):
+        """Close the connection without a closing handshake"""
+        self.closed = True
+        if not self.writer.transport.is_closing():
+            self.writer.close()
+
+
+async def connect(url, headers=None, max_size=1 << 20):
+    """Open a client connection to a ws:// URL"""
+    parts = urlsplit(url)
+    if parts.scheme != 'ws':
+        raise ValueError(f"Only ws:// URLs are supported, not {url}")
+    host = parts.hostname
+    port = parts.port or 80
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    reader, writer = await asyncio.open_connection(host, port)
+    key = base64.b64encode(os.urandom(16)).decode('ascii')
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}:{port}", "Upgrade: websocket",
+             "Connection: Upgrade", f"Sec-WebSocket-Key: {key}", "Sec-WebSocket-Version: 13"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1'))
+    await writer.drain()
+
+    response = await reader.readuntil(b"\r\n\r\n")
+    status_line, *header_lines = response.decode('latin-1').split("\r\n")
+    received = {}
+    for line in header_lines:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            received[name.strip().lower()] = value.strip()
+    if status_line.split(" ")[1:2] != ["101"] or \
+            received.get('sec-websocket-accept') != accept_key(key):
+        writer.close()
+        raise ConnectionError(f"WebSocket handshake failed: {status_line}")
+    return WebSocket(reader, writer, client=True, max_size=max_size)
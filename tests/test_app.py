@@ -1,11 +1,12 @@
 import unittest
 import sys
 import os
+import re
 
 # Add parent directory to path so we can import our module
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from utils.formatting import TextFormatter
+from src.utils.formatting import TextFormatter, compile_filler_pattern
 
 class TestTextFormatter(unittest.TestCase):
     def setUp(self):
@@ -24,6 +25,33 @@ class TestTextFormatter(unittest.TestCase):
         result2 = self.formatter.remove_filler_words(text, custom_fillers)
         self.assertEqual(result2, expected2)
     
+    def test_remove_filler_words_matches_per_word_substitution(self):
+        def remove_one_by_one(text, words):
+            for word in words:
+                text = re.sub(r'\b' + re.escape(word) + r'\b', '', text, flags=re.IGNORECASE)
+            text = self.formatter.remove_stranded_commas(text)
+            return re.sub(r'\s+', ' ', text).strip()
+        
+        fillers = self.formatter.default_filler_words + [f"filler{i}" for i in range(100)]
+        texts = [
+            "Um so I mean the report is, like, basically done. Right?",
+            "We sort of agreed, you know, to kind of move filler42 to Monday.",
+            "Okay hmm err LITERALLY Actually uhh umm likely sorted",
+            "filler7 filler70 filler700 filler",
+            "",
+        ]
+        for text in texts:
+            self.assertEqual(self.formatter.remove_filler_words(text, fillers),
+                             remove_one_by_one(text, fillers))
+    
+    def test_remove_filler_words_prefers_longest(self):
+        result = self.formatter.remove_filler_words("I agree you know with you", ["you", "you know"])
+        self.assertEqual(result, "I agree with")
+    
+    def test_filler_pattern_is_cached(self):
+        fillers = ("um", "uh", "you know")
+        self.assertIs(compile_filler_pattern(fillers), compile_filler_pattern(tuple(fillers)))
+    
     def test_fix_punctuation(self):
         # Test adding period
         text1 = "This is a test"
@@ -51,6 +79,24 @@ class TestTextFormatter(unittest.TestCase):
         expected2 = "I went to France on Monday in January."
         self.assertEqual(self.formatter.fix_capitalization(text2), expected2)
     
+    def test_fix_capitalization_glossary(self):
+        self.formatter.add_proper_nouns(["iPhone", "McDonald's", "New York", "New York City"])
+        
+        text = "she moved from the united states to new york city. the iphone at mcdonald's in the uk."
+        expected = "She moved from the United States to New York City. The iPhone at McDonald's in the UK."
+        self.assertEqual(self.formatter.fix_capitalization(text), expected)
+        
+        # Partial multi-word entries fall back to the shorter match
+        self.assertEqual(self.formatter.fix_capitalization("we met in new york today"),
+                         "We met in New York today")
+    
+    def test_fix_capitalization_large_glossary(self):
+        self.formatter.add_proper_nouns([f"Client{i} Holdings" for i in range(5000)])
+        
+        text = "call client4321 holdings about client99 on friday"
+        expected = "Call Client4321 Holdings about client99 on Friday"
+        self.assertEqual(self.formatter.fix_capitalization(text), expected)
+    
     def test_format_text(self):
         # Test full formatting
         text = "um, this is, like, a test sentence on monday. i hope it works"
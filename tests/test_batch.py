@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+import wave
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import speech_recognition as sr
+from functools import partial
+from src.utils.batch import (BatchTranscriber, find_audio_files, plan_chunks, read_chunks,
+                             recognize_backend)
+from src.utils.transcript_model import Transcript
+
+SAMPLE_RATE = 8000
+
+
+def write_wav(path, seconds):
+    """Write a silent 16-bit mono WAV file"""
+    with wave.open(path, 'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(SAMPLE_RATE)
+        file.writeframes(b'\x00\x00' * int(seconds * SAMPLE_RATE))
+
+
+def stub_recognize(audio, language):
+    """Names the chunk by its length; later chunks finish first"""
+    seconds = len(audio.frame_data) / (audio.sample_rate * audio.sample_width)
+    if seconds < 0.5:
+        raise sr.UnknownValueError()
+    time.sleep(max(0.0, 0.05 - seconds / 100))
+    return f"um chunk of {seconds:.0f} seconds in {language}"
+
+
+def stub_translate(text, source_lang, target_lang):
+    return text.replace(source_lang, target_lang)
+
+
+class TestBatchTranscriber(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.tmpdir.name, "calls")
+        self.output_dir = os.path.join(self.tmpdir.name, "transcripts")
+        os.makedirs(self.input_dir)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_plan_chunks(self):
+        self.assertEqual(plan_chunks(25, 10), [(0.0, 10), (10.0, 10), (20.0, 5)])
+        self.assertEqual(plan_chunks(0, 10), [])
+
+    def test_read_chunks_covers_the_file_once(self):
+        path = os.path.join(self.input_dir, "ramp.wav")
+        samples = b''.join(i.to_bytes(2, 'little') for i in range(25 * SAMPLE_RATE // 10))
+        with wave.open(path, 'wb') as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(SAMPLE_RATE)
+            file.writeframes(samples)
+
+        with sr.AudioFile(path) as source:
+            chunks = list(read_chunks(source, plan_chunks(source.DURATION, 1)))
+        self.assertEqual([len(chunk.frame_data) for chunk in chunks],
+                         [2 * SAMPLE_RATE, 2 * SAMPLE_RATE, SAMPLE_RATE])
+        self.assertEqual(b''.join(chunk.frame_data for chunk in chunks), samples)
+
+    def test_find_audio_files(self):
+        for name in ("b.wav", "a.FLAC", "c.aiff", "notes.txt"):
+            open(os.path.join(self.input_dir, name), 'w').close()
+        names = [os.path.basename(path) for path in find_audio_files(self.input_dir)]
+        self.assertEqual(names, ["a.FLAC", "b.wav", "c.aiff"])
+
+    def test_transcribes_directory_in_order(self):
+        write_wav(os.path.join(self.input_dir, "first.wav"), 10)
+        write_wav(os.path.join(self.input_dir, "second.wav"), 4.25)
+
+        transcriber = BatchTranscriber(recognize=stub_recognize, translate=stub_translate,
+                                       language='en', target_language='fr',
+                                       chunk_seconds=4, workers=2)
+        report = transcriber.transcribe_directory(self.input_dir, self.output_dir)
+
+        self.assertEqual(report.files, 2)
+        self.assertEqual(report.chunks, 5)
+        self.assertEqual(report.failed_chunks, 0)
+        self.assertAlmostEqual(report.audio_seconds, 14.25)
+        self.assertGreater(report.files_per_second, 0)
+        self.assertGreater(report.audio_seconds_per_second, 0)
+
+        with open(os.path.join(self.output_dir, "professional_transcript_first.txt"),
+                  encoding='utf-8') as file:
+            content = file.read()
+        self.assertEqual(content,
+                         "[00:00:00] Recognized: um chunk of 4 seconds in en\n"
+                         "[00:00:00] Chunk of 4 seconds in fr.\n\n"
+                         "[00:00:04] Recognized: um chunk of 4 seconds in en\n"
+                         "[00:00:04] Chunk of 4 seconds in fr.\n\n"
+                         "[00:00:08] Recognized: um chunk of 2 seconds in en\n"
+                         "[00:00:08] Chunk of 2 seconds in fr.\n\n")
+
+        # Chunk timings go to the segment file beside the transcript
+        segments = Transcript.load(os.path.join(self.output_dir, "professional_transcript_first.seg"))
+        self.assertEqual([segment.end - segment.start for segment in segments], [4, 4, 2])
+        self.assertEqual(segments[2].translated, "Chunk of 2 seconds in fr.")
+        self.assertEqual(segments[2].target_language, 'fr')
+
+        # The unintelligible quarter-second tail is skipped
+        with open(os.path.join(self.output_dir, "professional_transcript_second.txt"),
+                  encoding='utf-8') as file:
+            self.assertEqual(file.read().count("Recognized:"), 1)
+
+    def test_named_backend_in_worker_processes(self):
+        write_wav(os.path.join(self.input_dir, "call.wav"), 5)
+
+        transcriber = BatchTranscriber(recognize=partial(recognize_backend, 'stub'),
+                                       language='es', chunk_seconds=2, workers=2,
+                                       fix_capitalization=False, fix_punctuation=False)
+        transcriber.transcribe_directory(self.input_dir, self.output_dir)
+
+        with open(os.path.join(self.output_dir, "professional_transcript_call.txt"),
+                  encoding='utf-8') as file:
+            self.assertEqual(file.read().count("seconds of es"), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+import numpy as np
+import speech_recognition as sr
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.channels import MultiChannelMicrophone, split_channels
+
+
+class TestMultiChannelMicrophone(unittest.TestCase):
+    def test_split_channels(self):
+        data = np.array([1, -1, 2, -2, 3, -3], dtype='<i2').tobytes()
+        left, right = split_channels(data, 2)
+        self.assertEqual(np.frombuffer(left, dtype='<i2').tolist(), [1, 2, 3])
+        self.assertEqual(np.frombuffer(right, dtype='<i2').tolist(), [-1, -2, -3])
+
+    def test_channels_work_with_recognizer_listen(self):
+        rate = 16000
+        mic = MultiChannelMicrophone(channels=2, sample_rate=rate, names=["Left"])
+        self.assertEqual([source.name for source in mic.sources], ["Left", "Channel 2"])
+
+        # Speech-level tone on the left channel only, between silences
+        t = np.arange(rate) / rate
+        tone = (np.sin(2 * np.pi * 220 * t) * 8000).astype('<i2')
+        left = np.concatenate([np.zeros(rate // 2, '<i2'), tone, np.zeros(rate, '<i2')])
+        interleaved = np.stack([left, np.zeros_like(left)], axis=1)
+        mic.feed(interleaved.tobytes())
+        for source in mic.sources:
+            source.stream.close()
+
+        recognizer = sr.Recognizer()
+        recognizer.dynamic_energy_threshold = False
+        recognizer.energy_threshold = 300
+        audio = recognizer.listen(mic.sources[0])
+        samples = np.frombuffer(audio.get_raw_data(), dtype='<i2')
+        self.assertGreater(np.abs(samples).max(), 7000)
+        with self.assertRaises(sr.WaitTimeoutError):
+            recognizer.listen(mic.sources[1], timeout=0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,413 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+import numpy as np
+import speech_recognition as sr
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.engine import FairQueue, InterruptibleStream, TranscriptionEngine
+from src.utils.interim import PhraseTap
+
+
+class FakeMicrophone:
+    """Hands out a fixed number of phrases, then behaves like silence"""
+    def __init__(self, phrases, interval=0.01):
+        self.phrases = list(phrases)
+        self.interval = interval
+
+    def listen(self):
+        time.sleep(self.interval)
+        if not self.phrases:
+            return None
+        return self.phrases.pop(0)
+
+
+class FakeAudio:
+    """Audio stand-in with a label and a length (100 one-byte samples per second)"""
+    def __init__(self, label, seconds):
+        self.label = label
+        self.frame_data = b'\0' * int(seconds * 100)
+        self.sample_rate = 100
+        self.sample_width = 1
+
+
+class ScriptedMicrophone:
+    """Returns each (delay, label, seconds) phrase after its delay, then silence"""
+    def __init__(self, script):
+        self.script = list(script)
+        self.captured_at = []
+
+    def listen(self):
+        if not self.script:
+            time.sleep(0.01)
+            return None
+        delay, label, seconds = self.script.pop(0)
+        time.sleep(delay)
+        self.captured_at.append(time.perf_counter())
+        return FakeAudio(label, seconds)
+
+
+def recognize_label(audio):
+    if audio.label == "mumble":
+        raise sr.UnknownValueError()
+    return audio.label, 'en'
+
+
+class EndlessStream:
+    """Audio that never falls silent: read() always returns a chunk"""
+    def __init__(self):
+        self.reads = 0
+
+    def read(self, size):
+        self.reads += 1
+        time.sleep(0.01)
+        return b"\0" * size
+
+
+class FakeSource:
+    def __init__(self):
+        self.stream = EndlessStream()
+
+
+def long_listener(source, phrases=()):
+    """listen() that returns the given phrases, then records forever like a long phrase"""
+    phrases = list(phrases)
+    state = {'listening': False}
+
+    def listen():
+        state['listening'] = True
+        try:
+            source.stream.read(1024)
+            if phrases:
+                return phrases.pop(0)
+            while True:
+                source.stream.read(1024)
+        finally:
+            state['listening'] = False
+    return listen, state
+
+
+def recognize(audio):
+    return f"text {audio}", 'es'
+
+
+class SpeakingSource:
+    """Source whose stream is speech, read at 20x realtime"""
+    SAMPLE_RATE = 16000
+    SAMPLE_WIDTH = 2
+
+    def __init__(self):
+        samples = 0.3 * np.sin(2 * np.pi * 220 * np.arange(1600) / 16000)
+        self.chunk = (samples * 32767).astype('<i2').tobytes()
+        self.stream = self
+
+    def read(self, size):
+        time.sleep(0.005)
+        return self.chunk
+
+
+class QuietRecognizer:
+    energy_threshold = 300
+
+
+class TestTranscriptionEngine(unittest.TestCase):
+    def collect(self, engine, count=None):
+        """Run the engine, stopping once count segments came out"""
+        async def run():
+            segments = []
+            async for segment in engine.segments():
+                segments.append(segment)
+                if count is not None and len(segments) == count:
+                    engine.stop()
+            return segments
+        return asyncio.run(run())
+
+    def test_segments_in_capture_order(self):
+        engine = TranscriptionEngine(
+            recognize=lambda audio: (time.sleep(0.05 * (5 - int(audio))), recognize(audio))[1],
+            translate=lambda text, source_lang: text.upper(),
+            format_text=lambda text: text + ".",
+            recognition_workers=3)
+        engine.add_stream(None, FakeMicrophone([str(i) for i in range(5)]).listen)
+
+        segments = self.collect(engine, count=5)
+        self.assertEqual([s.formatted for s in segments], [f"TEXT {i}." for i in range(5)])
+        self.assertEqual(engine.get_stats()['streams'][None]['committed'], 5)
+
+    def test_slow_consumer_holds_back_capture(self):
+        mic = FakeMicrophone([str(i) for i in range(200)], interval=0.001)
+        engine = TranscriptionEngine(recognize=recognize, queue_size=2)
+        engine.add_stream(None, mic.listen)
+
+        async def run():
+            async for segment in engine.segments():
+                await asyncio.sleep(0.3)
+                captured = engine.streams[0].captured
+                engine.cancel()
+            return captured
+
+        captured = asyncio.run(run())
+        # Bounded by the queues and workers, not by how fast audio arrives
+        self.assertLess(captured, 30)
+        self.assertGreater(len(mic.phrases), 150)
+
+    def test_stop_interrupts_listen_and_drains(self):
+        source = FakeSource()
+        engine = TranscriptionEngine(recognize=lambda audio: (time.sleep(0.3), recognize(audio))[1])
+        engine.wrap_source(source)
+        self.assertIsInstance(source.stream, InterruptibleStream)
+        listen, state = long_listener(source, phrases=["0"])
+        engine.add_stream(None, listen)
+
+        async def run():
+            segments = []
+            asyncio.get_running_loop().call_later(0.1, engine.stop)
+            start = time.monotonic()
+            async for segment in engine.segments():
+                segments.append(segment)
+            return segments, time.monotonic() - start
+
+        segments, elapsed = asyncio.run(run())
+        # The phrase captured before the stop is still recognized
+        self.assertEqual([s.text for s in segments], ["text 0"])
+        self.assertLess(elapsed, 1.0)
+        self.assertFalse(state['listening'])
+
+    def test_cancel_abandons_work_in_flight(self):
+        source = FakeSource()
+        engine = TranscriptionEngine(recognize=lambda audio: (time.sleep(2), recognize(audio))[1])
+        engine.wrap_source(source)
+        listen, state = long_listener(source, phrases=["0"])
+        engine.add_stream(None, listen)
+
+        def cancel_from_another_thread():
+            time.sleep(0.2)
+            engine.cancel()
+
+        threading.Thread(target=cancel_from_another_thread).start()
+        start = time.monotonic()
+        segments = self.collect(engine)
+        self.assertEqual(segments, [])
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertTrue(engine.cancelled)
+
+        time.sleep(0.1)
+        self.assertFalse(state['listening'])
+
+    def test_leaving_the_loop_cancels_the_engine(self):
+        engine = TranscriptionEngine(recognize=recognize)
+        engine.add_stream(None, FakeMicrophone([str(i) for i in range(50)]).listen)
+
+        async def run():
+            async for segment in engine.segments():
+                break
+            # Let the cancelled tasks finish
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+        self.assertFalse(engine.is_running)
+        self.assertTrue(engine.interrupted.is_set())
+        self.assertTrue(all(task.done() for task in engine._tasks))
+
+    def test_streams_merged_into_one_timeline(self):
+        engine = TranscriptionEngine(recognize=recognize, max_delay=1.0)
+        engine.add_stream("Alice", FakeMicrophone(["a0", "a1"], interval=0.05).listen)
+        engine.add_stream("Bob", FakeMicrophone(["b0", "b1"], interval=0.05).listen)
+
+        segments = self.collect(engine, count=4)
+        self.assertEqual(sorted(s.text for s in segments),
+                         ["text a0", "text a1", "text b0", "text b1"])
+        starts = [s.started_at for s in segments]
+        self.assertEqual(starts, sorted(starts))
+        self.assertEqual({s.stream for s in segments}, {"Alice", "Bob"})
+
+    def test_stream_with_its_own_recognize(self):
+        engine = TranscriptionEngine(recognize=recognize, max_delay=1.0)
+        engine.add_stream("Alice", FakeMicrophone(["a0"]).listen)
+        engine.add_stream("Bob", FakeMicrophone(["b0"]).listen,
+                          recognize=lambda audio: (f"texte {audio}", 'fr'))
+
+        segments = self.collect(engine, count=2)
+        self.assertEqual({(s.stream, s.text, s.source_lang) for s in segments},
+                         {("Alice", "text a0", 'es'), ("Bob", "texte b0", 'fr')})
+
+    def test_capture_never_blocks_on_slow_stages(self):
+        # The staged pipeline of user-001: with a recognizer and translator
+        # that sleep, the microphone keeps capturing, segments still come
+        # out in capture order and the stages report queue depth and latency
+        mic = ScriptedMicrophone([(0.01, str(i), 0.1) for i in range(10)])
+        engine = TranscriptionEngine(
+            recognize=lambda audio: (time.sleep(0.2), recognize_label(audio))[1],
+            translate=lambda text, source_lang: (time.sleep(0.2), text.upper())[1])
+        engine.add_stream(None, mic.listen)
+
+        segments = self.collect(engine, count=10)
+        # Ten phrases at 10ms each are captured long before a single
+        # recognition + translation (400ms) could have finished serially
+        self.assertLess(mic.captured_at[-1] - mic.captured_at[0], 0.4)
+        self.assertLess(engine.stats['capture'].max_time, 0.05)
+        self.assertEqual([s.sequence for s in segments], list(range(10)))
+        self.assertEqual([s.translated for s in segments], [str(i) for i in range(10)])
+
+        stats = engine.get_stats()
+        self.assertEqual(set(stats['queue_depth']), {'audio', 'text', 'result', 'output', 'commit'})
+        self.assertEqual(sum(stats['queue_depth'].values()), 0)
+        self.assertEqual(stats['latency']['recognition']['count'], 10)
+        self.assertGreaterEqual(stats['latency']['translation']['average'], 0.2)
+
+    def test_failed_recognition_does_not_stall_order(self):
+        errors = []
+        engine = TranscriptionEngine(
+            recognize=lambda audio: recognize_label(audio) + (0.75,),
+            on_error=lambda segment, error: errors.append(error))
+        engine.add_stream(None, ScriptedMicrophone(
+            [(0.0, "0", 0.1), (0.0, "mumble", 0.1), (0.0, "2", 0.1)]).listen)
+
+        segments = self.collect(engine, count=2)
+        self.assertEqual([s.text for s in segments], ["0", "2"])
+        self.assertEqual([s.confidence for s in segments], [0.75, 0.75])
+        self.assertEqual(len(errors), 1)
+
+        stats = engine.get_stats()
+        self.assertEqual(sum(stats['queue_depth'].values()), 0)
+        self.assertEqual(stats['latency']['recognition']['count'], 3)
+        self.assertGreater(stats['latency']['end_to_end']['average'], 0)
+        self.assertEqual(stats['streams'][None]['errors'], 1)
+
+    def test_several_target_languages(self):
+        engine = TranscriptionEngine(
+            recognize=lambda audio: (f"text {audio}", 'es'),
+            translate=lambda text, source_lang: {'en': text.upper(), 'es': None, 'fr': "texte"},
+            format_text=lambda text: text + ".")
+        engine.add_stream(None, FakeMicrophone(["0"]).listen)
+
+        segment = self.collect(engine, count=1)[0]
+        self.assertEqual(segment.translated, "TEXT 0")
+        self.assertEqual(segment.formatted, "TEXT 0.")
+        self.assertEqual(segment.translations, {'en': "TEXT 0", 'es': None, 'fr': "texte"})
+        self.assertEqual(segment.formatted_translations,
+                         {'en': "TEXT 0.", 'es': "text 0.", 'fr': "texte."})
+
+    def test_merged_timeline_is_ordered_by_phrase_start(self):
+        # The chair's long phrase started first but ends (and is recognized) last
+        chair = ScriptedMicrophone([(0.4, "chair long", 0.35)])
+        guest = ScriptedMicrophone([(0.1, "guest one", 0.02), (0.1, "guest two", 0.02)])
+        delays = {"chair long": 0.2, "guest one": 0.01, "guest two": 0.01}
+        engine = TranscriptionEngine(
+            recognize=lambda audio: (time.sleep(delays[audio.label]), recognize_label(audio))[1])
+        engine.add_stream('Chair', chair.listen)
+        engine.add_stream('Guest', guest.listen)
+
+        segments = self.collect(engine, count=3)
+        self.assertEqual([s.text for s in segments], ["chair long", "guest one", "guest two"])
+        self.assertEqual([s.stream for s in segments], ["Chair", "Guest", "Guest"])
+
+    def test_busy_stream_does_not_starve_others(self):
+        order = []
+
+        def recognize_slowly(audio):
+            time.sleep(0.02)
+            order.append(audio.label)
+            return recognize_label(audio)
+
+        engine = TranscriptionEngine(recognize=recognize_slowly, recognition_workers=1,
+                                     max_delay=0.5)
+        engine.add_stream('Busy', ScriptedMicrophone(
+            [(0.0, f"busy {i}", 0.01) for i in range(20)]).listen)
+        engine.add_stream('Quiet', ScriptedMicrophone(
+            [(0.01, f"quiet {i}", 0.01) for i in range(3)]).listen)
+
+        self.collect(engine, count=23)
+        # Round-robin: the quiet speaker is served within the first few calls
+        self.assertLess(max(order.index(f"quiet {i}") for i in range(3)), 10)
+        stats = engine.get_stats()
+        self.assertEqual(stats['streams']['Busy']['committed'], 20)
+        self.assertEqual(stats['streams']['Quiet']['captured'], 3)
+
+    def test_duplicate_stream_names(self):
+        engine = TranscriptionEngine(recognize=recognize)
+        engine.add_stream('A', lambda: None)
+        with self.assertRaises(ValueError):
+            engine.add_stream('A', lambda: None)
+
+    def test_interim_results_until_the_final_segment(self):
+        source = SpeakingSource()
+        tap = PhraseTap.attach(source, QuietRecognizer())
+        phrases = ["0", "1"]
+
+        def listen():
+            # A phrase is 40 chunks (4 s of audio) long
+            for _ in range(40):
+                source.stream.read(1600)
+            return phrases.pop(0) if phrases else None
+
+        events = []
+        engine = TranscriptionEngine(
+            recognize=lambda audio: (time.sleep(0.2), recognize(audio))[1],
+            interim_recognize=lambda audio: (f"{len(audio.frame_data)} bytes", None),
+            on_interim=lambda result: events.append(('interim', result.phrase, result.text)),
+            interim_interval=0.03)
+        engine.wrap_source(source)
+        engine.add_stream(None, listen, tap)
+
+        async def run():
+            async for segment in engine.segments():
+                events.append(('final', segment.phrase, segment.text))
+                if segment.text == "text 1":
+                    engine.stop()
+
+        asyncio.run(run())
+        finals = [event for event in events if event[0] == 'final']
+        self.assertEqual(finals, [('final', 1, "text 0"), ('final', 2, "text 1")])
+        # Every phrase had interim results before its final segment
+        for kind, phrase, text in finals:
+            interim = [event for event in events[:events.index((kind, phrase, text))]
+                       if event[:2] == ('interim', phrase)]
+            self.assertTrue(interim)
+            self.assertTrue(all(event[2].endswith("bytes") for event in interim))
+
+        latency = engine.get_stats()['caption_latency']
+        self.assertEqual(latency['final_text']['count'], 2)
+        # The stop cuts a third phrase short; interim results it had are taken down
+        shown = {phrase for kind, phrase, text in events if kind == 'interim' and text}
+        self.assertEqual(latency['first_text']['count'], len(shown))
+        if 3 in shown:
+            self.assertEqual(events[-1], ('interim', 3, None))
+        self.assertLess(latency['first_text']['max'], latency['final_text']['max'])
+
+
+class TestFairQueue(unittest.TestCase):
+    def test_round_robin_across_keys(self):
+        async def run():
+            fair = FairQueue()
+            for i in range(3):
+                await fair.put('a', f"a{i}")
+            await fair.put('b', "b0")
+            await fair.put('c', "c0")
+            items = [await fair.get() for _ in range(5)]
+            return items, fair.qsize()
+
+        self.assertEqual(asyncio.run(run()), (["a0", "b0", "c0", "a1", "a2"], 0))
+
+    def test_put_waits_while_full(self):
+        async def run():
+            fair = FairQueue(maxsize=2)
+            await fair.put('a', 1)
+            await fair.put('b', 2)
+            blocked = asyncio.ensure_future(fair.put('a', 3))
+            await asyncio.sleep(0.05)
+            waiting = not blocked.done()
+            await fair.get()
+            await asyncio.wait_for(blocked, 1)
+            return waiting, fair.qsize()
+
+        self.assertEqual(asyncio.run(run()), (True, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
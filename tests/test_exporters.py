@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import zipfile
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.exporters import (export_segments, export_transcript, format_timestamp,
+                                 guess_format, iter_srt, iter_vtt, main)
+from src.utils.transcript_model import Segment, SegmentWriter
+
+
+def sample_segments():
+    return [
+        Segment(1000.0, 1002.5, "hola a todos", "Hello everyone", 'es', 'en', 0.9),
+        Segment(1003.0, 1004.25, "adiós", "Goodbye --> <see you> & bye", 'es', 'en'),
+        Segment(3700.0, 3701.0, "fin", None, 'es'),
+    ]
+
+
+class TestExporters(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def output(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_format_timestamp(self):
+        self.assertEqual(format_timestamp(0), "00:00:00,000")
+        self.assertEqual(format_timestamp(3723.4567), "01:02:03,457")
+        self.assertEqual(format_timestamp(61.5, '.'), "00:01:01.500")
+
+    def test_srt(self):
+        srt = ''.join(iter_srt(sample_segments()))
+        self.assertTrue(srt.startswith("1\n00:00:00,000 --> 00:00:02,500\nHello everyone\n\n"))
+        self.assertIn("3\n00:45:00,000 --> 00:45:01,000\nfin\n\n", srt)
+
+        both = ''.join(iter_srt(sample_segments(), origin=990.0, content='both'))
+        self.assertIn("00:00:10,000 --> 00:00:12,500\nhola a todos\nHello everyone\n", both)
+
+    def test_vtt_escapes_cue_text(self):
+        vtt = ''.join(iter_vtt(sample_segments()))
+        self.assertTrue(vtt.startswith("WEBVTT\n\n00:00:00.000 --> 00:00:02.500\n"))
+        self.assertIn("Goodbye --&gt; &lt;see you&gt; &amp; bye\n", vtt)
+
+    def test_speaker_labels(self):
+        segments = [Segment(0.0, 1.0, "hi", None, 'en', speaker="Chair"),
+                    Segment(1.0, 2.0, "hello", None, 'en', speaker="Guest <2>")]
+        self.assertIn("\nChair: hi\n", ''.join(iter_srt(segments)))
+        self.assertIn("\n<v Guest &lt;2&gt;>hello\n", ''.join(iter_vtt(segments)))
+
+        path = self.output("speakers.jsonl")
+        export_segments(segments, path)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual([json.loads(line)['speaker'] for line in file], ["Chair", "Guest <2>"])
+
+    def test_jsonl(self):
+        path = self.output("out.jsonl")
+        self.assertEqual(export_segments(sample_segments(), path), 3)
+        with open(path, encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(rows[0]['original'], "hola a todos")
+        self.assertEqual(rows[1]['start'], 3.0)
+        self.assertIsNone(rows[2]['translated'])
+        self.assertEqual(rows[2]['source_language'], 'es')
+
+    def test_docx_is_a_valid_package(self):
+        path = self.output("out.docx")
+        export_segments(sample_segments(), path, metadata={'Target Language': 'English'})
+        with zipfile.ZipFile(path) as archive:
+            self.assertIn('[Content_Types].xml', archive.namelist())
+            document = archive.read('word/document.xml').decode('utf-8')
+        self.assertIn("Target Language: English", document)
+        self.assertIn("Goodbye --&gt; &lt;see you&gt; &amp; bye", document)
+
+    def test_guess_format(self):
+        self.assertEqual(guess_format("a.SRT"), 'srt')
+        self.assertEqual(guess_format("a.json"), 'jsonl')
+        with self.assertRaises(ValueError):
+            guess_format("a.pdf")
+
+    def test_export_is_streamed(self):
+        def generate():
+            for i in range(20000):
+                yield Segment(i * 2.0, i * 2.0 + 1.5, f"frase {i}", f"phrase {i}", 'es', 'en')
+
+        # A generator can only be consumed once, so this also checks that
+        # nothing is collected into a list first
+        path = self.output("long.srt")
+        self.assertEqual(export_segments(generate(), path), 20000)
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual(file.read().count(" --> "), 20000)
+
+    def test_headless_export_from_transcript_path(self):
+        transcript = self.output("professional_transcript_x.txt")
+        with SegmentWriter(self.output("professional_transcript_x.seg")) as writer:
+            for segment in sample_segments():
+                writer.append(segment)
+
+        self.assertEqual(export_transcript(transcript, self.output("x.vtt")), 3)
+        with open(os.devnull, 'w') as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                self.assertEqual(main([transcript, self.output("x.srt")]), 0)
+                self.assertEqual(main([self.output("missing.txt"), self.output("y.srt")]), 1)
+            finally:
+                sys.stdout = stdout
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+from datetime import datetime
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.history_index import HistoryIndex, build_match_query
+
+
+class TestHistoryIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.index = HistoryIndex(os.path.join(self.tmpdir.name, "history.db"))
+
+    def tearDown(self):
+        self.index.close()
+        self.tmpdir.cleanup()
+
+    def transcript(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_incremental_updates(self):
+        path = self.transcript("professional_transcript_a.txt")
+        self.index.register(path, started=1000.0, target_language='en')
+        self.index.record_segment(path, 40, 'es', ended=1010.0)
+        self.index.record_segment(path, 60, 'fr', ended=1030.0)
+        self.index.record_segment(path, 10, 'es', ended=1020.0)
+
+        record = self.index.get(path)
+        self.assertEqual(record.segments, 3)
+        self.assertEqual(record.size, 110)
+        self.assertEqual(record.duration, 30.0)
+        self.assertEqual(record.source_languages, ['es', 'fr'])
+        self.assertEqual(record.target_language, 'en')
+        self.assertIn("3 segments", record.display_name)
+
+    def test_unknown_path_is_ignored(self):
+        self.assertFalse(self.index.record_segment(self.transcript("missing.txt"), 10))
+
+    def test_paging_newest_first(self):
+        for i in range(250):
+            self.index.register(self.transcript(f"t{i:03d}.txt"), started=float(i))
+
+        self.assertEqual(self.index.count(), 250)
+        first = self.index.page(0, 100)
+        last = self.index.page(200, 100)
+        self.assertEqual(len(first), 100)
+        self.assertEqual(os.path.basename(first[0].path), "t249.txt")
+        self.assertEqual(len(last), 50)
+        self.assertEqual(os.path.basename(last[-1].path), "t000.txt")
+
+    def test_remove(self):
+        path = self.transcript("t.txt")
+        self.index.register(path)
+        self.index.remove(path)
+        self.assertIsNone(self.index.get(path))
+        self.assertEqual(self.index.count(), 0)
+
+    def test_import_directory(self):
+        name = "professional_transcript_20240102_030405.txt"
+        with open(self.transcript(name), 'w', encoding='utf-8') as file:
+            file.write("[03:04:05] Recognized: hola\n[03:04:05] Hello.\n\n"
+                       "[03:04:09] Recognized: adios\n[03:04:09] Goodbye.\n\n")
+        open(self.transcript("notes.txt"), 'w').close()
+
+        self.assertEqual(self.index.import_directory(self.tmpdir.name), 1)
+        self.assertEqual(self.index.import_directory(self.tmpdir.name), 0)
+
+        record = self.index.get(self.transcript(name))
+        self.assertEqual(record.segments, 2)
+        self.assertEqual(datetime.fromtimestamp(record.started), datetime(2024, 1, 2, 3, 4, 5))
+        self.assertEqual(len(self.index.search("goodbye")), 1)
+    
+    def add_transcript(self, name, started, segments):
+        path = self.transcript(name)
+        self.index.register(path, started=started)
+        for timestamp, text, language in segments:
+            self.index.record_segment(path, len(text), language, text=text, timestamp=timestamp)
+        return path
+    
+    def test_build_match_query(self):
+        self.assertEqual(build_match_query('budget'), '"budget"')
+        self.assertEqual(build_match_query('"next quarter" rev*'), '"next quarter" "rev"*')
+        self.assertEqual(build_match_query('NOT OR) "un"closed'), '"NOT" "OR)" "un" "closed"')
+        self.assertEqual(build_match_query('  * "" '), '')
+    
+    def test_search_phrase_prefix_and_filters(self):
+        monday = datetime(2024, 5, 6).timestamp()
+        friday = datetime(2024, 5, 10).timestamp()
+        self.add_transcript("a.txt", monday, [
+            ("09:00:01", "We reviewed the quarterly budget", 'en'),
+            ("09:00:09", "Revisamos el presupuesto", 'es'),
+        ])
+        self.add_transcript("b.txt", friday, [
+            ("15:30:00", "The budget for next quarter is approved", 'en'),
+        ])
+        
+        self.assertEqual(len(self.index.search("budget")), 2)
+        self.assertEqual(len(self.index.search('"next quarter"')), 1)
+        self.assertEqual(len(self.index.search('"quarter budget"')), 0)
+        self.assertEqual(len(self.index.search("quart*")), 2)
+        self.assertEqual(len(self.index.search("presupuesto", language='en')), 0)
+        self.assertEqual(len(self.index.search("presupuesto", language='es')), 1)
+        
+        hits = self.index.search("budget", since=datetime(2024, 5, 8).timestamp())
+        self.assertEqual([os.path.basename(hit.path) for hit in hits], ["b.txt"])
+        self.assertEqual(hits[0].timestamp, "15:30:00")
+        self.assertIn("[budget]", hits[0].snippet)
+        
+        hits = self.index.search("budget", until=datetime(2024, 5, 8).timestamp())
+        self.assertEqual([os.path.basename(hit.path) for hit in hits], ["a.txt"])
+    
+    def test_remove_and_rewrite_clear_search_entries(self):
+        path = self.add_transcript("a.txt", 1.0, [("00:00:01", "hello world", 'en')])
+        self.index.register(path)
+        self.assertEqual(self.index.search("hello"), [])
+        
+        path = self.add_transcript("b.txt", 2.0, [("00:00:01", "hello again", 'en')])
+        self.index.remove(path)
+        self.assertEqual(self.index.search("hello"), [])
+    
+    def test_search_is_fast_on_large_history(self):
+        words = ["budget", "client", "roadmap", "hiring", "launch", "invoice", "travel"]
+        for i in range(10000):
+            self.index.register(self.transcript(f"t{i}.txt"), started=float(i))
+        self.index.index_segments(self.transcript("t0.txt"), [])
+        for i in range(10000):
+            self.index.index_segments(self.transcript(f"t{i}.txt"), [
+                ("00:00:01", f"meeting {i} about the {words[i % 7]} and {words[(i * 3) % 7]}", 'en'),
+                ("00:00:05", f"follow up number {i}", 'en'),
+            ])
+        
+        start = time.perf_counter()
+        hits = self.index.search('"about the roadmap"', limit=20)
+        elapsed = time.perf_counter() - start
+        
+        self.assertEqual(len(hits), 20)
+        self.assertLess(elapsed, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import numpy as np
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.interim import InterimResult, PhraseTap
+
+RATE = 16000
+CHUNK = 1600
+
+
+class ChunkStream:
+    """Hands out the given chunks in order"""
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.closed = False
+
+    def read(self, size):
+        return self.chunks.pop(0) if self.chunks else b""
+
+    def close(self):
+        self.closed = True
+
+
+class FakeRecognizer:
+    energy_threshold = 300
+
+
+def chunk(loud):
+    amplitude = 0.3 if loud else 0.0
+    samples = amplitude * np.sin(2 * np.pi * 220 * np.arange(CHUNK) / RATE)
+    return (samples * 32767).astype('<i2').tobytes()
+
+
+class TestPhraseTap(unittest.TestCase):
+    def make_tap(self, pattern, **options):
+        stream = ChunkStream(chunk(loud) for loud in pattern)
+        return PhraseTap(stream, RATE, 2, FakeRecognizer(), **options)
+
+    def test_keeps_speech_of_the_current_phrase(self):
+        tap = self.make_tap([False] * 10 + [True] * 5, preroll=0.2)
+        # Reads outside a phrase are passed through untouched
+        tap.read(CHUNK)
+        self.assertIsNone(tap.snapshot())
+
+        phrase = tap.begin()
+        for _ in range(9):
+            tap.read(CHUNK)
+        self.assertIsNone(tap.snapshot(), "silence only")
+
+        for _ in range(5):
+            tap.read(CHUNK)
+        snapshot_phrase, audio, speech_ended_at = tap.snapshot()
+        self.assertEqual(snapshot_phrase, phrase)
+        # The speech plus 0.2 s of lead-in
+        self.assertEqual(len(audio.frame_data), (5 * CHUNK + int(0.2 * RATE)) * 2)
+        self.assertIsNotNone(speech_ended_at)
+        # Nothing new since the last snapshot
+        self.assertIsNone(tap.snapshot())
+
+        self.assertEqual(tap.end(), speech_ended_at)
+        self.assertIsNone(tap.snapshot())
+        self.assertEqual(tap.begin(), phrase + 1)
+
+    def test_window_is_a_sliding_one(self):
+        tap = self.make_tap([True] * 30, window=1.0)
+        tap.begin()
+        for _ in range(30):
+            tap.read(CHUNK)
+        audio = tap.snapshot()[1]
+        self.assertEqual(len(audio.frame_data), RATE * 2)
+
+    def test_attach_and_delegate(self):
+        class Source:
+            SAMPLE_RATE = RATE
+            SAMPLE_WIDTH = 2
+            stream = ChunkStream([])
+
+        source = Source()
+        stream = source.stream
+        tap = PhraseTap.attach(source, FakeRecognizer())
+        self.assertIs(source.stream, tap)
+        tap.close()
+        self.assertTrue(stream.closed)
+
+    def test_result_key(self):
+        result = InterimResult("Alice", 3, "hello")
+        self.assertEqual(result.key, ("Alice", 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
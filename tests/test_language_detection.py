@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.language_detection import LanguageDetector, NgramDetector
+from src.utils.translators import Detection
+
+
+class CountingTranslator:
+    """detect() answers with a fixed language and counts the calls"""
+    def __init__(self, lang='en', confidence=0.95):
+        self.lang = lang
+        self.confidence = confidence
+        self.calls = 0
+
+    def detect(self, text):
+        self.calls += 1
+        return Detection(self.lang, self.confidence)
+
+
+class TestNgramDetector(unittest.TestCase):
+    def test_common_languages(self):
+        detector = NgramDetector()
+        for text, lang in (("how are you doing today", 'en'),
+                           ("vamos a empezar la reunión ahora", 'es'),
+                           ("je ne sais pas", 'fr'),
+                           ("wie geht es dir", 'de')):
+            self.assertEqual(detector.detect(text).lang, lang, text)
+        self.assertIsNone(detector.detect("  "))
+
+    def test_short_texts_are_less_certain(self):
+        detector = NgramDetector()
+        self.assertLess(detector.detect("ok").confidence,
+                        detector.detect("thanks for coming to the meeting").confidence)
+
+
+class TestLanguageDetector(unittest.TestCase):
+    def test_language_sticks_until_the_recheck(self):
+        translator = CountingTranslator('es')
+        detector = LanguageDetector(translator, recheck_every=10)
+        for i in range(25):
+            detection = detector.detect(f"esta es la frase número {i} de la sesión")
+            self.assertEqual(detection.lang, 'es')
+        # The first phrase and one re-check every ten after it
+        self.assertEqual(translator.calls, 3)
+        self.assertEqual(detector.stats.snapshot()['sticky'], 22)
+
+    def test_low_recognizer_confidence_triggers_a_check(self):
+        translator = CountingTranslator('en')
+        detector = LanguageDetector(translator, recheck_confidence=0.6)
+        detector.detect("a first phrase to detect", confidence=0.9)
+        detector.detect("the recognizer was sure of this", confidence=0.9)
+        self.assertEqual(translator.calls, 1)
+
+        translator.lang = 'fr'
+        detection = detector.detect("mumbled words it could not make out", confidence=0.3)
+        self.assertEqual((detection.lang, translator.calls), ('fr', 2))
+        self.assertEqual(detector.language(), 'fr')
+        self.assertEqual(detector.stats.changes, 1)
+
+    def test_local_detector_notices_a_switch(self):
+        translator = CountingTranslator('en')
+        detector = LanguageDetector(translator)
+        detector.detect("thanks for coming to the meeting this morning")
+        translator.lang = 'de'
+        detector.detect("vielen dank ich glaube wir sollten heute darüber sprechen")
+        self.assertEqual(translator.calls, 2)
+        self.assertEqual(detector.language(), 'de')
+
+    def test_streams_and_short_texts(self):
+        translator = CountingTranslator('fr')
+        detector = LanguageDetector(translator)
+        detector.detect("bonjour à tous et merci d'être venus", stream="Alice")
+        self.assertEqual(detector.detect("hello there", stream="Bob").lang, 'en')
+        # Short texts are left to the local detector
+        self.assertEqual(translator.calls, 1)
+        self.assertEqual(detector.language("Alice"), 'fr')
+
+        detector.reset("Alice")
+        self.assertIsNone(detector.language("Alice"))
+
+    def test_failures_fall_back(self):
+        class FailingTranslator:
+            def detect(self, text):
+                raise ConnectionError("offline")
+
+        detector = LanguageDetector(FailingTranslator())
+        self.assertEqual(detector.detect("good morning everyone, let us get started").lang, 'en')
+        self.assertEqual(detector.stats.failures, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
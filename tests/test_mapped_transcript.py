@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.mapped_transcript import MappedTranscript
+
+
+class TestMappedTranscript(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "transcript.txt")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, content, mode='w'):
+        with open(self.path, mode, encoding='utf-8') as file:
+            file.write(content)
+
+    def test_lines_across_blocks(self):
+        lines = [f"[00:00:{i % 60:02d}] línea número {i}" for i in range(1000)]
+        self.write('\n'.join(lines) + '\n')
+
+        # A tiny block size forces lines to straddle block boundaries
+        with MappedTranscript(self.path, cache=False, block_size=64) as transcript:
+            self.assertEqual(len(transcript), 1000)
+            self.assertEqual(transcript.lines(0, 3), lines[:3])
+            self.assertEqual(transcript.lines(998, 2000), lines[998:])
+            self.assertEqual(transcript.text(500, 501), lines[500] + '\n')
+            self.assertEqual(transcript.lines(5, 5), [])
+
+    def test_missing_trailing_newline_and_empty_file(self):
+        self.write("first\n\nlast")
+        with MappedTranscript(self.path, cache=False) as transcript:
+            self.assertEqual(len(transcript), 3)
+            self.assertEqual(transcript.lines(1, 3), ['', 'last'])
+
+        self.write("")
+        with MappedTranscript(self.path, cache=False) as transcript:
+            self.assertEqual(len(transcript), 0)
+            self.assertEqual(transcript.text(0, 10), '')
+            self.assertIsNone(transcript.find("x"))
+
+    def test_find(self):
+        self.write("alpha\nbeta\ngamma\nbeta again\n")
+        with MappedTranscript(self.path, cache=False) as transcript:
+            self.assertEqual(transcript.find("beta"), 1)
+            self.assertEqual(transcript.find("beta", 2), 3)
+            self.assertIsNone(transcript.find("delta"))
+
+    def test_index_cache_is_reused_and_invalidated(self):
+        self.write("one\ntwo\n")
+        with MappedTranscript(self.path) as transcript:
+            self.assertTrue(transcript.index_rebuilt)
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+
+        with MappedTranscript(self.path) as transcript:
+            self.assertFalse(transcript.index_rebuilt)
+            self.assertEqual(len(transcript), 2)
+
+        # Appending changes size and mtime, so the cache must not be used
+        self.write("three\n", mode='a')
+        with MappedTranscript(self.path) as transcript:
+            self.assertTrue(transcript.index_rebuilt)
+            self.assertEqual(transcript.lines(2, 3), ['three'])
+
+    def test_corrupt_cache_is_rebuilt(self):
+        self.write("one\ntwo\n")
+        with open(self.path + ".idx", 'wb') as file:
+            file.write(b'garbage')
+        with MappedTranscript(self.path) as transcript:
+            self.assertTrue(transcript.index_rebuilt)
+            self.assertEqual(len(transcript), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+import sys
+import os
+import numpy as np
+import speech_recognition as sr
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.audio import AudioProcessor
+from src.utils.noise_reduction import STRENGTH_LEVELS, SpectralGate
+
+RATE = 16000
+
+
+def to_audio(signal):
+    data = (np.clip(signal, -1, 1) * 32767).astype('<i2').tobytes()
+    return sr.AudioData(data, RATE, 2)
+
+
+def level_db(signal):
+    return 10 * np.log10(np.mean(np.square(signal)) + 1e-12)
+
+
+def samples_of(audio):
+    return np.frombuffer(audio.frame_data, dtype='<i2') / 32767.0
+
+
+class FakeStream:
+    """Microphone stream that plays back a fixed signal"""
+
+    def __init__(self, signal):
+        self.data = (signal * 32767).astype('<i2').tobytes()
+        self.position = 0
+
+    def read(self, size):
+        chunk = self.data[self.position:self.position + size * 2]
+        self.position += size * 2
+        return chunk
+
+
+class FakeSource:
+    SAMPLE_RATE = RATE
+    SAMPLE_WIDTH = 2
+    CHUNK = 1024
+
+    def __init__(self, signal):
+        self.stream = FakeStream(signal)
+
+
+class TestSpectralGate(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        t = np.arange(3 * RATE) / RATE
+        self.tone = 0.3 * np.sin(2 * np.pi * 220 * t) * (t >= 1)
+        self.noise = self.rng.normal(0.0, 0.02, len(t))
+
+    def test_passes_audio_above_thresholds_unchanged(self):
+        gate = SpectralGate()
+        gate.noise_profile = np.zeros(gate.frame_length // 2 + 1, dtype=np.float32)
+        gate.profile_rate = RATE
+
+        audio = to_audio(self.tone + self.noise)
+        original = np.frombuffer(audio.frame_data, dtype='<i2').copy()
+        gate.reduce(audio)
+        difference = np.abs(np.frombuffer(audio.frame_data, dtype='<i2').astype(int) - original)
+        self.assertLessEqual(difference.max(), 1)
+
+    def test_reduces_noise_with_profile(self):
+        gate = SpectralGate()
+        self.assertTrue(gate.estimate_noise(to_audio(self.rng.normal(0.0, 0.02, RATE))))
+
+        audio = to_audio(self.tone + self.noise)
+        self.assertIs(gate.reduce(audio), audio)
+        cleaned = samples_of(audio)
+
+        # Noise-only second drops by well over 10 dB, the tone survives
+        self.assertLess(level_db(cleaned[:RATE]), level_db(self.noise[:RATE]) - 10)
+        self.assertLess(level_db(cleaned[RATE:] - self.tone[RATE:]),
+                        level_db(self.noise[RATE:]) - 6)
+        self.assertAlmostEqual(level_db(cleaned[RATE:]), level_db(self.tone[RATE:]), delta=1.0)
+
+    def test_without_profile_uses_quiet_frames(self):
+        audio = to_audio(self.tone + self.noise)
+        SpectralGate().reduce(audio)
+        self.assertLess(level_db(samples_of(audio)[:RATE]), level_db(self.noise[:RATE]) - 6)
+
+    def test_works_in_place(self):
+        gate = SpectralGate()
+        audio = to_audio(self.tone + self.noise)
+        gate.reduce(audio)
+        buffer = audio.frame_data
+        self.assertIsInstance(buffer, bytearray)
+
+        gate.reduce(audio)
+        self.assertIs(audio.frame_data, buffer)
+
+    def test_off_and_over_budget(self):
+        audio = to_audio(self.tone + self.noise)
+        original = bytes(audio.frame_data)
+        SpectralGate(strength=0.0).reduce(audio)
+        self.assertEqual(audio.frame_data, original)
+
+        gate = SpectralGate(cpu_budget=0.0)
+        gate.reduce(to_audio(self.tone + self.noise))
+        gate.reduce(audio)
+        self.assertEqual(bytes(audio.frame_data), original)
+        self.assertEqual(gate.stats.skipped, 1)
+        self.assertEqual(gate.stats.chunks, 2)
+
+    def test_realtime_budget(self):
+        gate = SpectralGate()
+        gate.estimate_noise(to_audio(self.noise[:RATE]))
+        for _ in range(5):
+            gate.reduce(to_audio(self.tone + self.noise))
+        self.assertLess(gate.stats.load, gate.cpu_budget)
+        self.assertEqual(gate.stats.skipped, 0)
+
+
+class TestAudioProcessorNoise(unittest.TestCase):
+    def test_ambient_noise_calibration(self):
+        recognizer = sr.Recognizer()
+        processor = AudioProcessor(None, recognizer=recognizer)
+        noise = np.random.default_rng(1).normal(0.0, 0.05, RATE)
+
+        processor.adjust_for_ambient_noise(FakeSource(noise), duration=1.0)
+        self.assertIsNotNone(processor.noise_reducer.noise_profile)
+        # RMS of the noise is ~1640; the threshold moves towards 1.5x that
+        self.assertGreater(recognizer.energy_threshold, 1000)
+
+    def test_slider_sets_strength(self):
+        processor = AudioProcessor(None)
+        processor.set_noise_reduction(0)
+        self.assertFalse(processor.noise_reducer.enabled)
+        processor.set_noise_reduction(4)
+        self.assertEqual(processor.noise_reducer.strength, STRENGTH_LEVELS[4])
+        self.assertEqual(processor.recognizer.energy_threshold, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.pipeline import LatencyHistogram
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_buckets_and_percentiles(self):
+        histogram = LatencyHistogram("First text", bounds=(0.1, 0.5, 1.0))
+        for latency in [0.05] * 6 + [0.3] * 3 + [2.5]:
+            histogram.record(latency)
+
+        stats = histogram.snapshot()
+        self.assertEqual(stats['count'], 10)
+        self.assertEqual(stats['buckets'], {'<=0.1s': 6, '<=0.5s': 3, '<=1s': 0, '>1s': 1})
+        self.assertEqual(stats['p50'], 0.1)
+        self.assertEqual(stats['p95'], 2.5)
+        self.assertEqual(stats['max'], 2.5)
+        self.assertIn("median 100 ms", histogram.summary())
+
+    def test_empty(self):
+        histogram = LatencyHistogram("Final text")
+        self.assertEqual(histogram.percentile(0.5), 0.0)
+        self.assertEqual(histogram.snapshot()['count'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import speech_recognition as sr
+from src.utils.recognizers import (GoogleRecognizer, RecognizerBackend, StubRecognizer,
+                                   audio_seconds, create_recognizer)
+
+
+def silent_audio(seconds, sample_rate=16000):
+    return sr.AudioData(b'\x00\x00' * int(seconds * sample_rate), sample_rate, 2)
+
+
+class FakeGoogleApi:
+    """Stands in for the network call; returns a canned show_all response"""
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def recognize_google(self, audio, **options):
+        self.calls.append(options)
+        return self.response
+
+
+class TestRecognizers(unittest.TestCase):
+    def test_stub_is_deterministic(self):
+        stub = StubRecognizer()
+        self.assertEqual(stub.recognize(silent_audio(2.5), 'es'), ("2.5 seconds of es", 1.0))
+        self.assertEqual(stub.recognize(silent_audio(2.5), 'es'), ("2.5 seconds of es", 1.0))
+        self.assertEqual(audio_seconds(silent_audio(2.5)), 2.5)
+
+    def test_stub_script_and_silence(self):
+        stub = StubRecognizer(script=["hello", "world"], confidence=0.8, min_seconds=0.5)
+        self.assertEqual(stub.recognize(silent_audio(1))[0], "hello")
+        self.assertEqual(stub.recognize(silent_audio(1))[0], "world")
+        self.assertEqual(stub.recognize(silent_audio(1)), ("hello", 0.8))
+        with self.assertRaises(sr.UnknownValueError):
+            stub.recognize(silent_audio(0.2))
+
+    def test_google_reads_best_alternative(self):
+        google = GoogleRecognizer()
+        google._recognizer = FakeGoogleApi({'alternative': [
+            {'transcript': "good morning", 'confidence': 0.93},
+            {'transcript': "good mourning"}], 'final': True})
+        self.assertEqual(google.recognize(silent_audio(1), 'en-GB'), ("good morning", 0.93))
+        self.assertEqual(google._recognizer.calls[0]['language'], 'en-GB')
+
+        google._recognizer = FakeGoogleApi([])
+        with self.assertRaises(sr.UnknownValueError):
+            google.recognize(silent_audio(1))
+
+    def test_create_recognizer(self):
+        self.assertIsInstance(create_recognizer('stub', script=["x"]), StubRecognizer)
+        with self.assertRaises(ValueError):
+            create_recognizer('nonexistent')
+
+    def test_missing_dependency_is_reported(self):
+        class Missing(RecognizerBackend):
+            requires = 'module_that_is_not_installed'
+        self.assertFalse(Missing.is_available())
+        self.assertTrue(StubRecognizer.is_available())
+
+
+if __name__ == '__main__':
+    unittest.main()
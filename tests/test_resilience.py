@@ -0,0 +1,114 @@
+import unittest
+import sys
+import os
+import time
+import speech_recognition as sr
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.pipeline import PipelineSegment, StageStats, translate_and_format
+from src.utils.resilience import (CLOSED, OPEN, CircuitOpenError, ResilientTranslator,
+                                  RetryPolicy, ServiceError, TokenBucket, recognizer_policy)
+from src.utils.translation_stub_server import StubTranslationServer
+from src.utils.translators import HttpTranslator
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_paces_calls_after_a_burst(self):
+        bucket = TokenBucket(rate=50, burst=5)
+        start = time.perf_counter()
+        for _ in range(15):
+            bucket.acquire()
+        # The burst is free, the other ten take a fiftieth of a second each
+        self.assertAlmostEqual(time.perf_counter() - start, 0.2, delta=0.1)
+        self.assertFalse(bucket.try_acquire())
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def setUp(self):
+        self.server = None
+        self.translator = None
+
+    def tearDown(self):
+        if self.translator is not None:
+            self.translator.close()
+        if self.server is not None:
+            self.server.stop()
+
+    def flaky(self, policy, **options):
+        self.server = StubTranslationServer(seed=1, **options).start()
+        self.translator = ResilientTranslator(HttpTranslator(self.server.url), policy)
+        return self.translator
+
+    def test_retries_a_flaky_service(self):
+        policy = RetryPolicy(base_delay=0.01, failure_threshold=10)
+        translator = self.flaky(policy, failure_rate=0.3)
+        for i in range(20):
+            self.assertEqual(translator.translate(f"hello {i}", dest='es').text, f"es: hello {i}")
+        self.assertGreater(self.server.counts['failures'], 0)
+        self.assertEqual(policy.stats.retries, self.server.counts['failures'])
+        self.assertEqual(policy.stats.failures, 0)
+
+    def test_waits_as_long_as_the_service_asks(self):
+        policy = RetryPolicy(base_delay=0.001, max_retries=5, failure_threshold=20)
+        translator = self.flaky(policy, rate_limit=20, retry_after=0.05)
+        for i in range(30):
+            translator.translate(f"hello {i}", dest='fr')
+        self.assertGreater(self.server.counts['throttled'], 0)
+        self.assertEqual(policy.stats.failures, 0)
+
+    def test_rate_limit_keeps_under_the_service_limit(self):
+        policy = RetryPolicy(rate=15, burst=1)
+        translator = self.flaky(policy, rate_limit=20)
+        for i in range(10):
+            translator.translate(f"hello {i}", dest='fr')
+        self.assertEqual(self.server.counts['throttled'], 0)
+        self.assertGreater(policy.stats.throttled, 0)
+
+    def test_circuit_opens_and_captions_stay_untranslated(self):
+        changes = []
+        policy = RetryPolicy(max_retries=1, base_delay=0.01, failure_threshold=3,
+                             reset_timeout=0.2, on_change=changes.append)
+        translator = self.flaky(policy, retry_after=0.01)
+        self.server.down = True
+
+        with self.assertRaises(ServiceError):
+            translator.translate("one", dest='es')
+        with self.assertRaises(ServiceError):
+            translator.translate("two", dest='es')
+        self.assertEqual(policy.breaker.state, OPEN)
+
+        # While open the service isn't called and the pipeline keeps the original
+        requests = self.server.counts['requests']
+        segment = PipelineSegment(0, None, time.time())
+        segment.text = "three"
+        errors = []
+        translate_and_format(segment, lambda text, src: translator.translate(text, dest='es').text,
+                             None, {'translation': StageStats('translation')},
+                             lambda segment, error: errors.append(error))
+        self.assertEqual(segment.formatted, "three")
+        self.assertIsInstance(errors[0], CircuitOpenError)
+        self.assertEqual(self.server.counts['requests'], requests)
+
+        # One trial call once the timeout has passed closes it again
+        self.server.down = False
+        time.sleep(0.25)
+        self.assertEqual(translator.translate("four", dest='es').text, "es: four")
+        self.assertEqual(changes, [OPEN, CLOSED])
+
+    def test_unintelligible_audio_is_an_answer(self):
+        policy = recognizer_policy(failure_threshold=1)
+        calls = []
+
+        def recognize():
+            calls.append(1)
+            raise sr.UnknownValueError()
+
+        with self.assertRaises(sr.UnknownValueError):
+            policy.call(recognize)
+        self.assertEqual((len(calls), policy.breaker.state), (1, CLOSED))
+
+
+if __name__ == '__main__':
+    unittest.main()
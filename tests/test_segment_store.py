@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import tracemalloc
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.segment_store import SegmentStore
+
+
+class TestSegmentStore(unittest.TestCase):
+    def setUp(self):
+        self.store = SegmentStore()
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_append_and_read_back(self):
+        self.store.extend([("10:00:00", "Recognized: hola", 'source'),
+                           ("10:00:00", "Hello.\nSecond line", 'translated'),
+                           ("10:00:01", "Ready for speech", 'info')])
+
+        self.assertEqual(len(self.store), 3)
+        self.assertEqual(self.store.get(1), ("10:00:00", "Hello.\nSecond line", 'translated'))
+        self.assertEqual([entry[2] for entry in self.store.range(0, 10)],
+                         ['source', 'translated', 'info'])
+        self.assertEqual(self.store.range(5, 10), [])
+
+    def test_search(self):
+        for i in range(2500):
+            self.store.append("10:00:00", f"segment {i} ünïcode", 'translated')
+
+        self.assertEqual(list(self.store.search("SEGMENT 12 ")), [12])
+        self.assertEqual(list(self.store.search("segment 249", start=300)), [2490 + i for i in range(10)])
+        self.assertEqual(list(self.store.search("missing")), [])
+
+    def test_clear(self):
+        self.store.append("10:00:00", "text", 'info')
+        self.store.clear()
+        self.assertEqual(len(self.store), 0)
+        self.store.append("10:00:01", "again", 'info')
+        self.assertEqual(self.store.get(0), ("10:00:01", "again", 'info'))
+
+    def test_memory_stays_small(self):
+        message = "This is a fairly typical translated segment of a long meeting. " * 3
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(50000):
+            self.store.append("10:00:00", message, 'translated')
+        growth = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        # About 10MB of text, but only the 8-byte offsets stay in memory
+        self.assertLess(growth, 1024 * 1024)
+        self.assertEqual(self.store.get(49999)[1], message)
+
+
+if __name__ == '__main__':
+    unittest.main()
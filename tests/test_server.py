@@ -0,0 +1,196 @@
+import unittest
+import sys
+import os
+import asyncio
+import json
+import shutil
+import tempfile
+import time
+import wave
+import numpy as np
+from urllib.request import Request, urlopen
+from urllib.error import HTTPError
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.server import CaptionServer, CaptionSession
+from src.utils.websocket import OP_BINARY, WebSocketClosed, connect, encode_frame, read_frame
+
+RATE = 16000
+
+
+def speech(phrases=3):
+    """16-bit PCM of tones (phrases) separated by silence"""
+    t = np.arange(int(1.5 * RATE)) / RATE
+    tone = 0.3 * np.sin(2 * np.pi * 220 * t)
+    silence = np.zeros(int(1.2 * RATE))
+    signal = np.concatenate([silence] + [np.concatenate([tone, silence]) for _ in range(phrases)])
+    return (signal * 32767).astype('<i2').tobytes()
+
+
+async def publish(server, name, data, query=""):
+    publisher = await connect(f"{server.ws_url}/sessions/{name}/publish{query}")
+    for i in range(0, len(data), 3200):
+        await publisher.send(data[i:i + 3200])
+    await publisher.send(json.dumps({'type': 'end'}))
+    return publisher
+
+
+async def receive_all(websocket):
+    """Messages up to and including the end message"""
+    messages = []
+    while True:
+        message = json.loads(await websocket.recv())
+        messages.append(message)
+        if message['type'] == 'end':
+            return messages
+
+
+class FakeSubscriber:
+    """Stands in for a WebSocket with a given number of unsent bytes"""
+    def __init__(self, buffered):
+        self.buffered = buffered
+        self.closed = False
+        self.frames = []
+        self.writer = self
+        self.transport = self
+
+    def is_closing(self):
+        return self.closed
+
+    def send_frame(self, frame):
+        self.frames.append(frame)
+
+    def abort(self):
+        self.closed = True
+
+
+class TestWebSocket(unittest.TestCase):
+    def test_frame_round_trip(self):
+        async def run():
+            for payload in (b"", b"x" * 125, b"y" * 300, os.urandom(70000)):
+                reader = asyncio.StreamReader()
+                reader.feed_data(encode_frame(OP_BINARY, payload, mask=True))
+                self.assertEqual(await read_frame(reader, max_size=1 << 20),
+                                 (True, OP_BINARY, payload))
+
+            reader = asyncio.StreamReader()
+            reader.feed_data(encode_frame(OP_BINARY, b"z" * 200))
+            with self.assertRaises(WebSocketClosed) as context:
+                await read_frame(reader, max_size=100)
+            self.assertEqual(context.exception.code, 1009)
+
+        asyncio.run(run())
+
+
+class TestCaptionServer(unittest.TestCase):
+    def setUp(self):
+        self.jobs_dir = tempfile.mkdtemp()
+        self.server = CaptionServer(port=0, recognizer='stub', translator='stub',
+                                    targets=['es'], jobs_dir=self.jobs_dir).start()
+
+    def tearDown(self):
+        self.server.stop()
+        shutil.rmtree(self.jobs_dir)
+
+    def get(self, path):
+        with urlopen(self.server.url + path, timeout=5) as response:
+            return json.loads(response.read())
+
+    def test_segments_reach_publisher_and_subscribers(self):
+        async def run():
+            subscribers = [await connect(f"{self.server.ws_url}/sessions/talk/subscribe")
+                           for _ in range(20)]
+            publisher = await publish(self.server, "talk", speech(), "?targets=es,fr")
+            results = await asyncio.gather(*(receive_all(ws) for ws in subscribers + [publisher]))
+            for websocket in subscribers:
+                await websocket.close()
+            return results
+
+        results = asyncio.run(asyncio.wait_for(run(), 20))
+        self.assertTrue(all(messages == results[0] for messages in results))
+
+        segments = sorted(results[0][:-1], key=lambda message: message['start'])
+        self.assertEqual(len(segments), 3)
+        self.assertEqual(results[0][-1], {'type': 'end', 'session': 'talk', 'segments': 3})
+        for segment in segments:
+            self.assertTrue(segment['original'].endswith("seconds of en"))
+            self.assertEqual(set(segment['translations']), {'es', 'fr'})
+            self.assertTrue(segment['translations']['fr'].startswith("Fr: "))
+        # Offsets into the published audio, not wall clock times
+        self.assertAlmostEqual(segments[0]['start'], 1.2, delta=0.3)
+        self.assertLess(segments[-1]['end'], len(speech()) / 2 / RATE)
+
+        time.sleep(0.1)
+        self.assertEqual(self.get("/sessions"), {})
+
+    def test_one_publisher_per_session(self):
+        async def run():
+            first = await connect(f"{self.server.ws_url}/sessions/talk/publish")
+            with self.assertRaises(ConnectionError):
+                await connect(f"{self.server.ws_url}/sessions/talk/publish")
+            with self.assertRaises(ConnectionError):
+                await connect(f"{self.server.ws_url}/sessions/other/publish?rate=fast")
+            stats = self.get("/stats")
+            await first.close()
+            return stats
+
+        stats = asyncio.run(asyncio.wait_for(run(), 10))
+        self.assertEqual(list(stats['sessions']), ['talk'])
+        self.assertTrue(stats['sessions']['talk']['publishing'])
+
+    def test_slow_subscriber_is_dropped(self):
+        session = CaptionSession("talk", self.server)
+        fast, slow = FakeSubscriber(0), FakeSubscriber(self.server.max_buffer + 1)
+        session.subscribers.update([fast, slow])
+        session.broadcast({'type': 'end'})
+
+        self.assertEqual(session.subscribers, {fast})
+        self.assertEqual(len(fast.frames), 1)
+        self.assertTrue(slow.closed)
+        self.assertEqual(session.dropped_subscribers, 1)
+
+    def test_file_job(self):
+        path = os.path.join(self.jobs_dir, "input.wav")
+        with wave.open(path, 'wb') as file:
+            file.setnchannels(1)
+            file.setsampwidth(2)
+            file.setframerate(RATE)
+            file.writeframes(b"\0\0" * RATE * 4)
+        with open(path, 'rb') as file:
+            request = Request(self.server.url + "/jobs?filename=call.wav&target=es",
+                              data=file.read(), method='POST')
+        with urlopen(request, timeout=5) as response:
+            job = json.loads(response.read())
+        self.assertEqual(job['status'], 'queued')
+
+        deadline = time.time() + 30
+        while job['status'] in ('queued', 'running') and time.time() < deadline:
+            time.sleep(0.1)
+            job = self.get(job['url'])
+        self.assertEqual(job['status'], 'done', job.get('error'))
+        self.assertEqual(len(job['segments']), 1)
+        self.assertTrue(job['segments'][0]['translated'].startswith("Es: "))
+
+        # Once expired the job is gone, and so are its files
+        self.assertEqual(len(os.listdir(self.jobs_dir)), 4)
+        self.server.job_ttl = 0
+        with self.assertRaises(HTTPError) as context:
+            self.get(job['url'])
+        self.assertEqual(context.exception.code, 404)
+        self.assertEqual(os.listdir(self.jobs_dir), ["input.wav"])
+
+    def test_errors(self):
+        with self.assertRaises(HTTPError) as context:
+            self.get("/jobs/missing")
+        self.assertEqual(context.exception.code, 404)
+
+        request = Request(self.server.url + "/jobs?filename=notes.txt", data=b"x", method='POST')
+        with self.assertRaises(HTTPError) as context:
+            urlopen(request, timeout=5)
+        self.assertEqual(context.exception.code, 415)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+import sys
+import os
+import struct
+import tempfile
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.transcript_model import (Segment, Transcript, SegmentWriter,
+                                        language_path, read_segments, segment_path)
+
+
+def sample_segments():
+    return [
+        Segment(1000.0, 1002.5, "hola a todos", "Hello everyone", 'es', 'en', 0.91),
+        Segment(1003.0, 1004.25, "good morning", None, 'en'),
+        Segment(1005.0, 1006.0, "日本語のテキスト", "", 'ja', 'en', 0.5),
+    ]
+
+
+class TestTranscript(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "session.seg")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_columns_and_access(self):
+        transcript = Transcript()
+        transcript.extend(sample_segments())
+
+        self.assertEqual(len(transcript), 3)
+        self.assertEqual(list(transcript.starts), [1000.0, 1003.0, 1005.0])
+        self.assertEqual(transcript[0].duration, 2.5)
+        self.assertEqual(transcript[-1].original, "日本語のテキスト")
+        self.assertIsNone(transcript[1].translated)
+        self.assertIsNone(transcript[1].confidence)
+        self.assertEqual(transcript[1].text, "good morning")
+        self.assertEqual(transcript[2].translated, "")
+        self.assertEqual(list(transcript), sample_segments())
+        with self.assertRaises(IndexError):
+            transcript[3]
+
+    def test_save_and_load_roundtrip(self):
+        transcript = Transcript()
+        transcript.extend(sample_segments())
+        transcript.save(self.path)
+
+        loaded = Transcript.load(self.path)
+        self.assertEqual(list(loaded), sample_segments())
+
+        # Loaded transcripts can keep growing
+        loaded.append(Segment(1007.0, 1008.0, "more", "more", 'en', 'en'))
+        self.assertEqual(loaded[3].original, "more")
+        self.assertEqual(loaded[0].translated, "Hello everyone")
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            Transcript.from_bytes(b"[00:00:01] Recognized: text")
+
+    def test_writer_appends_and_recovers_partial_record(self):
+        segments = sample_segments()
+        with SegmentWriter(self.path) as writer:
+            writer.append(segments[0])
+            writer.append(segments[1])
+
+        # Simulate a crash in the middle of writing a record
+        with open(self.path, 'ab') as file:
+            file.write(b'\x40\x00\x00\x00partial')
+        self.assertEqual(len(Transcript.load(self.path)), 2)
+
+        with SegmentWriter(self.path) as writer:
+            self.assertEqual(writer.recovered_bytes, 11)
+            self.assertEqual(writer.records, 2)
+            writer.append(segments[2])
+            self.assertEqual(writer.records, 3)
+        self.assertEqual(list(Transcript.load(self.path)), segments)
+
+    def test_read_segments_streams_records(self):
+        with SegmentWriter(self.path) as writer:
+            for segment in sample_segments():
+                writer.append(segment)
+        with open(self.path, 'ab') as file:
+            file.write(b'\x40\x00')
+        self.assertEqual(list(read_segments(self.path)), sample_segments())
+
+    def test_speakers(self):
+        segments = [
+            Segment(1.0, 2.0, "welcome", None, 'en', 'en', speaker="Chair"),
+            Segment(1.5, 3.0, "gracias", "thanks", 'es', 'en', speaker="Panelist 2"),
+            Segment(4.0, 5.0, "no speaker", None, 'en'),
+        ]
+        transcript = Transcript()
+        transcript.extend(segments)
+        self.assertEqual(transcript.speakers, ['Chair', 'Panelist 2', ''])
+        self.assertEqual(transcript[1].speaker, "Panelist 2")
+        self.assertIsNone(transcript[2].speaker)
+
+        transcript.save(self.path)
+        self.assertEqual(list(Transcript.load(self.path)), segments)
+        self.assertEqual(list(read_segments(self.path)), segments)
+
+    def test_writer_keeps_newer_files(self):
+        with open(self.path, 'wb') as file:
+            file.write(struct.pack('<4sH', b'TSEG', 99) + b'future data')
+        with self.assertRaises(ValueError):
+            SegmentWriter(self.path).open()
+        with open(self.path, 'rb') as file:
+            self.assertTrue(file.read().endswith(b'future data'))
+
+    def test_segment_path(self):
+        self.assertEqual(segment_path("/tmp/professional_transcript_1.txt"),
+                         "/tmp/professional_transcript_1.seg")
+
+    def test_language_path(self):
+        path = language_path("/tmp/professional_transcript_1.txt", 'fr')
+        self.assertEqual(path, "/tmp/professional_transcript_1.fr.txt")
+        self.assertEqual(segment_path(path), "/tmp/professional_transcript_1.fr.seg")
+
+
+if __name__ == '__main__':
+    unittest.main()
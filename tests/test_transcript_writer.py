@@ -0,0 +1,82 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.transcript_writer import TranscriptWriter
+
+
+class TestTranscriptWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "transcript.txt")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read(self):
+        with open(self.path, 'r', encoding='utf-8') as file:
+            return file.read()
+
+    def test_appends_records(self):
+        with TranscriptWriter(self.path) as writer:
+            writer.append("first")
+            writer.append("second\n")
+        with TranscriptWriter(self.path) as writer:
+            writer.append("third")
+
+        self.assertEqual(self.read(), "first\nsecond\nthird\n")
+
+    def test_fsync_is_batched_by_size(self):
+        writer = TranscriptWriter(self.path, sync_interval=3600, sync_bytes=20).open()
+        for _ in range(10):
+            writer.append("0123456789")  # 11 bytes with the newline
+        self.assertEqual(writer.sync_count, 5)
+        writer.close()
+        self.assertEqual(writer.bytes_written, 110)
+
+    def test_fsync_is_batched_by_interval(self):
+        writer = TranscriptWriter(self.path, sync_interval=0, sync_bytes=10 ** 9).open()
+        writer.append("a")
+        writer.append("b")
+        self.assertEqual(writer.sync_count, 2)
+        writer.close()
+
+    def test_recovers_truncated_tail(self):
+        with open(self.path, 'wb') as file:
+            file.write("[10:00:00] one\n\n[10:00:05] tw".encode('utf-8'))
+
+        writer = TranscriptWriter(self.path, terminator='\n\n').open()
+        self.assertEqual(writer.recovered_bytes, len("[10:00:05] tw"))
+        writer.append("[10:00:09] three\n\n")
+        writer.close()
+
+        self.assertEqual(self.read(), "[10:00:00] one\n\n[10:00:09] three\n\n")
+
+    def test_recovers_file_without_complete_record(self):
+        with open(self.path, 'wb') as file:
+            file.write("café".encode('utf-8')[:-1])
+
+        writer = TranscriptWriter(self.path).open()
+        writer.close()
+        self.assertEqual(self.read(), "")
+
+    def test_truncate_starts_new_file(self):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write("old\n")
+
+        with TranscriptWriter(self.path, truncate=True) as writer:
+            writer.append("new")
+        self.assertEqual(self.read(), "new\n")
+
+    def test_append_requires_open(self):
+        writer = TranscriptWriter(self.path)
+        with self.assertRaises(ValueError):
+            writer.append("text")
+
+
+if __name__ == '__main__':
+    unittest.main()
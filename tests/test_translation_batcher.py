@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.translation_batcher import TranslationBatcher
+from src.utils.translation_cache import CachedTranslator
+
+
+class FakeResult:
+    def __init__(self, text):
+        self.text = text
+
+
+class CountingTranslator:
+    """Local stand-in for googletrans that accepts lists and counts calls"""
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def translate(self, text, dest='en', src='auto'):
+        with self.lock:
+            self.calls.append((list(text), src, dest))
+        if self.fail_on in text:
+            raise ConnectionError("service unavailable")
+        return [FakeResult(f"{dest}:{item}") for item in text]
+
+
+class TestTranslationBatcher(unittest.TestCase):
+    def test_coalesces_segments_within_window(self):
+        backend = CountingTranslator()
+        batcher = TranslationBatcher(backend, window=0.2, max_batch=10)
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            futures = [pool.submit(batcher.translate, f"phrase {i}", 'es', 'en') for i in range(6)]
+            results = [future.result().text for future in futures]
+        batcher.close()
+
+        self.assertEqual(results, [f"es:phrase {i}" for i in range(6)])
+        self.assertEqual(len(backend.calls), 1)
+        self.assertEqual(batcher.get_stats()['segments'], 6)
+
+    def test_max_batch_sends_early(self):
+        backend = CountingTranslator()
+        batcher = TranslationBatcher(backend, window=5.0, max_batch=3)
+
+        start = time.monotonic()
+        futures = [batcher.submit(f"phrase {i}", 'fr', 'en') for i in range(3)]
+        self.assertEqual([future.result(timeout=2) for future in futures],
+                         ["fr:phrase 0", "fr:phrase 1", "fr:phrase 2"])
+        self.assertLess(time.monotonic() - start, 1.0)
+        batcher.close()
+
+    def test_lone_segment_waits_at_most_the_window(self):
+        backend = CountingTranslator()
+        batcher = TranslationBatcher(backend, window=0.1, max_batch=50)
+
+        start = time.monotonic()
+        self.assertEqual(batcher.translate("alone", dest='de', src='en').text, "de:alone")
+        self.assertLess(time.monotonic() - start, 0.3)
+        batcher.close()
+
+    def test_groups_by_language_pair(self):
+        backend = CountingTranslator()
+        batcher = TranslationBatcher(backend, window=0.1, max_batch=10)
+
+        futures = [batcher.submit("a", 'es', 'en'), batcher.submit("b", 'fr', 'en'),
+                   batcher.submit("c", 'es', 'en')]
+        self.assertEqual([future.result() for future in futures], ["es:a", "fr:b", "es:c"])
+        batcher.close()
+
+        self.assertEqual(sorted(backend.calls), [(["a", "c"], 'en', 'es'), (["b"], 'en', 'fr')])
+
+    def test_language_pairs_sent_side_by_side(self):
+        backend = CountingTranslator()
+        translate = backend.translate
+
+        def slow_translate(text, dest='en', src='auto'):
+            time.sleep(0.3)
+            return translate(text, dest=dest, src=src)
+
+        backend.translate = slow_translate
+        batcher = TranslationBatcher(backend, window=0.05, max_batch=10, senders=4)
+
+        start = time.monotonic()
+        futures = [batcher.submit("a", dest) for dest in ('de', 'fr', 'it', 'ja')]
+        self.assertEqual([future.result() for future in futures],
+                         ["de:a", "fr:a", "it:a", "ja:a"])
+        self.assertLess(time.monotonic() - start, 0.9)
+        batcher.close()
+
+    def test_calls_in_flight_are_bounded(self):
+        backend = CountingTranslator()
+        translate = backend.translate
+        release = threading.Event()
+        in_flight = []
+
+        def blocking_translate(text, dest='en', src='auto'):
+            in_flight.append(dest)
+            release.wait(2)
+            return translate(text, dest=dest, src=src)
+
+        backend.translate = blocking_translate
+        batcher = TranslationBatcher(backend, window=0.01, max_batch=1, senders=2)
+
+        futures = [batcher.submit(f"phrase {i}", 'es') for i in range(6)]
+        time.sleep(0.2)
+        # Two calls are out; the rest wait in the batcher, not in the executor
+        self.assertEqual(len(in_flight), 2)
+        self.assertEqual(batcher.get_stats()['pending'], 3)
+
+        release.set()
+        self.assertEqual([future.result(timeout=2) for future in futures],
+                         [f"es:phrase {i}" for i in range(6)])
+        batcher.close()
+
+    def test_failed_batch_fails_its_segments(self):
+        batcher = TranslationBatcher(CountingTranslator(fail_on="bad"), window=0.05)
+        future = batcher.submit("bad", 'es', 'en')
+        with self.assertRaises(ConnectionError):
+            future.result()
+        batcher.close()
+
+    def test_cache_in_front_of_batcher(self):
+        backend = CountingTranslator()
+        batcher = TranslationBatcher(backend, window=0.05)
+        translator = CachedTranslator(batcher)
+
+        translator.translate("hello", src='en', dest='es')
+        translator.translate("hello", src='en', dest='es')
+        batcher.close()
+        self.assertEqual(len(backend.calls), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.translation_cache import TranslationCache, CachedTranslator
+
+
+class FakeResult:
+    def __init__(self, text):
+        self.text = text
+
+
+class CountingTranslator:
+    """Local stand-in for googletrans that counts round-trips"""
+    def __init__(self):
+        self.calls = 0
+
+    def translate(self, text, dest='en', src='auto'):
+        self.calls += 1
+        if isinstance(text, list):
+            return [FakeResult(f"{dest}:{item.strip()}") for item in text]
+        return FakeResult(f"{dest}:{text.strip()}")
+
+    def detect(self, text):
+        return 'detected'
+
+
+class TestTranslationCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_hits_skip_the_translator(self):
+        backend = CountingTranslator()
+        translator = CachedTranslator(backend)
+
+        first = translator.translate("Good morning", src='en', dest='es').text
+        second = translator.translate("  Good   morning ", src='en', dest='es').text
+        translator.translate("Good morning", src='en', dest='fr')
+        # Case is part of the key
+        translator.translate("GOOD MORNING", src='en', dest='es')
+
+        self.assertEqual(first, second)
+        self.assertEqual(backend.calls, 3)
+        self.assertEqual(translator.cache.get_stats()['hits'], 1)
+        self.assertEqual(translator.cache.get_stats()['misses'], 3)
+        self.assertEqual(translator.detect("hola"), 'detected')
+
+    def test_lists_only_send_the_misses(self):
+        backend = CountingTranslator()
+        translator = CachedTranslator(backend)
+        translator.translate("Good morning", src='en', dest='es')
+
+        results = translator.translate(["Good  morning", "Good night", "Thanks"], src='en', dest='es')
+        self.assertEqual([r.text for r in results], ["es:Good morning", "es:Good night", "es:Thanks"])
+        self.assertEqual(backend.calls, 2)
+        self.assertEqual(translator.translate(["Thanks"], src='en', dest='es')[0].text, "es:Thanks")
+        self.assertEqual(backend.calls, 2)
+
+    def test_lru_eviction(self):
+        cache = TranslationCache(max_entries=2)
+        cache.put("one", 'en', 'es', "uno")
+        cache.put("two", 'en', 'es', "dos")
+        cache.get("one", 'en', 'es')
+        cache.put("three", 'en', 'es', "tres")
+
+        self.assertEqual(cache.get("one", 'en', 'es'), "uno")
+        self.assertIsNone(cache.get("two", 'en', 'es'))
+        self.assertEqual(cache.get_stats()['memory_entries'], 2)
+
+    def test_ttl_expiry(self):
+        cache = TranslationCache(ttl=0.05)
+        cache.put("hello", 'en', 'es', "hola")
+        self.assertEqual(cache.get("hello", 'en', 'es'), "hola")
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("hello", 'en', 'es'))
+
+    def test_persists_across_sessions(self):
+        cache = TranslationCache(path=self.path)
+        cache.put("Thank you", 'en', 'de', "danke")
+        cache.close()
+
+        backend = CountingTranslator()
+        translator = CachedTranslator(backend, TranslationCache(path=self.path))
+        self.assertEqual(translator.translate("Thank you", src='en', dest='de').text, "danke")
+        self.assertEqual(backend.calls, 0)
+        self.assertEqual(translator.cache.get_stats()['disk_hits'], 1)
+        translator.cache.close()
+
+
+    def test_disk_store_is_trimmed_while_writing(self):
+        cache = TranslationCache(path=self.path, max_disk_entries=5, commit_every=3, prune_every=10)
+        for i in range(25):
+            cache.put(f"phrase {i}", 'en', 'es', f"frase {i}")
+        # Pruned after the 10th and 20th put, the last five are still pending
+        rows = cache._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        self.assertEqual(rows, 10)
+
+        cache.flush()
+        reader = TranslationCache(path=self.path)
+        self.assertEqual(reader.get("phrase 24", 'en', 'es'), "frase 24")
+        self.assertIsNone(reader.get("phrase 0", 'en', 'es'))
+        reader.close()
+        cache.close()
+    def test_disk_size_cap(self):
+        cache = TranslationCache(path=self.path, max_disk_entries=3)
+        for i in range(10):
+            cache.put(f"phrase {i}", 'en', 'es', f"frase {i}")
+        cache.close()
+
+        cache = TranslationCache(path=self.path, max_entries=100)
+        kept = [i for i in range(10) if cache.get(f"phrase {i}", 'en', 'es')]
+        self.assertEqual(len(kept), 3)
+        cache.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.translation_fanout import TranslationFanout
+
+
+class FakeResult:
+    def __init__(self, text):
+        self.text = text
+
+
+class SlowTranslator:
+    """Takes ``delay`` seconds per call and fails for one language"""
+    def __init__(self, delay=0.2, fail_for=None):
+        self.delay = delay
+        self.fail_for = fail_for
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def translate(self, text, dest='en', src='auto'):
+        with self.lock:
+            self.calls.append((text, src, dest))
+        time.sleep(self.delay)
+        if dest == self.fail_for:
+            raise ConnectionError("service unavailable")
+        return FakeResult(f"{dest}:{text}")
+
+
+class TestTranslationFanout(unittest.TestCase):
+    def test_languages_translated_concurrently(self):
+        fanout = TranslationFanout(SlowTranslator(delay=0.2), max_workers=8)
+        targets = ['de', 'fr', 'it', 'ja', 'pt']
+
+        start = time.monotonic()
+        results = fanout.translate("hello", 'en', targets)
+        elapsed = time.monotonic() - start
+        fanout.close()
+
+        self.assertEqual(list(results), targets)
+        self.assertEqual(results['ja'], "ja:hello")
+        # Close to one translation, far from five of them
+        self.assertLess(elapsed, 0.6)
+        stats = fanout.stats.snapshot()
+        self.assertGreater(stats['average_serial'], 0.9)
+        self.assertEqual(set(stats['languages']), set(targets))
+
+    def test_source_language_is_not_translated(self):
+        translator = SlowTranslator(delay=0)
+        fanout = TranslationFanout(translator)
+        results = fanout.translate("hola", 'es', ['en', 'es', 'en'])
+        fanout.close()
+
+        self.assertEqual(results, {'en': "en:hola", 'es': None})
+        self.assertEqual(translator.calls, [("hola", 'es', 'en')])
+
+    def test_failed_language_does_not_hold_up_others(self):
+        errors = []
+        fanout = TranslationFanout(SlowTranslator(delay=0, fail_for='fr'),
+                                   on_error=lambda language, e: errors.append(language))
+        results = fanout.translate("hello", 'en', ['fr', 'de'])
+        fanout.close()
+
+        self.assertEqual(results, {'fr': None, 'de': "de:hello"})
+        self.assertEqual(errors, ['fr'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.translation_batcher import TranslationBatcher
+from src.utils.translation_cache import CachedTranslator, TranslationCache
+from src.utils.translation_stub_server import StubTranslationServer
+from src.utils.translators import HttpTranslator, StubTranslator, create_translator
+
+
+class TestStubTranslator(unittest.TestCase):
+    def test_single_and_list(self):
+        translator = StubTranslator()
+        result = translator.translate("hello", dest='es', src='en')
+        self.assertEqual((result.text, result.src, result.dest, result.origin),
+                         ("es: hello", 'en', 'es', "hello"))
+        self.assertEqual([r.text for r in translator.translate(["a", "b"], dest='fr')],
+                         ["fr: a", "fr: b"])
+        self.assertEqual(translator.calls, 2)
+        self.assertEqual(translator.detect("hello").lang, 'en')
+
+    def test_create_translator(self):
+        self.assertIsInstance(create_translator('stub'), StubTranslator)
+        with self.assertRaises(ValueError):
+            create_translator('nonexistent')
+
+
+class TestHttpTranslator(unittest.TestCase):
+    def setUp(self):
+        self.server = StubTranslationServer().start()
+        self.translator = HttpTranslator(self.server.url, pool_size=2)
+
+    def tearDown(self):
+        self.translator.close()
+        self.server.stop()
+
+    def test_translate_and_detect(self):
+        self.assertEqual(self.translator.translate("hola", dest='en', src='es').text, "en: hola")
+        detection = self.translator.detect("hello")
+        self.assertEqual(detection.lang, 'en')
+        self.assertAlmostEqual(detection.confidence, 0.9)
+
+    def test_batch_is_one_request(self):
+        results = self.translator.translate(["uno", "dos", "tres"], dest='en', src='es')
+        self.assertEqual([r.text for r in results], ["en: uno", "en: dos", "en: tres"])
+        self.assertEqual(self.server.counts['requests'], 1)
+        self.assertEqual(self.server.counts['segments'], 3)
+
+    def test_connections_are_kept_alive(self):
+        for i in range(20):
+            self.translator.translate(f"phrase {i}", dest='de')
+        self.assertEqual(self.server.counts['requests'], 20)
+        self.assertEqual(self.server.counts['connections'], 1)
+        self.assertEqual(self.translator.connections_opened, 1)
+
+    def test_pool_is_shared_between_threads(self):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(lambda i: self.translator.translate(str(i)).text, range(40)))
+        self.assertEqual(results, [f"en: {i}" for i in range(40)])
+        self.assertLessEqual(self.server.counts['connections'], 4)
+
+    def test_reconnects_after_server_restart(self):
+        self.translator.translate("before", dest='es')
+        url = self.server.url
+        self.server.stop()
+
+        # Same port, new server: the pooled connection is now stale
+        port = int(url.rsplit(':', 1)[1])
+        self.server = StubTranslationServer(port=port).start()
+        self.assertEqual(self.translator.translate("after", dest='es').text, "es: after")
+
+    def test_error_status_raises(self):
+        with self.assertRaises(ConnectionError):
+            self.translator.request('/missing', {})
+        # The connection is still usable afterwards
+        self.assertEqual(self.translator.translate("x", dest='es').text, "es: x")
+
+    def test_behind_batcher_and_cache(self):
+        batcher = TranslationBatcher(self.translator, window=0.2, max_batch=4)
+        cached = CachedTranslator(batcher, TranslationCache())
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda text: cached.translate(text, dest='it', src='en').text,
+                                    ["a", "b", "c", "d"]))
+        batcher.close()
+
+        self.assertEqual(results, ["it: a", "it: b", "it: c", "it: d"])
+        self.assertEqual(self.server.counts['requests'], 1)
+        self.assertEqual(cached.translate("a", dest='it', src='en').text, "it: a")
+        self.assertEqual(self.server.counts['requests'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
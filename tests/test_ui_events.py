@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.ui_events import UIEventBus
+
+
+class TestUIEventBus(unittest.TestCase):
+    def setUp(self):
+        self.batches = []
+        self.statuses = []
+        self.bus = UIEventBus(on_log=self.batches.append, on_status=self.statuses.append)
+
+    def test_coalesces_logs_and_status(self):
+        def worker():
+            for i in range(100):
+                self.bus.post_log(f"line {i}", 'source')
+                self.bus.post_status(f"status {i}")
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.bus.drain(), 800)
+        self.assertEqual(len(self.batches), 1)
+        self.assertEqual(len(self.batches[0]), 400)
+        self.assertEqual(self.statuses, ["status 99"])
+        self.assertEqual(self.bus.drain(), 0)
+
+    def test_calls_keep_their_place(self):
+        events = []
+        self.bus.on_log = lambda entries: events.append([message for _, message, _ in entries])
+        self.bus.on_status = lambda status: events.append(status)
+
+        self.bus.post_log("a")
+        self.bus.post_status("Listening...")
+        self.bus.post_call(events.append, "reset")
+        self.bus.post_log("b")
+        self.bus.post_log("c")
+        self.bus.drain()
+
+        self.assertEqual(events, [["a"], "Listening...", "reset", ["b", "c"]])
+
+    def test_drain_is_capped(self):
+        self.bus.max_events = 10
+        for i in range(25):
+            self.bus.post_log(str(i))
+        self.assertEqual(self.bus.drain(), 10)
+        self.assertEqual(self.bus.drain(), 10)
+        self.assertEqual(self.bus.drain(), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
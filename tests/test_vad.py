@@ -0,0 +1,117 @@
+import unittest
+import sys
+import os
+import numpy as np
+import speech_recognition as sr
+
+# Add parent directory to path so we can import our module
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.vad import VoiceActivityDetector, audio_samples, frame_features, speech_runs
+
+RATE = 16000
+
+
+def make_audio(*parts, noise_db=-60.0, seed=0):
+    """AudioData from (kind, seconds) parts over a low noise floor"""
+    rng = np.random.default_rng(seed)
+    pieces = []
+    for kind, seconds in parts:
+        t = np.arange(int(seconds * RATE)) / RATE
+        if kind == 'speech':
+            # Voiced syllables: harmonics of a 150 Hz pitch, 4 per second
+            envelope = np.maximum(0.0, np.sin(np.pi * 4 * t)) ** 0.5
+            piece = envelope * 0.2 * (np.sin(2 * np.pi * 150 * t) +
+                                      0.5 * np.sin(2 * np.pi * 450 * t))
+        elif kind == 'hiss':
+            piece = rng.normal(0.0, 0.1, len(t))
+        else:
+            piece = np.zeros(len(t))
+        pieces.append(piece)
+    signal = np.concatenate(pieces)
+    signal += rng.normal(0.0, 10 ** (noise_db / 20), len(signal))
+    data = (np.clip(signal, -1, 1) * 32767).astype('<i2').tobytes()
+    return sr.AudioData(data, RATE, 2)
+
+
+def seconds(audio):
+    return len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+
+
+class TestFrameFeatures(unittest.TestCase):
+    def test_samples_and_features(self):
+        audio = sr.AudioData(np.array([16384, -16384] * 480, dtype='<i2').tobytes(), RATE, 2)
+        samples = audio_samples(audio)
+        self.assertAlmostEqual(float(samples[0]), 0.5)
+
+        energy, zcr = frame_features(samples, 480)
+        self.assertEqual(len(energy), 2)
+        self.assertAlmostEqual(float(energy[0]), 20 * np.log10(0.5), places=3)
+        self.assertAlmostEqual(float(zcr[0]), 1.0)
+
+    def test_speech_runs_drop_short_bursts(self):
+        mask = np.array([0, 1, 0, 0, 1, 1, 1, 0, 1, 1], dtype=bool)
+        starts, ends = speech_runs(mask, 2)
+        self.assertEqual(starts.tolist(), [4, 8])
+        self.assertEqual(ends.tolist(), [7, 10])
+
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    def test_trims_leading_and_trailing_silence(self):
+        vad = VoiceActivityDetector(padding_ms=150)
+        audio = make_audio(('silence', 1.0), ('speech', 1.5), ('silence', 1.5))
+
+        trimmed = vad.process(audio)
+        self.assertIsNotNone(trimmed)
+        self.assertLess(seconds(trimmed), 2.0)
+        self.assertGreater(seconds(trimmed), 1.4)
+        self.assertEqual(vad.stats.dropped, 0)
+        self.assertAlmostEqual(vad.stats.seconds_saved, 4.0 - seconds(trimmed), places=3)
+
+    def test_drops_silence_and_noise(self):
+        vad = VoiceActivityDetector()
+        self.assertIsNone(vad.process(make_audio(('silence', 2.0))))
+        self.assertIsNone(vad.process(make_audio(('silence', 1.0), ('hiss', 1.0),
+                                                 ('silence', 1.0))))
+        self.assertEqual(vad.stats.calls_saved, 2)
+        self.assertAlmostEqual(vad.stats.seconds_saved, 5.0, places=3)
+
+    def test_ignores_clicks(self):
+        vad = VoiceActivityDetector(min_speech_ms=90)
+        self.assertIsNone(vad.process(make_audio(('silence', 1.0), ('speech', 0.03),
+                                                 ('silence', 1.0))))
+
+    def test_all_speech_is_kept_whole(self):
+        vad = VoiceActivityDetector()
+        vad.process(make_audio(('silence', 1.0), ('speech', 0.5), ('silence', 0.5)))
+
+        audio = make_audio(('speech', 2.0))
+        self.assertIs(vad.process(audio), audio)
+
+    def test_summary(self):
+        vad = VoiceActivityDetector()
+        vad.process(make_audio(('silence', 1.0), ('speech', 1.0), ('silence', 1.0)))
+        vad.process(make_audio(('silence', 1.0)))
+        self.assertIn("skipped 1 of 2 phrases", vad.stats.summary())
+
+    def test_other_sample_widths(self):
+        vad = VoiceActivityDetector()
+        audio = make_audio(('silence', 0.5), ('speech', 1.0), ('silence', 0.5))
+        samples = np.frombuffer(audio.frame_data, dtype='<i2').astype('<i4')
+        # AudioData keeps samples signed at every width; 24-bit samples are
+        # the top three bytes of 32-bit ones
+        encoded = {
+            1: (samples >> 8).astype('i1').tobytes(),
+            3: (samples << 16).view(np.uint8).reshape(-1, 4)[:, 1:].tobytes(),
+            4: (samples << 16).tobytes(),
+        }
+        for width, data in encoded.items():
+            converted = sr.AudioData(data, RATE, width)
+            trimmed = vad.process(converted)
+            self.assertIsNotNone(trimmed)
+            self.assertEqual(trimmed.sample_width, width)
+            self.assertLess(seconds(trimmed), 1.6)
+
+
+if __name__ == '__main__':
+    unittest.main()